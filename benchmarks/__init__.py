@@ -0,0 +1 @@
+"""Benchmarks of myst-sphinx-gallery on synthetic galleries."""
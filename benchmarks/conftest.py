@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from benchmarks.synthetic import create_gallery
+
+DEFAULT_SIZES = "10,100,1000"
+
+#: The directory of the results saved by ``--benchmark-autosave``.
+RESULTS_DIR = Path(__file__).parent / ".results"
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--bench-sizes",
+        default=DEFAULT_SIZES,
+        help="comma separated numbers of examples of the synthetic galleries "
+        f"(default: {DEFAULT_SIZES}, add 10000 for the largest gallery)",
+    )
+    parser.addoption(
+        "--check-scaling",
+        action="store_true",
+        help="fail the parser benchmarks whose time grows faster than linearly "
+        "with the size of the content",
+    )
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config):
+    # store the results next to the benchmarks, wherever pytest is run from
+    if config.option.benchmark_storage == "file://./.benchmarks":
+        config.option.benchmark_storage = f"file://{RESULTS_DIR}"
+
+
+def pytest_generate_tests(metafunc):
+    if "n_examples" in metafunc.fixturenames:
+        sizes = metafunc.config.getoption("--bench-sizes")
+        metafunc.parametrize(
+            "n_examples",
+            [int(size) for size in sizes.split(",") if size.strip()],
+            scope="session",
+        )
+
+
+@pytest.fixture(scope="session")
+def gallery_root(tmp_path_factory, n_examples):
+    """The root directory of a synthetic gallery of ``n_examples`` examples."""
+    root = tmp_path_factory.mktemp(f"gallery_{n_examples}")
+    create_gallery(root, n_examples)
+    return root
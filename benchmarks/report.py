@@ -0,0 +1,158 @@
+"""Report the scaling curves and regressions of the saved benchmark runs.
+
+The runs are saved by ``pytest benchmarks`` into ``benchmarks/.results``. The
+report prints, for the last run, the mean time of each benchmark for each
+size of the synthetic galleries with the fitted scaling exponent (1.0 for a
+linear scaling), and the benchmarks slower than in the previous run:
+
+.. code-block:: bash
+
+    python benchmarks/report.py --plot scaling.png
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import re
+import sys
+from pathlib import Path
+
+RESULTS_DIR = Path(__file__).parent / ".results"
+
+
+def load_runs(results_dir: Path) -> list[dict]:
+    """Load the saved runs, sorted by date."""
+    runs = [json.loads(path.read_text()) for path in results_dir.rglob("*.json")]
+    return sorted(runs, key=lambda run: run["datetime"])
+
+
+def run_label(run: dict) -> str:
+    """A short label of a run: its commit and date."""
+    commit = run.get("commit_info", {})
+    label = (commit.get("id") or "unknown")[:8]
+    if commit.get("dirty"):
+        label += "+"
+    return f"{label} {run['datetime'][:16]}"
+
+
+def scaling_curves(run: dict) -> dict[str, dict[int, float]]:
+    """Return the mean time of each benchmark by number of examples."""
+    curves: dict[str, dict[int, float]] = {}
+    for bench in run["benchmarks"]:
+        params = dict(bench.get("params") or {})
+        n_examples = params.pop("n_examples", None)
+        if n_examples is None:
+            continue
+        name = re.sub(r"\[.*\]$", "", bench["name"])
+        if params:
+            name += "[" + "-".join(str(value) for value in params.values()) + "]"
+        curves.setdefault(name, {})[n_examples] = bench["stats"]["mean"]
+    return curves
+
+
+def scaling_exponent(curve: dict[int, float]) -> float | None:
+    """Fit ``time = a * n ** k`` and return ``k``, None for a single size."""
+    points = [(math.log(n), math.log(t)) for n, t in curve.items() if t > 0]
+    if len(points) < 2:
+        return None
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    var_x = sum((x - mean_x) ** 2 for x, _ in points)
+    cov = sum((x - mean_x) * (y - mean_y) for x, y in points)
+    return cov / var_x
+
+
+def print_scaling(run: dict) -> None:
+    curves = scaling_curves(run)
+    sizes = sorted({n for curve in curves.values() for n in curve})
+    print(f"Scaling of {run_label(run)} (mean seconds by number of examples)")
+    width = max([len(name) for name in curves] + [9])
+    print("benchmark".ljust(width), *(f"{n:>10}" for n in sizes), "  exponent")
+    for name, curve in sorted(curves.items()):
+        times = [f"{curve[n]:10.4f}" if n in curve else " " * 10 for n in sizes]
+        exponent = scaling_exponent(curve)
+        exponent = f"{exponent:10.2f}" if exponent is not None else " " * 10
+        print(name.ljust(width), *times, exponent)
+
+
+def find_regressions(
+    previous: dict, current: dict, threshold: float
+) -> list[tuple[str, float, float]]:
+    """Return the benchmarks whose mean time grew by more than ``threshold``."""
+    before = {bench["name"]: bench["stats"]["mean"] for bench in previous["benchmarks"]}
+    regressions = []
+    for bench in current["benchmarks"]:
+        old = before.get(bench["name"])
+        new = bench["stats"]["mean"]
+        if old and new > old * (1 + threshold):
+            regressions.append((bench["name"], old, new))
+    return regressions
+
+
+def plot_scaling(runs: list[dict], file: Path) -> None:
+    """Plot the scaling curves of the last run, and of the previous one."""
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(figsize=(8, 5))
+    for run, style in zip(runs[::-1], ["-", "--"]):
+        for name, curve in sorted(scaling_curves(run).items()):
+            sizes = sorted(curve)
+            ax.plot(
+                sizes,
+                [curve[n] for n in sizes],
+                style,
+                marker="o",
+                label=f"{name} ({run_label(run)})",
+            )
+    ax.set_xscale("log")
+    ax.set_yscale("log")
+    ax.set_xlabel("number of examples")
+    ax.set_ylabel("mean time (s)")
+    ax.legend(fontsize="x-small")
+    fig.tight_layout()
+    fig.savefig(file)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--results", type=Path, default=RESULTS_DIR)
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="relative slowdown reported as a regression (default: %(default)s)",
+    )
+    parser.add_argument("--plot", type=Path, help="save the scaling curves to a file")
+    parser.add_argument(
+        "--fail-on-regression",
+        action="store_true",
+        help="exit with an error if a regression is found",
+    )
+    args = parser.parse_args(argv)
+
+    runs = load_runs(args.results)
+    if not runs:
+        print(f"No saved runs in {args.results}, run `pytest benchmarks` first.")
+        return 1
+    print_scaling(runs[-1])
+    if args.plot:
+        try:
+            plot_scaling(runs[-2:], args.plot)
+        except ImportError:
+            print("matplotlib is required to plot the scaling curves.")
+
+    if len(runs) < 2:
+        return 0
+    regressions = find_regressions(runs[-2], runs[-1], args.threshold)
+    print(f"\nCompared to {run_label(runs[-2])}:")
+    for name, old, new in regressions:
+        print(f"  {name}: {old:.4f}s -> {new:.4f}s ({new / old - 1:+.0%})")
+    if not regressions:
+        print("  no regression")
+    return 1 if regressions and args.fail_on_regression else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
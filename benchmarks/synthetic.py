@@ -0,0 +1,144 @@
+"""Generate synthetic galleries to benchmark MyST Sphinx Gallery.
+
+A synthetic gallery mixes rst, markdown and notebook examples, split into
+sections of :data:`SECTION_SIZE` examples. Each example displays zero to three
+images picked from a pool of small, large and animated images, and the
+notebooks embed their images in the outputs of a code cell.
+"""
+
+from __future__ import annotations
+
+import base64
+import io
+import random
+from pathlib import Path
+
+import nbformat
+from PIL import Image
+
+#: The number of examples in each section of a synthetic gallery.
+SECTION_SIZE = 100
+
+#: The size, format and number of frames of the images of the pool.
+IMAGES = {
+    "small.png": ((64, 48), "PNG", 1),
+    "medium.png": ((640, 480), "PNG", 1),
+    "large.jpg": ((3000, 2000), "JPEG", 1),
+    "animated.gif": ((320, 240), "GIF", 24),
+}
+
+_KINDS = ("rst", "md", "ipynb")
+
+
+def _create_image(size: tuple[int, int], seed: int) -> Image.Image:
+    """Create a noisy gradient image, which does not compress to nothing."""
+    rng = random.Random(seed)
+    gradient = Image.linear_gradient("L").resize(size)
+    noise = Image.effect_noise(size, 64)
+    return Image.merge(
+        "RGB",
+        [gradient, noise, gradient.rotate(rng.randint(0, 359), expand=False)],
+    )
+
+
+def create_image_pool(static_dir: Path) -> list[str]:
+    """Write the images of :data:`IMAGES` into ``static_dir``."""
+    static_dir.mkdir(parents=True, exist_ok=True)
+    for seed, (name, (size, fmt, n_frames)) in enumerate(IMAGES.items()):
+        path = static_dir / name
+        if path.exists():
+            continue
+        frames = [_create_image(size, seed * 100 + i) for i in range(n_frames)]
+        if n_frames > 1:
+            frames[0].save(
+                path, fmt, save_all=True, append_images=frames[1:], duration=50
+            )
+        else:
+            frames[0].save(path, fmt)
+    return list(IMAGES)
+
+
+def _png_output(seed: int) -> str:
+    """Return a base64 encoded PNG image for a notebook output."""
+    buffer = io.BytesIO()
+    _create_image((160, 120), seed).save(buffer, "PNG")
+    return base64.b64encode(buffer.getvalue()).decode()
+
+
+def write_example(path: Path, title: str, images: list[str], seed: int) -> None:
+    """Write an example displaying the images, its type given by the suffix."""
+    paragraph = f"This is the synthetic example number {seed}. " * 20
+    if path.suffix == ".rst":
+        blocks = [f"{title}\n{'=' * len(title)}", paragraph]
+        blocks += [f".. image:: /_static/{image}\n    :width: 60%" for image in images]
+        path.write_text("\n\n".join(blocks) + "\n", encoding="utf-8")
+    elif path.suffix == ".md":
+        blocks = [f"# {title}", paragraph]
+        blocks += [f"![{image}](/_static/{image})" for image in images]
+        path.write_text("\n\n".join(blocks) + "\n", encoding="utf-8")
+    else:
+        code = nbformat.v4.new_code_cell("plot()")
+        code.outputs = [
+            nbformat.v4.new_output(
+                "display_data", data={"image/png": _png_output(seed + i)}
+            )
+            for i in range(len(images))
+        ]
+        notebook = nbformat.v4.new_notebook(
+            cells=[nbformat.v4.new_markdown_cell(f"# {title}\n\n{paragraph}"), code]
+        )
+        with path.open("w", encoding="utf-8") as f:
+            nbformat.write(notebook, f)
+
+
+def create_gallery(root: Path, n_examples: int, seed: int = 0) -> Path:
+    """Create the examples directory of a synthetic gallery.
+
+    Parameters
+    ----------
+    root : Path
+        The root directory, containing the ``_static`` images and the
+        ``examples`` directory.
+    n_examples : int
+        The number of examples of the gallery.
+    seed : int, optional
+        The seed of the random choices of the example types and images.
+
+    Returns
+    -------
+    Path
+        The examples directory.
+
+    """
+    rng = random.Random(seed)
+    pool = create_image_pool(root / "_static")
+    examples_dir = root / "examples"
+    examples_dir.mkdir(parents=True, exist_ok=True)
+    (examples_dir / "GALLERY_HEADER.rst").write_text(
+        "Synthetic gallery\n=================\n", encoding="utf-8"
+    )
+    for i in range(n_examples):
+        section_dir = examples_dir / f"section_{i // SECTION_SIZE:03d}"
+        if i % SECTION_SIZE == 0:
+            section_dir.mkdir(exist_ok=True)
+            title = f"Section {i // SECTION_SIZE}"
+            (section_dir / "GALLERY_HEADER.rst").write_text(
+                f"{title}\n{'=' * len(title)}\n", encoding="utf-8"
+            )
+        kind = rng.choice(_KINDS)
+        images = rng.sample(pool, rng.randint(0, 3))
+        write_example(
+            section_dir / f"example_{i:05d}.{kind}", f"Example {i}", images, i
+        )
+    return examples_dir
+
+
+def example_entries(examples_dir: Path) -> dict[str, list[str]]:
+    """Return the example paths without suffix, grouped by section."""
+    return {
+        section.name: [
+            example.with_suffix("").relative_to(examples_dir.parent).as_posix()
+            for example in sorted(section.glob("example_*"))
+        ]
+        for section in sorted(examples_dir.glob("section_*"))
+    }
@@ -0,0 +1,68 @@
+"""Benchmarks of the ``run`` method of the gallery directives.
+
+The directives are parsed with the environment of a Sphinx application. The
+thumbnails are created in a warmup round, the measured rounds run the
+directives with the thumbnails already existing, as in incremental builds.
+"""
+
+from __future__ import annotations
+
+import pytest
+from sphinx.application import Sphinx
+from sphinx.testing.restructuredtext import parse
+
+from benchmarks.synthetic import example_entries
+
+
+def indent(lines):
+    return "".join(f"    {line}\n" for line in lines)
+
+
+@pytest.fixture(scope="session")
+def sphinx_app(gallery_root):
+    """A Sphinx application with a document per section of the gallery."""
+    src_dir = gallery_root
+    (src_dir / "conf.py").write_text('extensions = ["myst_sphinx_gallery"]\n')
+    for section, entries in example_entries(src_dir / "examples").items():
+        (src_dir / f"{section}.rst").write_text(
+            f"{section}\n{'=' * len(section)}\n\n.. base-gallery::\n\n"
+            + indent(entries)
+        )
+    (src_dir / "index.rst").write_text("Index\n=====\n")
+    app = Sphinx(
+        src_dir,
+        src_dir,
+        gallery_root / "_build/html",
+        gallery_root / "_build/doctrees",
+        "dummy",
+        status=None,
+        warning=None,
+    )
+    # find the documents referenced by the toctrees of the directives
+    app.build()
+    return app
+
+
+def directive_text(directive, root):
+    """Return a directive of all the examples of the gallery."""
+    sections = example_entries(root / "examples")
+    if directive in ("base-gallery", "ref-gallery"):
+        entries = [entry for section in sections.values() for entry in section]
+        return f".. {directive}::\n    :tooltip:\n\n" + indent(entries)
+    options = (
+        ":tooltip:\n    :virtual:" if directive == "virtual-gallery" else ":tooltip:"
+    )
+    return f".. gallery::\n    {options}\n\n" + indent(sections)
+
+
+@pytest.mark.parametrize(
+    "directive", ["base-gallery", "ref-gallery", "gallery", "virtual-gallery"]
+)
+def test_directive_run(benchmark, sphinx_app, gallery_root, n_examples, directive):
+    """Parse a document containing a gallery directive of all examples."""
+    text = directive_text(directive, gallery_root)
+    benchmark.group = f"directive-{directive}"
+    benchmark.extra_info["n_examples"] = n_examples
+    benchmark.pedantic(
+        parse, args=(sphinx_app, text, "index"), rounds=3, warmup_rounds=1
+    )
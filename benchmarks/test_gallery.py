@@ -0,0 +1,46 @@
+"""Benchmarks of :func:`~myst_sphinx_gallery.generate_gallery`."""
+
+from __future__ import annotations
+
+import shutil
+
+import pytest
+
+from myst_sphinx_gallery import GalleryConfig, generate_gallery
+
+
+def gallery_config(root):
+    return GalleryConfig(
+        examples_dirs="examples",
+        gallery_dirs="auto_examples",
+        root_dir=root,
+        thumbnail_dir="thumbs",
+    )
+
+
+def clean(root):
+    shutil.rmtree(root / "auto_examples", ignore_errors=True)
+    shutil.rmtree(root / "thumbs", ignore_errors=True)
+
+
+@pytest.mark.benchmark(group="generate_gallery")
+def test_generate_gallery(benchmark, gallery_root, n_examples):
+    """Generate the gallery and all its thumbnails."""
+    config = gallery_config(gallery_root)
+    benchmark.extra_info["n_examples"] = n_examples
+    benchmark.pedantic(
+        generate_gallery,
+        args=(config,),
+        setup=lambda: clean(gallery_root),
+        rounds=3,
+    )
+
+
+@pytest.mark.benchmark(group="generate_gallery_cached")
+def test_generate_gallery_cached(benchmark, gallery_root, n_examples):
+    """Generate the gallery when the thumbnails already exist."""
+    config = gallery_config(gallery_root)
+    clean(gallery_root)
+    generate_gallery(config)
+    benchmark.extra_info["n_examples"] = n_examples
+    benchmark.pedantic(generate_gallery, args=(config,), rounds=3)
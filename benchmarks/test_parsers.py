@@ -0,0 +1,225 @@
+"""Micro-benchmarks of the scaling of the text parsers.
+
+Each parser is fed with realistic and adversarial contents of growing sizes:
+long files, many fences or directives, and directives that are never closed.
+The time is measured for each size and the scaling exponent is fitted and
+saved with the benchmark, so that a regression to a quadratic scan, e.g. a
+regex backtracking over the rest of the content for each unclosed directive,
+shows in the report. With ``--check-scaling``, an exponent above
+:data:`MAX_EXPONENT` also fails the benchmark. The check depends on the
+timings of the machine, so it is not run by default.
+"""
+
+from __future__ import annotations
+
+import timeit
+import warnings
+
+import pytest
+
+from benchmarks.report import scaling_exponent
+from myst_sphinx_gallery.images import (
+    find_thumbnail_image,
+    parse_md_images,
+    parse_rst_images,
+)
+from myst_sphinx_gallery.utils import (
+    _extract_rst_title_and_tooltip,
+    _get_md_base_gallery_directives,
+    _get_rst_base_gallery_directives,
+    get_rst_title,
+)
+
+#: The numbers of blocks of the generated contents.
+SIZES = (500, 2000, 8000)
+
+#: The maximum scaling exponent, 1.0 for a linear scaling, with a margin for
+#: the measurement noise and the cache effects of the largest contents.
+MAX_EXPONENT = 1.35
+
+PARAGRAPH = "Some text with ``code``, a :ref:`reference` and *emphasis*.\n"
+
+
+def rst_document(n):
+    title = "A long example"
+    blocks = [
+        f"{PARAGRAPH * 3}\n.. code-block:: python\n\n    x = {i}\n\n" for i in range(n)
+    ]
+    return f"{title}\n{'=' * len(title)}\n\n" + "".join(blocks)
+
+
+def rst_underlines(n):
+    # title-like lines whose underline never matches the length of a title
+    return "".join(f"Title {i}\n{'=' * 3}\n\n" for i in range(n))
+
+
+def rst_tooltip(n):
+    return "Title\n=====\n\n" + PARAGRAPH * n
+
+
+def rst_nested_galleries(n):
+    # base-gallery directives nested in other directives are skipped
+    blocks = [
+        ".. note::\n\n    .. base-gallery::\n\n        nested/example\n\n"
+        f".. base-gallery::\n\n    examples/example_{i}\n\n"
+        for i in range(n)
+    ]
+    return "".join(blocks)
+
+
+def rst_unclosed_gallery(n):
+    return ".. base-gallery::\n    :tooltip:\n\n" + "".join(
+        f"    examples/example_{i}\n" for i in range(n)
+    )
+
+
+def rst_images(n):
+    return "".join(
+        f"{PARAGRAPH}\n.. image:: /_static/image_{i}.png\n    :alt: image {i}\n"
+        "    :width: 60%\n\n"
+        for i in range(n)
+    )
+
+
+def rst_figure_options(n):
+    # figures whose options are never followed by a blank line
+    return "".join(
+        f".. figure:: /_static/image_{i}.png\n    :width: 60%\n    :align: center\n"
+        for i in range(n)
+    )
+
+
+def rst_indented_images(n):
+    # indented image directives never separated by a blank line, which the
+    # reverse scan of the "last" thumbnail must not check one by one
+    return "".join(f"   .. image:: /_static/image_{i}.png\n" for i in range(n))
+
+
+def rst_nested_images(n):
+    # each directive is in the option block of the directive above it
+    return "".join(
+        f"{' ' * (i % 8)}.. image:: /_static/image_{i}.png\n" for i in range(n)
+    )
+
+
+def md_fences(n):
+    blocks = [
+        f"```{{note}}\n{PARAGRAPH}```\n\n:::{{base-gallery}}\nexamples/example_{i}\n:::\n\n"
+        for i in range(n)
+    ]
+    return "".join(blocks)
+
+
+def md_unclosed_fence(n):
+    # a directive with a longer fence is never closed by the inner fences
+    return "````{note}\n" + "".join(
+        f"```{{base-gallery}}\nexamples/example_{i}\n```\n" for i in range(n)
+    )
+
+
+def md_images(n):
+    return "".join(
+        f"{PARAGRAPH}\n![image {i}](/_static/image_{i}.png)\n\n" for i in range(n)
+    )
+
+
+def md_unclosed_images(n):
+    return "".join(
+        f"```{{image}} /_static/image_{i}.png\n:alt: image {i}\n\n{PARAGRAPH}"
+        for i in range(n)
+    )
+
+
+def md_broken_images(n):
+    return "".join(
+        f"![image {i}](/_static/image_{i}.png\n![ {PARAGRAPH}" for i in range(n)
+    )
+
+
+CASES = [
+    pytest.param(lambda c: get_rst_title(content=c), rst_document, id="get_rst_title"),
+    pytest.param(
+        lambda c: get_rst_title(content=c),
+        rst_underlines,
+        id="get_rst_title-underlines",
+    ),
+    pytest.param(
+        _extract_rst_title_and_tooltip, rst_document, id="extract_rst_title_and_tooltip"
+    ),
+    pytest.param(
+        _extract_rst_title_and_tooltip,
+        rst_tooltip,
+        id="extract_rst_title_and_tooltip-long_paragraph",
+    ),
+    pytest.param(
+        _get_rst_base_gallery_directives,
+        rst_nested_galleries,
+        id="get_rst_base_gallery_directives-nested",
+    ),
+    pytest.param(
+        _get_rst_base_gallery_directives,
+        rst_unclosed_gallery,
+        id="get_rst_base_gallery_directives-unclosed",
+    ),
+    pytest.param(
+        _get_md_base_gallery_directives,
+        md_fences,
+        id="get_md_base_gallery_directives-fences",
+    ),
+    pytest.param(
+        _get_md_base_gallery_directives,
+        md_unclosed_fence,
+        id="get_md_base_gallery_directives-unclosed",
+    ),
+    pytest.param(parse_rst_images, rst_images, id="parse_rst_images"),
+    pytest.param(parse_rst_images, rst_figure_options, id="parse_rst_images-options"),
+    pytest.param(parse_md_images, md_images, id="parse_md_images"),
+    pytest.param(parse_md_images, md_unclosed_images, id="parse_md_images-unclosed"),
+    pytest.param(parse_md_images, md_broken_images, id="parse_md_images-broken"),
+    pytest.param(
+        lambda c: find_thumbnail_image(c, "rst", "last"),
+        rst_images,
+        id="find_thumbnail_image-rst",
+    ),
+    pytest.param(
+        lambda c: find_thumbnail_image(c, "rst", "last"),
+        rst_indented_images,
+        id="find_thumbnail_image-rst-indented",
+    ),
+    pytest.param(
+        lambda c: find_thumbnail_image(c, "rst", "last"),
+        rst_nested_images,
+        id="find_thumbnail_image-rst-nested",
+    ),
+    pytest.param(
+        lambda c: find_thumbnail_image(c, "md", "last"),
+        md_unclosed_images,
+        id="find_thumbnail_image-md-unclosed",
+    ),
+]
+
+
+def measure(parser, content):
+    """Return the best time of a parser on a content, in seconds."""
+    timer = timeit.Timer(lambda: parser(content))
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=3, number=number)) / number
+
+
+@pytest.mark.benchmark(group="parsers")
+@pytest.mark.parametrize(("parser", "make_content"), CASES)
+def test_parser_scaling(benchmark, request, parser, make_content):
+    with warnings.catch_warnings():
+        # the adversarial titles warn for each title-like line
+        warnings.simplefilter("ignore")
+        times = {n: measure(parser, make_content(n)) for n in SIZES}
+        exponent = scaling_exponent(times)
+        benchmark.extra_info["times"] = times
+        benchmark.extra_info["exponent"] = exponent
+        benchmark(parser, make_content(SIZES[-1]))
+
+    if request.config.getoption("--check-scaling"):
+        assert exponent < MAX_EXPONENT, (
+            f"time grows as n ** {exponent:.2f}: "
+            + ", ".join(f"{t * 1e3:.2f}ms for {n}" for n, t in times.items())
+        )
@@ -0,0 +1,33 @@
+"""Benchmarks of the thumbnail creation of the images of the synthetic pool."""
+
+from __future__ import annotations
+
+import pytest
+
+from benchmarks.synthetic import IMAGES, create_image_pool
+from myst_sphinx_gallery.images import Thumbnail
+from myst_sphinx_gallery.utils import safe_remove_file
+
+
+@pytest.fixture(scope="session")
+def image_pool(tmp_path_factory):
+    static_dir = tmp_path_factory.mktemp("image_pool")
+    create_image_pool(static_dir)
+    return static_dir
+
+
+def save_thumbnail(image, output_dir):
+    thumb = Thumbnail(image, output_dir)
+    out_path = thumb.auto_output_path
+    safe_remove_file(out_path)
+    return thumb.save_thumbnail(out_path)
+
+
+@pytest.mark.parametrize("image", list(IMAGES))
+@pytest.mark.benchmark(group="thumbnail")
+def test_save_thumbnail(benchmark, image_pool, tmp_path, image):
+    """Create the thumbnail of an image, ops are thumbnails per second."""
+    benchmark.extra_info["size"], _, benchmark.extra_info["frames"] = IMAGES[image]
+    benchmark.pedantic(
+        save_thumbnail, args=(image_pool / image, tmp_path), rounds=5, iterations=1
+    )
@@ -0,0 +1,317 @@
+/* Client side features of the gallery directives.
+ *
+ * Virtual grids: the cards of a virtual grid are serialized into a JSON blob.
+ * Only the rows of cards close to the viewport are created, the other rows are
+ * replaced by the padding of the grid so that the height of the page is
+ * preserved.
+ *
+ * Filters: the cards of the page are filtered with the search index written
+ * by the extension next to this script. The index is only loaded once the
+ * reader types into a filter box.
+ */
+(function () {
+    "use strict";
+
+    // number of rows rendered above and below the viewport
+    var BUFFER_ROWS = 2;
+
+    var INDEX_FILE = "myst_sphinx_gallery_search.json";
+    var scriptSrc = document.currentScript ? document.currentScript.src : null;
+    var indexPromise = null;
+
+    function createCard(card, data) {
+        var classes = data.classes;
+        var col = document.createElement("div");
+        col.className = classes.col;
+        if (data.tooltip && card.tooltip) {
+            col.setAttribute("tooltip", card.tooltip);
+        }
+
+        var box = document.createElement("div");
+        box.className = classes.card;
+
+        var img = document.createElement("img");
+        img.className = classes.img;
+        img.loading = "lazy";
+        img.alt = "";
+        img.src = card.thumb;
+
+        var body = document.createElement("div");
+        body.className = classes.body;
+        var title = document.createElement("div");
+        title.className = classes.title;
+        var titleLink = document.createElement("a");
+        titleLink.className = "reference internal";
+        titleLink.href = card.url;
+        titleLink.textContent = card.title;
+        title.appendChild(titleLink);
+        body.appendChild(title);
+
+        var link = document.createElement("a");
+        link.className = classes.link + " reference";
+        link.href = card.url;
+        var linkText = document.createElement("span");
+        linkText.textContent = card.title;
+        link.appendChild(linkText);
+
+        box.appendChild(img);
+        box.appendChild(body);
+        box.appendChild(link);
+        col.appendChild(box);
+        return col;
+    }
+
+    function VirtualGrid(container) {
+        var script = container.querySelector("script.msg-virtual-data");
+        this.data = JSON.parse(script.textContent);
+        this.allCards = this.data.cards;
+        this.cards = this.allCards;
+
+        this.grid = document.createElement("div");
+        this.grid.className = "sd-container-fluid sd-sphinx-override msg-sd-container sd-mb-4";
+        this.row = document.createElement("div");
+        this.row.className = "sd-row msg-sd-row";
+        this.grid.appendChild(this.row);
+        container.appendChild(this.grid);
+
+        var fallback = container.querySelector(".msg-virtual-fallback");
+        if (fallback) {
+            fallback.hidden = true;
+        }
+
+        this.first = -1;
+        this.last = -1;
+        if (this.cards.length) {
+            this.measure();
+        }
+    }
+
+    VirtualGrid.prototype.columns = function () {
+        var template = getComputedStyle(this.row).gridTemplateColumns;
+        return Math.max(1, template.split(" ").filter(Boolean).length);
+    };
+
+    VirtualGrid.prototype.render = function (first, last) {
+        var cols = this.nCols;
+        var nRows = Math.ceil(this.cards.length / cols);
+        var fragment = document.createDocumentFragment();
+        var end = Math.min(this.cards.length, (last + 1) * cols);
+        for (var i = first * cols; i < end; i++) {
+            fragment.appendChild(createCard(this.cards[i], this.data));
+        }
+        this.row.replaceChildren(fragment);
+        this.row.style.paddingTop = first * this.rowHeight + "px";
+        this.row.style.paddingBottom = Math.max(0, nRows - last - 1) * this.rowHeight + "px";
+        this.first = first;
+        this.last = last;
+    };
+
+    // measure the number of columns and the height of a row with the first row
+    VirtualGrid.prototype.measure = function () {
+        this.row.style.paddingTop = "";
+        this.row.style.paddingBottom = "";
+        this.first = -1;
+        this.last = -1;
+        if (!this.cards.length) {
+            this.row.replaceChildren();
+            return;
+        }
+        this.row.replaceChildren(createCard(this.cards[0], this.data));
+        this.nCols = this.columns();
+        this.rowHeight = 0;
+        this.render(0, 0);
+        var gap = parseFloat(getComputedStyle(this.row).rowGap) || 0;
+        this.rowHeight = this.row.getBoundingClientRect().height + gap;
+        this.first = -1;
+        this.update();
+    };
+
+    VirtualGrid.prototype.update = function () {
+        if (!this.cards.length) {
+            return;
+        }
+        var nRows = Math.ceil(this.cards.length / this.nCols);
+        var top = this.row.getBoundingClientRect().top;
+        var height = window.innerHeight;
+        var rowHeight = this.rowHeight || 1;
+        var first = Math.floor(-top / rowHeight) - BUFFER_ROWS;
+        var last = Math.ceil((height - top) / rowHeight) + BUFFER_ROWS;
+        first = Math.min(Math.max(0, first), nRows - 1);
+        last = Math.min(Math.max(first, last), nRows - 1);
+        if (first !== this.first || last !== this.last) {
+            this.render(first, last);
+        }
+    };
+
+    // keep the cards whose absolute url is accepted by match, or all cards
+    VirtualGrid.prototype.filter = function (match) {
+        var base = document.baseURI;
+        this.cards = !match ? this.allCards : this.allCards.filter(function (card) {
+            return match(new URL(card.url, base).href);
+        });
+        this.measure();
+    };
+
+    function stripHash(url) {
+        return url.split("#")[0];
+    }
+
+    function SearchIndex(index, rootUrl) {
+        this.size = index.size;
+        this.grams = index.grams;
+        this.urls = [];
+        this.texts = [];
+        index.docs.forEach(function (doc) {
+            var sections = doc[3].map(function (i) {
+                return index.sections[i];
+            });
+            this.urls.push(stripHash(new URL(doc[2], rootUrl).href));
+            this.texts.push([doc[0], doc[1]].concat(sections).join(" ").toLowerCase());
+        }, this);
+    }
+
+    SearchIndex.prototype.posting = function (gram) {
+        return Object.prototype.hasOwnProperty.call(this.grams, gram) ? this.grams[gram] : [];
+    };
+
+    // return the urls of the examples containing all the words of the query
+    SearchIndex.prototype.match = function (query) {
+        var words = query.toLowerCase().match(/[\p{L}\p{N}_]+/gu) || [];
+        var ids = null;
+        words.forEach(function (word) {
+            for (var i = 0; i + this.size <= word.length; i++) {
+                var posting = this.posting(word.slice(i, i + this.size));
+                if (ids === null) {
+                    ids = posting;
+                } else {
+                    var keep = new Set(posting);
+                    ids = ids.filter(function (id) {
+                        return keep.has(id);
+                    });
+                }
+            }
+        }, this);
+        if (ids === null) {
+            ids = this.texts.map(function (_, id) {
+                return id;
+            });
+        }
+
+        // words shorter than the n-grams are only matched here
+        var urls = new Set();
+        ids.forEach(function (id) {
+            var text = this.texts[id];
+            var found = words.every(function (word) {
+                return text.indexOf(word) !== -1;
+            });
+            if (found) {
+                urls.add(this.urls[id]);
+            }
+        }, this);
+        return urls;
+    };
+
+    function loadIndex() {
+        if (indexPromise === null) {
+            var indexUrl = new URL(INDEX_FILE, scriptSrc);
+            var rootUrl = new URL("../", indexUrl);
+            indexPromise = fetch(indexUrl).then(function (response) {
+                if (!response.ok) {
+                    throw new Error("Cannot load " + indexUrl);
+                }
+                return response.json();
+            }).then(function (index) {
+                return new SearchIndex(index, rootUrl);
+            });
+        }
+        return indexPromise;
+    }
+
+    // show the cards whose url is in urls, or all cards if urls is null
+    function applyFilter(grids, urls) {
+        var match = urls === null ? null : function (href) {
+            return urls.has(stripHash(href));
+        };
+        document.querySelectorAll(".msg-sd-col").forEach(function (col) {
+            if (col.closest(".msg-virtual-gallery")) {
+                return;
+            }
+            var link = col.querySelector("a.sd-stretched-link");
+            var shown = !match || !link || match(link.href);
+            col.style.display = shown ? "" : "none";
+        });
+        grids.forEach(function (grid) {
+            grid.filter(match);
+        });
+    }
+
+    function initFilters(grids) {
+        if (!scriptSrc) {
+            return;
+        }
+        document.querySelectorAll(".msg-gallery-filter-input").forEach(function (input) {
+            input.addEventListener("input", function () {
+                var query = input.value;
+                if (!query.trim()) {
+                    applyFilter(grids, null);
+                    return;
+                }
+                loadIndex().then(function (index) {
+                    // skip the results of an outdated query
+                    if (input.value === query) {
+                        applyFilter(grids, index.match(query));
+                    }
+                }).catch(function () {
+                    // keep all the cards without the search index
+                });
+            });
+        });
+    }
+
+    function init() {
+        var grids = [];
+        document.querySelectorAll(".msg-virtual-gallery").forEach(function (container) {
+            if (container.querySelector("script.msg-virtual-data")) {
+                var grid = new VirtualGrid(container);
+                if (grid.cards.length) {
+                    grids.push(grid);
+                }
+            }
+        });
+        initFilters(grids);
+        if (!grids.length) {
+            return;
+        }
+
+        // a resize within the same frame as a scroll takes precedence
+        var pending = null;
+        function schedule(method) {
+            if (pending !== null) {
+                if (method === "measure") {
+                    pending = method;
+                }
+                return;
+            }
+            pending = method;
+            window.requestAnimationFrame(function () {
+                var current = pending;
+                pending = null;
+                grids.forEach(function (grid) {
+                    grid[current]();
+                });
+            });
+        }
+        window.addEventListener("scroll", function () {
+            schedule("update");
+        }, { passive: true });
+        window.addEventListener("resize", function () {
+            schedule("measure");
+        });
+    }
+
+    if (document.readyState === "loading") {
+        document.addEventListener("DOMContentLoaded", init);
+    } else {
+        init();
+    }
+})();
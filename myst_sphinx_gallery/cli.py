@@ -0,0 +1,517 @@
+"""Command line interface to generate the galleries outside of Sphinx.
+
+The ``build`` command runs the same gallery generation as the Sphinx
+extension, so that it can be run as a separate stage of a CI pipeline:
+
+.. code-block:: bash
+
+    myst-sphinx-gallery build --config docs/source/conf.py --jobs 4
+
+The thumbnails are created in parallel before the galleries are generated.
+The source of each thumbnail is recorded in a cache file, so that the
+thumbnails restored from a previous run are only created again if their
+source or the thumbnail options changed.
+
+The ``watch`` command generates the galleries, then regenerates only the
+examples changed while they are edited, e.g. alongside ``sphinx-autobuild``:
+
+.. code-block:: bash
+
+    myst-sphinx-gallery watch --config docs/source/conf.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+from functools import partial
+from pathlib import Path
+from typing import TYPE_CHECKING, Sequence
+
+from sphinx.config import eval_config_file
+from sphinx.errors import ConfigError
+from sphinx.util.tags import Tags
+
+from .config import GalleryConfig
+from .gallery import ExampleConverter, generate_gallery, iter_gallery_examples
+from .images import thumbnail_budget
+from .profiling import memory_profiler
+from .utils import safe_remove_file
+from .watch import GalleryWatcher
+
+if TYPE_CHECKING:
+    import threading
+
+#: The name of the cache file, located in the thumbnail directory if set,
+#: otherwise in the root directory of the gallery configuration.
+CACHE_FILE = ".myst_sphinx_gallery_cache.json"
+
+_CACHE_VERSION = 1
+
+
+def load_gallery_config(conf_file: Path | str) -> GalleryConfig:
+    """Load the gallery configuration from a Sphinx ``conf.py`` file.
+
+    Parameters
+    ----------
+    conf_file : Path | str
+        The path to the ``conf.py`` file defining ``myst_sphinx_gallery_config``.
+
+    Returns
+    -------
+    GalleryConfig
+        The gallery configuration.
+
+    """
+    conf_file = Path(conf_file).absolute()
+    if not conf_file.is_file():
+        msg = f"Configuration file not found: {conf_file}"
+        raise FileNotFoundError(msg)
+    namespace = eval_config_file(conf_file, Tags())
+    gallery_config = namespace.get("myst_sphinx_gallery_config")
+    if isinstance(gallery_config, dict):
+        gallery_config = GalleryConfig(**gallery_config)
+    if not isinstance(gallery_config, GalleryConfig):
+        msg = (
+            f"`myst_sphinx_gallery_config` in {conf_file} must be an instance "
+            "of `GalleryConfig` or a dict of arguments to initialize `GalleryConfig`."
+        )
+        raise TypeError(msg)
+    if (
+        gallery_config.examples_dirs is None
+        or gallery_config.gallery_dirs is None
+        or gallery_config.root_dir is None
+    ):
+        msg = (
+            f"`myst_sphinx_gallery_config` in {conf_file} must set "
+            "`examples_dirs`, `gallery_dirs` and `root_dir`."
+        )
+        raise ValueError(msg)
+    return gallery_config
+
+
+def file_digest(path: Path | str) -> str:
+    """Return the SHA-256 digest of the content of a file."""
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+def thumbnail_fingerprint(gallery_config: GalleryConfig) -> str:
+    """Return a digest of the options changing the content of the thumbnails."""
+    options = {
+        "thumbnail_config": gallery_config.thumbnail_config.to_dict(),
+        "thumbnail_strategy": gallery_config.thumbnail_strategy,
+        "notebook_thumbnail_strategy": gallery_config.notebook_thumbnail_strategy,
+        "notebook_image_mime_types": gallery_config.notebook_image_mime_types,
+        "svg_rasterizer": gallery_config.svg_rasterizer,
+    }
+    text = json.dumps(
+        options,
+        sort_keys=True,
+        default=lambda obj: getattr(obj, "__qualname__", str(obj)),
+    )
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+class ThumbnailCache:
+    """Record the sources of the thumbnails to reuse them between runs.
+
+    The cache file maps each thumbnail to the digest of its source file. The
+    thumbnails are created again if the digest of their source, or the
+    fingerprint of the thumbnail options, changed since the last run.
+    """
+
+    def __init__(self, cache_file: Path | str, fingerprint: str) -> None:
+        """Initialize the cache.
+
+        Parameters
+        ----------
+        cache_file : Path | str
+            The path to the cache file.
+        fingerprint : str
+            The fingerprint of the thumbnail options, as returned by
+            :func:`thumbnail_fingerprint`.
+
+        """
+        self.cache_file = Path(cache_file)
+        self.fingerprint = fingerprint
+        self._records: dict[str, list[str]] = {}
+
+    def load(self) -> dict[str, list[str]]:
+        """Load the records of the last run, keyed by the thumbnail paths."""
+        try:
+            data = json.loads(self.cache_file.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        if (
+            not isinstance(data, dict)
+            or data.get("version") != _CACHE_VERSION
+            or not isinstance(data.get("thumbnails"), dict)
+        ):
+            return {}
+        if data.get("fingerprint") != self.fingerprint:
+            # the thumbnail options changed, all thumbnails are outdated
+            return {thumb: ["", ""] for thumb in data["thumbnails"]}
+        return data["thumbnails"]
+
+    def invalidate(self) -> int:
+        """Remove the thumbnails whose source changed since the last run.
+
+        Returns
+        -------
+        int
+            The number of removed thumbnails.
+
+        """
+        removed = 0
+        for thumb, (source, digest) in self.load().items():
+            thumb_file = Path(thumb)
+            if not thumb_file.exists():
+                continue
+            if source and Path(source).is_file() and file_digest(source) == digest:
+                continue
+            safe_remove_file(thumb_file)
+            removed += 1
+        return removed
+
+    def update(self, thumb_file: Path, thumb_source: Path) -> None:
+        """Record the source of a thumbnail."""
+        self._records[str(thumb_file)] = [
+            str(thumb_source),
+            file_digest(thumb_source),
+        ]
+
+    def save(self) -> None:
+        """Write the records of this run into the cache file."""
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            "version": _CACHE_VERSION,
+            "fingerprint": self.fingerprint,
+            "thumbnails": dict(sorted(self._records.items())),
+        }
+        self.cache_file.write_text(json.dumps(data, indent=1), encoding="utf-8")
+
+
+def _create_thumbnail(
+    gallery_config: GalleryConfig, example: tuple[Path, Path, Path]
+) -> tuple[Path | None, Path | None, bool]:
+    """Create the thumbnail of an example, as done by the gallery generation.
+
+    Returns the thumbnail file, its source file, and whether the thumbnail
+    was created rather than found from a previous run.
+    """
+    conv = ExampleConverter(*example, gallery_config)
+    conv._parse_thumb()
+    return conv.thumb_file, conv.thumb_source, conv.thumb_created
+
+
+def build(
+    conf_file: Path | str,
+    jobs: int = 1,
+    thumbnail_dir: Path | str | None = None,
+    cache_file: Path | str | None = None,
+    use_cache: bool = True,
+    *,
+    memory_budget: int | None = None,
+) -> dict:
+    """Generate the galleries defined in a Sphinx ``conf.py`` file.
+
+    Parameters
+    ----------
+    conf_file : Path | str
+        The path to the ``conf.py`` file.
+    jobs : int, optional
+        The number of threads creating the thumbnails.
+    thumbnail_dir : Path | str, optional
+        The directory to write the thumbnails into. It overrides the
+        :attr:`~myst_sphinx_gallery.GalleryConfig.thumbnail_dir` of the
+        configuration.
+    cache_file : Path | str, optional
+        The path to the cache file. Default is :data:`CACHE_FILE` in the
+        thumbnail directory, or in the root directory if not set.
+    use_cache : bool, optional
+        Whether to read and write the cache file.
+    memory_budget : int, optional
+        The memory, in MiB, that the thumbnails created in parallel may use.
+        It overrides the
+        :attr:`~myst_sphinx_gallery.GalleryConfig.thumbnail_memory_budget` of
+        the configuration.
+
+    Returns
+    -------
+    dict
+        The summary of the run.
+
+    """
+    start = time.perf_counter()
+    gallery_config = load_gallery_config(conf_file)
+    if thumbnail_dir is not None:
+        gallery_config.thumbnail_dir = Path(thumbnail_dir).absolute()
+    if cache_file is None:
+        cache_dir = gallery_config.thumbnail_dir or gallery_config.root_dir
+        cache_file = Path(cache_dir) / CACHE_FILE
+
+    if gallery_config.profile_memory:
+        memory_profiler.enable()
+    cache = ThumbnailCache(cache_file, thumbnail_fingerprint(gallery_config))
+    invalidated = cache.invalidate() if use_cache else 0
+
+    if memory_budget is None:
+        memory_budget = gallery_config.thumbnail_memory_budget
+
+    examples = list(iter_gallery_examples(gallery_config))
+    thumbnail_budget.limit = memory_budget * 2**20 if memory_budget else None
+    try:
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            results = list(
+                pool.map(partial(_create_thumbnail, gallery_config), examples)
+            )
+    finally:
+        thumbnail_budget.limit = None
+    thumbnails = {thumb: source for thumb, source, _ in results if thumb is not None}
+    # several examples may share a thumbnail, which is only created once
+    created = len({thumb for thumb, _, is_created in results if is_created})
+
+    # the thumbnails already exist, only the gallery files are written here
+    thumb_dirs = generate_gallery(gallery_config)
+
+    if use_cache:
+        for thumb_file, thumb_source in thumbnails.items():
+            if thumb_source is not None:
+                cache.update(thumb_file, thumb_source)
+        cache.save()
+
+    summary = {
+        "config": str(Path(conf_file).absolute()),
+        "galleries": [str(d) for d in gallery_config.gallery_dirs],
+        "examples": len(examples),
+        "thumbnails": {
+            "total": len(thumbnails),
+            "created": created,
+            "cached": len(thumbnails) - created,
+            "invalidated": invalidated,
+        },
+        "thumbnail_dirs": sorted(str(d) for d in thumb_dirs),
+        "cache_file": str(cache_file) if use_cache else None,
+        "jobs": jobs,
+        "memory_budget": memory_budget,
+        "duration": round(time.perf_counter() - start, 3),
+    }
+    if memory_profiler.enabled:
+        summary["memory"] = [asdict(record) for record in memory_profiler.records]
+        summary["memory_report"] = memory_profiler.report()
+        memory_profiler.reset()
+    return summary
+
+
+def watch(
+    conf_file: Path | str,
+    thumbnail_dir: Path | str | None = None,
+    interval: float = 0.5,
+    stop: threading.Event | None = None,
+) -> None:
+    """Generate the galleries and regenerate the changed examples until stopped.
+
+    Parameters
+    ----------
+    conf_file : Path | str
+        The path to the ``conf.py`` file.
+    thumbnail_dir : Path | str, optional
+        The directory to write the thumbnails into. It overrides the
+        :attr:`~myst_sphinx_gallery.GalleryConfig.thumbnail_dir` of the
+        configuration.
+    interval : float, optional
+        The interval in seconds between two checks of the files.
+    stop : threading.Event, optional
+        An event to stop watching. Default is to watch until interrupted.
+
+    """
+    gallery_config = load_gallery_config(conf_file)
+    if thumbnail_dir is not None:
+        gallery_config.thumbnail_dir = Path(thumbnail_dir).absolute()
+    root_dir = Path(gallery_config.root_dir)
+
+    def display_name(example_file: Path) -> str:
+        try:
+            return example_file.relative_to(root_dir).as_posix()
+        except ValueError:
+            return str(example_file)
+
+    def report(example_files: list[Path]) -> None:
+        names = [display_name(example_file) for example_file in example_files]
+        print(f"{len(names)} examples updated: {', '.join(names)}")  # noqa: T201
+
+    print(  # noqa: T201
+        f"Watching {len(gallery_config.examples_dirs)} galleries, press Ctrl+C to stop"
+    )
+    GalleryWatcher(gallery_config).watch(interval, callback=report, stop=stop)
+
+
+def _jobs_option(value: str) -> int:
+    """Parse the number of jobs, ``auto`` for the number of CPUs."""
+    if value == "auto":
+        return os.cpu_count() or 1
+    try:
+        jobs = int(value)
+    except ValueError:
+        jobs = 0
+    if jobs < 1:
+        msg = f"expected a positive integer or 'auto', got {value!r}"
+        raise argparse.ArgumentTypeError(msg)
+    return jobs
+
+
+def _memory_budget_option(value: str) -> int:
+    """Parse the memory budget of the thumbnails, in MiB."""
+    try:
+        budget = int(value)
+    except ValueError:
+        budget = 0
+    if budget < 1:
+        msg = f"expected a positive number of MiB, got {value!r}"
+        raise argparse.ArgumentTypeError(msg)
+    return budget
+
+
+def _interval_option(value: str) -> float:
+    """Parse the polling interval of the watch command."""
+    try:
+        interval = float(value)
+    except ValueError:
+        interval = 0.0
+    if interval <= 0:
+        msg = f"expected a positive number of seconds, got {value!r}"
+        raise argparse.ArgumentTypeError(msg)
+    return interval
+
+
+def create_parser() -> argparse.ArgumentParser:
+    """Create the parser of the command line arguments."""
+    parser = argparse.ArgumentParser(
+        prog="myst-sphinx-gallery",
+        description="Generate the galleries of MyST Sphinx Gallery outside of Sphinx.",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build_parser = subparsers.add_parser(
+        "build",
+        help="generate the galleries and thumbnails defined in conf.py",
+    )
+    build_parser.add_argument(
+        "-c",
+        "--config",
+        default="conf.py",
+        help="path to the conf.py file defining myst_sphinx_gallery_config "
+        "(default: %(default)s)",
+    )
+    build_parser.add_argument(
+        "-j",
+        "--jobs",
+        type=_jobs_option,
+        default=1,
+        help="number of threads creating the thumbnails, or 'auto' "
+        "(default: %(default)s)",
+    )
+    build_parser.add_argument(
+        "--memory-budget",
+        type=_memory_budget_option,
+        metavar="MIB",
+        help="memory that the thumbnails created in parallel may use, in MiB, "
+        "overriding the config",
+    )
+    build_parser.add_argument(
+        "--thumbnail-dir",
+        help="directory to write the thumbnails into, overriding the config",
+    )
+    build_parser.add_argument(
+        "--cache",
+        help=f"path to the cache file (default: {CACHE_FILE} in the thumbnail "
+        "directory, or in the root directory)",
+    )
+    build_parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="do not read or write the cache file",
+    )
+    build_parser.add_argument(
+        "--summary",
+        help="write a JSON summary of the run to this file, '-' for stdout",
+    )
+
+    watch_parser = subparsers.add_parser(
+        "watch",
+        help="generate the galleries and regenerate the changed examples",
+    )
+    watch_parser.add_argument(
+        "-c",
+        "--config",
+        default="conf.py",
+        help="path to the conf.py file defining myst_sphinx_gallery_config "
+        "(default: %(default)s)",
+    )
+    watch_parser.add_argument(
+        "--thumbnail-dir",
+        help="directory to write the thumbnails into, overriding the config",
+    )
+    watch_parser.add_argument(
+        "--interval",
+        type=_interval_option,
+        default=0.5,
+        help="seconds between two checks of the files (default: %(default)s)",
+    )
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run the command line interface."""
+    args = create_parser().parse_args(argv)
+    if args.command == "watch":
+        try:
+            watch(args.config, args.thumbnail_dir, interval=args.interval)
+        except KeyboardInterrupt:
+            pass
+        except (ConfigError, OSError, TypeError, ValueError) as exc:
+            print(f"error: {exc}", file=sys.stderr)  # noqa: T201
+            return 1
+        return 0
+
+    try:
+        summary = build(
+            args.config,
+            jobs=args.jobs,
+            thumbnail_dir=args.thumbnail_dir,
+            cache_file=args.cache,
+            use_cache=not args.no_cache,
+            memory_budget=args.memory_budget,
+        )
+    except (ConfigError, OSError, TypeError, ValueError) as exc:
+        print(f"error: {exc}", file=sys.stderr)  # noqa: T201
+        return 1
+
+    thumbs = summary["thumbnails"]
+    message = (
+        f"{summary['examples']} examples in {len(summary['galleries'])} galleries, "
+        f"{thumbs['created']} thumbnails created, {thumbs['cached']} cached "
+        f"({summary['duration']}s)"
+    )
+    if args.summary == "-":
+        print(json.dumps(summary, indent=2))  # noqa: T201
+        print(message, file=sys.stderr)  # noqa: T201
+    else:
+        if args.summary:
+            Path(args.summary).write_text(
+                json.dumps(summary, indent=2), encoding="utf-8"
+            )
+        print(message)  # noqa: T201
+    if summary.get("memory_report"):
+        print(summary["memory_report"], file=sys.stderr)  # noqa: T201
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,6 +8,7 @@ from pathlib import Path
 from typing import Literal
 
 from .grid import Grid, GridItemCard, TocTree
+from .images import NotebookImageMimeTypes, SvgRasterizer
 from .utils import abs_path
 
 
@@ -181,6 +182,26 @@ class GalleryConfig:
     if both ``markdown`` and ``code`` cells contain images.
     """
 
+    notebook_image_mime_types: list[str] = field(
+        default_factory=lambda: list(NotebookImageMimeTypes)
+    )
+    """The MIME types of the images in notebook code cell outputs, in order of
+    priority. An output containing several representations of an image is
+    decoded from the first MIME type of this list it contains, and outputs
+    without any of these MIME types are ignored.
+
+    Supported MIME types are ``image/png``, ``image/jpeg``, ``image/gif`` and
+    ``image/svg+xml``.
+    """
+
+    svg_rasterizer: SvgRasterizer | None = None
+    """The function to rasterize ``image/svg+xml`` outputs of notebooks.
+
+    It is called with the SVG source and the reference size of the thumbnail,
+    and returns a PIL image. If None, the images are rasterized with
+    ``cairosvg`` if it is installed, otherwise SVG outputs are ignored.
+    """
+
     default_thumbnail_file: Path | str | None = None
     """The path to the default thumbnail image file.
     If no thumbnail image is found for an example, this image will be used.
@@ -191,7 +212,22 @@ class GalleryConfig:
     """The configuration for the thumbnail image."""
 
     remove_thumbnail_after_build: bool = True
-    """Whether to remove the thumbnail image after building the gallery."""
+    """Whether to remove the thumbnail image after building the gallery.
+    Only the thumbnails written into the source directory are removed, the
+    thumbnails cached in the doctree directory by Sphinx builds are kept.
+    """
+
+    thumbnail_dir: Path | str | None = None
+    """The directory to write the thumbnail images into.
+
+    If None, the thumbnails are written into a ``myst_sphinx_gallery_thumbs``
+    folder of each gallery directory. When building with Sphinx, a cache
+    folder in the doctree directory of the builder is used instead, so that
+    the source tree is not modified during the build.
+
+    .. note::
+        Relative paths are relative to the root directory :attr:`root_dir`.
+    """
 
     base_gallery: bool = False
     """Whether the examples are a base gallery.
@@ -202,12 +238,65 @@ class GalleryConfig:
     .. versionadded:: 0.3.0
     """
 
+    cards_per_page: int | None = None
+    """The maximum number of cards shown on a page of a gallery section.
+
+    If a section has more examples, its grid is split into numbered pages.
+    The first page is kept in the section index file, and the other pages are
+    written into the ``index_pages`` subdirectory of the section as
+    ``page<N>.rst`` files, with links to the previous and next pages. The
+    toctree of the section still lists all the examples. If None, all the
+    cards are shown on a single page.
+    """
+
     target_prefix: str = "example_"
     """The prefix to use for the target names of the gallery files.
 
     .. versionadded:: 0.2.1
     """
 
+    text_example_mode: Literal["copy", "include"] = "copy"
+    """How the markdown and rst examples are written into the gallery directory.
+
+    - ``copy``: the content of the example is copied after its target label.
+    - ``include``: a small file is written with the target label followed by
+      an ``include`` directive of the example, so that the content is not
+      duplicated. The included content is resolved as in the copied file,
+      and Sphinx rebuilds the gallery file when the example changes.
+
+    The notebooks are always copied.
+    """
+
+    io_workers: int = 1
+    """The number of threads reading and writing the example files.
+
+    The example files of a section are copied into the gallery directory by
+    this number of threads, which overlaps the latency of the file system,
+    e.g. on network drives. The toctree and the cards of the section keep the
+    order of the example files.
+    """
+
+    thumbnail_memory_budget: int | None = None
+    """The memory, in MiB, that the thumbnails created in parallel may use.
+
+    The memory of each thumbnail is estimated from the header of its image
+    as width x height x bands x frames. A thumbnail waits until it fits in
+    the budget with the thumbnails being created, and a thumbnail larger
+    than the budget is created alone. It only applies to the ``build``
+    command of the command line interface, which creates the thumbnails in
+    parallel. If None, the memory is not limited.
+    """
+
+    profile_memory: bool = False
+    """Whether to record the memory used by each example and thumbnail.
+
+    The peak memory traced by :mod:`tracemalloc` and the growth of the
+    resident set size are recorded for each example, and the examples using
+    the most memory are reported at the end of the build. Tracing the memory
+    slows down the build. It can also be enabled by setting the
+    ``MYST_SPHINX_GALLERY_PROFILE_MEMORY`` environment variable.
+    """
+
     toc_tree: TocTree = field(default_factory=TocTree)
     """A instance of :class:`~myst_sphinx_gallery.TocTree` class to create
     a table of content for gallery. Currently, no additional options are supported.
@@ -253,6 +342,39 @@ class GalleryConfig:
             if self.default_thumbnail_file is not None:
                 self.default_thumbnail_file = self.abs_path(self.default_thumbnail_file)
 
+            if self.thumbnail_dir is not None:
+                # unlike abs_path, absolute paths are kept as they are
+                self.thumbnail_dir = (
+                    Path(self.root_dir) / self.thumbnail_dir
+                ).resolve()
+
+        if self.cards_per_page is not None and self.cards_per_page < 1:
+            msg = (
+                f"cards_per_page must be a positive integer, got {self.cards_per_page}"
+            )
+            raise ValueError(msg)
+
+        if self.text_example_mode not in ("copy", "include"):
+            msg = (
+                "text_example_mode must be 'copy' or 'include', "
+                f"got {self.text_example_mode!r}"
+            )
+            raise ValueError(msg)
+
+        if self.io_workers < 1:
+            msg = f"io_workers must be a positive integer, got {self.io_workers}"
+            raise ValueError(msg)
+
+        if (
+            self.thumbnail_memory_budget is not None
+            and self.thumbnail_memory_budget < 1
+        ):
+            msg = (
+                "thumbnail_memory_budget must be a positive integer, "
+                f"got {self.thumbnail_memory_budget}"
+            )
+            raise ValueError(msg)
+
         # clear the items in toc_tree, grid, and grid_item_card, keeping the options
         self.toc_tree = self.toc_tree.copy()
         self.grid = self.grid.copy()
@@ -298,6 +420,26 @@ class GalleryThumbnailConfig:
     if both ``markdown`` and ``code`` cells contain images.
     """
 
+    notebook_image_mime_types: list[str] = field(
+        default_factory=lambda: list(NotebookImageMimeTypes)
+    )
+    """The MIME types of the images in notebook code cell outputs, in order of
+    priority. An output containing several representations of an image is
+    decoded from the first MIME type of this list it contains, and outputs
+    without any of these MIME types are ignored.
+
+    Supported MIME types are ``image/png``, ``image/jpeg``, ``image/gif`` and
+    ``image/svg+xml``.
+    """
+
+    svg_rasterizer: SvgRasterizer | None = None
+    """The function to rasterize ``image/svg+xml`` outputs of notebooks.
+
+    It is called with the SVG source and the reference size of the thumbnail,
+    and returns a PIL image. If None, the images are rasterized with
+    ``cairosvg`` if it is installed, otherwise SVG outputs are ignored.
+    """
+
     default_thumbnail_file: Path | str | None = None
     """The path to the default thumbnail image file.
     If no thumbnail image is found for an example, this image will be used.
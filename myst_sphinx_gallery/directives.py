@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import json
 import re
 from pathlib import Path
 from typing import Literal, Sequence
@@ -13,7 +14,9 @@ from sphinx import addnodes
 from sphinx.directives.other import TocTree
 from sphinx.util import logging
 from sphinx.util.docutils import SphinxDirective
+from sphinx.util.osutil import relative_uri
 from sphinx_design.cards import CardDirective
+from sphinx_design.grids import GridItemCardDirective
 from sphinx_design.shared import PassthroughTextElement
 
 from .config import GalleryConfig, GalleryThumbnailConfig
@@ -23,7 +26,12 @@ from .utils import (
     extract_title_and_tooltip,
     get_base_gallery_items,
     parse_files_without_suffix,
+    register_card_image,
+    register_gallery_pattern,
+    register_search_entry,
+    register_thumbnail_dirs,
     remove_special_chars,
+    thumbnail_cache_dir,
 )
 
 logger = logging.getLogger(__name__)
@@ -41,62 +49,134 @@ class GalleryABC(SphinxDirective):
         entry_files: str,
         row_node: nodes.Node,
         save_thumbnail: bool,
+        section: str = "",
     ) -> nodes.Node:
         """Create the cards for the row node."""
+        for entry_file in entry_files:
+            card = self.parse_card(entry_file, save_thumbnail, section)
+            row_node += self.create_card(*card)
+        return row_node
+
+    def parse_card(
+        self, entry_file: Path, save_thumbnail: bool, section: str = ""
+    ) -> tuple[str, str, str, str]:
+        """Generate the thumbnail of an example and extract the data of its card.
+
+        The example is also recorded for the search index of the galleries.
+
+        Parameters
+        ----------
+        entry_file : Path
+            The absolute path of the example file.
+        save_thumbnail : bool
+            Whether to save the thumbnail of the example.
+        section : str, optional
+            The name of the gallery section displaying the example.
+
+        Returns
+        -------
+        title, tooltip, thumb, url : str
+            The title and tooltip of the example, the path of the thumbnail
+            relative to the source directory and the url of the example
+            relative to the current document.
+
+        """
         docname = self.env.docname
         src_dir = self.env.app.srcdir
+        gallery_config = self.parse_file_gallery_config(entry_file)
+
+        entry_rel = entry_file.relative_to(src_dir).with_suffix("").as_posix()
+        ref_url = self.env.app.builder.get_relative_uri(docname, entry_rel)
+
+        # Generate the thumbnail for this example
+        conv = ExampleConverter(
+            entry_file,
+            gallery_config.examples_dirs[0],
+            gallery_config.gallery_dirs[0],
+            config=gallery_config,
+            thumbnail_location="parent",
+            save_thumbnail=save_thumbnail,
+        )
+        conv._parse_thumb()
+        if save_thumbnail:
+            register_thumbnail_dirs(self.env, [conv.thumb_dir])
+
+        # re-read this document when the example or its thumbnail changes
+        self.env.note_dependency(str(entry_file))
+        if conv.thumb_source is not None:
+            self.env.note_dependency(str(conv.thumb_source))
+
+        title, tooltip = extract_title_and_tooltip(entry_file)
+        title = remove_special_chars(title)
+        tooltip = remove_special_chars(tooltip)
+        register_search_entry(
+            self.env, docname, entry_rel, title=title, tooltip=tooltip, section=section
+        )
+        return title, tooltip, conv.gallery_thumb, ref_url
+
+    def create_card(self, title: str, tooltip: str, thumb: str, url: str) -> nodes.Node:
+        """Create the grid item node of a card."""
+        # configure the card
+        grid_item_card = GridItemCard()
+        grid_item_card.add_option("img-top", thumb)
+        grid_item_card.add_option("link", url)
+        grid_item_card.add_option("link-type", "url")
+        if "tooltip" in self.options:
+            grid_item_card.add_class_option("class-item", "msg-tooltip")
+        options_card = grid_item_card.options_format.copy()
+
+        options_card.update(
+            {key: list(val) for key, val in grid_item_card.class_options.items()}
+        )
 
-        for entry_file in entry_files:
-            gallery_config = self.parse_file_gallery_config(entry_file)
-
-            entry_rel = entry_file.relative_to(src_dir).with_suffix("").as_posix()
-
-            # Create a reference node
-            reference = nodes.reference("", f"{entry_rel}")
-            reference["internal"] = True
-            ref_url = self.env.app.builder.get_relative_uri(docname, entry_rel)
-            reference["refuri"] = ref_url
-
-            # Generate the thumbnail for this example
-            conv = ExampleConverter(
-                entry_file,
-                gallery_config.examples_dirs[0],
-                gallery_config.gallery_dirs[0],
-                config=gallery_config,
-                thumbnail_location="parent",
-                save_thumbnail=save_thumbnail,
-            )
-            conv._parse_thumb()
-
-            # configure the card
-            grid_item_card = GridItemCard()
-            grid_item_card.add_option("img-top", conv.gallery_thumb)
-            grid_item_card.add_option("link", ref_url)
-            grid_item_card.add_option("link-type", "url")
-            if "tooltip" in self.options:
-                grid_item_card.add_class_option("class-item", "msg-tooltip")
-            options_card = grid_item_card.options_format.copy()
-
-            options_card.update(
-                {key: list(val) for key, val in grid_item_card.class_options.items()}
+        # update nodes
+        card_node = create_card_node(grid_item_card.items, options_card, self)
+        card_node["tooltip"] = tooltip
+        title_node = create_card_title_node(title)
+        for child in card_node.children[0]:
+            if "sd-card-body" in child["classes"]:
+                child.insert(0, title_node)
+                break
+        return card_node
+
+    def document_title(self) -> str:
+        """Return the title of the current document, used as section name."""
+        try:
+            title, _ = extract_title_and_tooltip(self.env.doc2path(self.env.docname))
+        except (OSError, ValueError, IndexError):
+            return ""
+        return title
+
+    def create_filter_node(self) -> list[nodes.Node]:
+        """Create the input box to filter the cards if the option is set."""
+        if "filter" not in self.options:
+            return []
+        return [
+            nodes.raw(
+                "",
+                '<div class="msg-gallery-filter">'
+                '<input type="search" class="msg-gallery-filter-input" '
+                'placeholder="Filter examples" aria-label="Filter examples">'
+                "</div>",
+                format="html",
             )
+        ]
 
-            title, tooltip = extract_title_and_tooltip(entry_file)
-            title = remove_special_chars(title)
-            tooltip = remove_special_chars(tooltip)
-
-            # update nodes
-            card_node = create_card_node(grid_item_card.items, options_card, self)
-            card_node["tooltip"] = tooltip
-            title_node = create_card_title_node(title)
-            for child in card_node.children[0]:
-                if "sd-card-body" in child["classes"]:
-                    child.insert(0, title_node)
-                    break
+    def note_gallery_entry(self, entry_path: Path | str) -> None:
+        """Record an entry of the gallery to track added or removed examples.
 
-            row_node += card_node
+        Parameters
+        ----------
+        entry_path : Path | str
+            The absolute path of the entry without suffix.
 
-        return row_node
+        """
+        src_dir = Path(self.env.app.srcdir).resolve()
+        try:
+            pattern = Path(entry_path).resolve().relative_to(src_dir)
+        except ValueError:
+            return
+        register_gallery_pattern(self.env, self.env.docname, pattern)
 
     def create_toctree(self) -> list[nodes.Node]:
         """Generate the toctree node for the sub-gallery."""
@@ -149,6 +229,8 @@ class GalleryABC(SphinxDirective):
                 "base_gallery": True,
             }
         )
+        if config_dict.get("thumbnail_dir") is None:
+            config_dict["thumbnail_dir"] = thumbnail_cache_dir(self.env.app)
         return GalleryConfig(**config_dict)
 
 
@@ -159,13 +241,17 @@ class RefGalleryDirective(GalleryABC):
     examples in this gallery are all referenced from other galleries.
     """
 
-    option_spec = {"tooltip": directives.flag}  # noqa: RUF012
+    option_spec = {  # noqa: RUF012
+        "tooltip": directives.flag,
+        "filter": directives.flag,
+    }
     has_content = True
 
     def run(self) -> list[nodes.Node]:
         """Generate the grid node for the ``ref-gallery`` directive."""
         src_dir = self.env.app.srcdir
         docname = self.env.docname
+        section = self.document_title()
 
         grid_node, row_node = create_grid_node(Grid(), self)
         for entry in self.content:
@@ -173,10 +259,11 @@ class RefGalleryDirective(GalleryABC):
                 continue
             # Resolve the path relative to the current document
             entry_path = Path(src_dir) / entry
+            self.note_gallery_entry(entry_path)
             try:
                 entry_files = parse_files_without_suffix(entry_path)
                 self.create_cards_for_row_node(
-                    entry_files, row_node, save_thumbnail=True
+                    entry_files, row_node, save_thumbnail=True, section=section
                 )
             except Exception as exc:
                 msg = f"Error in directive '{self.name}' in document '{docname}': {exc}"
@@ -184,7 +271,7 @@ class RefGalleryDirective(GalleryABC):
                 self.error(msg)
         grid_node += row_node
 
-        return [grid_node]
+        return [*self.create_filter_node(), grid_node]
 
     def gallery_example(self) -> None:
         """Serve as an example for the ``ref-gallery`` directive in code docs.
@@ -206,6 +293,7 @@ class BaseGallery(GalleryABC):
     option_spec = {  # noqa: RUF012
         "tooltip": directives.flag,
         "caption": directives.unchanged,
+        "filter": directives.flag,
     }
     has_content = True
 
@@ -213,6 +301,7 @@ class BaseGallery(GalleryABC):
         """Generate the grid node for the base-gallery directive."""
         docname = self.env.docname
         src_dir = self.env.app.srcdir
+        section = self.document_title()
 
         grid_node, row_node = create_grid_node(Grid(), self)
         for entry in self.content:
@@ -222,17 +311,18 @@ class BaseGallery(GalleryABC):
                 # Resolve the path relative to the current document
                 entry_path = str(Path(self.env.relfn2path(entry.strip(), docname)[0]))
                 entry_abs = Path(src_dir) / entry_path
+                self.note_gallery_entry(entry_abs)
 
                 entry_files = parse_files_without_suffix(entry_abs)
                 self.create_cards_for_row_node(
-                    entry_files, row_node, save_thumbnail=True
+                    entry_files, row_node, save_thumbnail=True, section=section
                 )
             except Exception as exc:
                 msg = f"Error in directive '{self.name}' in document '{docname}': {exc}"
                 logger.exception(msg)
                 self.error(msg)
         grid_node += row_node
-        return [grid_node, *self.create_toctree()]
+        return [*self.create_filter_node(), grid_node, *self.create_toctree()]
 
 
 class GalleryDirective(GalleryABC):
@@ -244,12 +334,16 @@ class GalleryDirective(GalleryABC):
         2. The title of each file of items will be used as the section title in
            the gallery.
         3. The ``*`` wildcard can be used for matching multiple files.
+        4. With the ``virtual`` option, the cards are rendered in the browser
+           and only the cards close to the viewport are kept in the page.
 
     """
 
     option_spec = {  # noqa: RUF012
         "tooltip": directives.flag,
         "caption": directives.unchanged,
+        "virtual": directives.flag,
+        "filter": directives.flag,
     }
     has_content = True
 
@@ -268,7 +362,9 @@ class GalleryDirective(GalleryABC):
                 section_path = self.env.relfn2path(entry.strip(), docname)[0]
                 section_abs = (Path(src_dir) / section_path).resolve()
 
+                self.note_gallery_entry(section_abs)
                 section_abs = list(section_abs.parent.glob(f"{section_abs.name}*"))[0]
+                self.env.note_dependency(str(section_abs))
                 section_title, _ = extract_title_and_tooltip(section_abs)
 
                 # title
@@ -277,12 +373,10 @@ class GalleryDirective(GalleryABC):
 
                 section_node += create_title_node(section_title)
 
-                # grid
-                grid_node, row_node = create_grid_node(Grid(), self)
-
                 section_suffix = section_abs.suffix.lstrip(".")
 
                 # cards
+                cards = []
                 card_files = get_base_gallery_items(
                     section_abs.open().read(), section_suffix
                 )
@@ -291,21 +385,184 @@ class GalleryDirective(GalleryABC):
                         self.env.relfn2path(card_file.strip(), section_path)[0]
                     )
                     card_abs = Path(src_dir) / card_path
-                    _cards_files = parse_files_without_suffix(card_abs)
-
-                    self.create_cards_for_row_node(
-                        _cards_files, row_node, save_thumbnail=False
+                    self.note_gallery_entry(card_abs)
+                    cards.extend(
+                        self.parse_card(entry_file, False, section_title)
+                        for entry_file in parse_files_without_suffix(card_abs)
                     )
 
-                grid_node += row_node
-                section_node += grid_node
+                # grid
+                if "virtual" in self.options:
+                    section_node += self.create_virtual_grid(cards)
+                else:
+                    grid_node, row_node = create_grid_node(Grid(), self)
+                    for card in cards:
+                        row_node += self.create_card(*card)
+                    grid_node += row_node
+                    section_node += grid_node
                 section_nodes.append(section_node)
             except Exception as exc:
                 msg = f"Error in directive '{self.name}' in document '{docname}': {exc}"
                 logger.exception(msg)
                 self.error(msg)
 
-        return section_nodes + self.create_toctree()
+        return self.create_filter_node() + section_nodes + self.create_toctree()
+
+    def create_virtual_grid(self, cards: list[tuple[str, str, str, str]]) -> nodes.Node:
+        """Create the container of a grid rendered in the browser.
+
+        The cards are serialized into a JSON blob, which is rendered by
+        ``myst_sphinx_gallery.js`` for the cards close to the viewport only.
+        A list of links to the examples is kept in the page for readers
+        without JavaScript and for the search index.
+
+        Parameters
+        ----------
+        cards : list[tuple[str, str, str, str]]
+            The title, tooltip, thumbnail and url of the cards, as returned by
+            :meth:`parse_card`.
+
+        """
+        container = nodes.container(classes=["msg-virtual-gallery"])
+        if not cards:
+            return container
+
+        # the classes of the cards are taken from a card created as usual
+        prototype = self.create_card(*cards[0])
+        classes = {"col": prototype["classes"]}
+        for node in prototype.findall(nodes.Element):
+            if isinstance(node, nodes.image):
+                classes["img"] = node["classes"]
+            elif "sd-card" in node["classes"]:
+                classes["card"] = node["classes"]
+            elif "sd-card-body" in node["classes"]:
+                classes["body"] = node["classes"]
+            elif "sd-card-title" in node["classes"]:
+                classes["title"] = node["classes"]
+            elif "sd-stretched-link" in node["classes"]:
+                classes["link"] = node["classes"]
+
+        data = {
+            "tooltip": "tooltip" in self.options,
+            "classes": {
+                key: " ".join(dict.fromkeys(val)) for key, val in classes.items()
+            },
+            "cards": [
+                {
+                    "title": title,
+                    "tooltip": tooltip,
+                    "thumb": self.card_image_uri(thumb),
+                    "url": url,
+                }
+                for title, tooltip, thumb, url in cards
+            ],
+        }
+        # escape "</" so that a title cannot close the script element
+        blob = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+        blob = blob.replace("</", "<\\/")
+        container += nodes.raw(
+            "",
+            f'<script type="application/json" class="msg-virtual-data">{blob}</script>',
+            format="html",
+        )
+
+        fallback = nodes.bullet_list(classes=["msg-virtual-fallback"])
+        for title, _, _, url in cards:
+            reference = nodes.reference("", title, internal=True, refuri=url)
+            fallback += nodes.list_item("", nodes.paragraph("", "", reference))
+        container += fallback
+        return container
+
+    def card_image_uri(self, thumb: str) -> str:
+        """Return the url of a thumbnail copied for the virtual grid.
+
+        Parameters
+        ----------
+        thumb : str
+            The path of the thumbnail relative to the source directory.
+
+        """
+        docname = self.env.docname
+        image = (Path(self.env.app.srcdir) / thumb.lstrip("/")).resolve()
+        target = register_card_image(self.env, docname, image)
+        return relative_uri(self.env.app.builder.get_target_uri(docname), target)
+
+
+class GalleryCardsDirective(SphinxDirective):
+    """Directive to expand serialized cards into ``grid-item-card`` nodes.
+
+    This directive is written into the index files by
+    :func:`~myst_sphinx_gallery.generate_gallery`. Each line of the content
+    is a JSON object with the ``target`` reference and the ``img`` path of a
+    card, and the options are the ``grid-item-card`` options shared by all
+    cards. The first card is created by the ``grid-item-card`` directive of
+    sphinx-design, and the other cards are copies of it, so that the options
+    are only parsed once.
+
+    .. code-block:: rst
+
+        .. grid::
+
+            .. gallery-cards::
+                :shadow: md
+
+                {"target": "example_first", "img": "/auto_examples/first.webp"}
+                {"target": "example_last", "img": "/auto_examples/last.webp"}
+
+    """
+
+    option_spec = GridItemCardDirective.option_spec
+    has_content = True
+
+    # placeholders filled with the values of each card
+    _target = "msg-gallery-card-target"
+    _img = "msg-gallery-card-img"
+
+    def run(self) -> list[nodes.Node]:
+        """Generate the grid item nodes of the cards."""
+        try:
+            cards = [json.loads(line) for line in self.content if line.strip()]
+        except json.JSONDecodeError as exc:
+            msg = f"Invalid card in directive '{self.name}': {exc}"
+            raise self.error(msg) from exc
+        if not cards:
+            return []
+
+        prototype = self.create_prototype()
+        return [
+            self.fill_card(prototype.deepcopy(), card["target"], card["img"])
+            for card in cards
+        ]
+
+    def create_prototype(self) -> nodes.Node:
+        """Create the grid item node with placeholders as target and image."""
+        options = self.options.copy()
+        options.update({"img-top": self._img, "link": self._target, "link-type": "ref"})
+        card_directive = GridItemCardDirective(
+            "grid-item-card",
+            [f":ref:`{self._target}`"],
+            options,
+            StringList(),
+            self.lineno,
+            self.content_offset,
+            self.block_text,
+            self.state,
+            self.state_machine,
+        )
+        return card_directive.run_with_defaults()[0]
+
+    def fill_card(self, card: nodes.Node, target: str, img: str) -> nodes.Node:
+        """Replace the placeholders of a copied prototype card."""
+        img = directives.uri(img)
+        for node in list(card.findall()):
+            if isinstance(node, nodes.image) and node["uri"] == self._img:
+                node["uri"] = img
+            elif isinstance(node, addnodes.pending_xref):
+                if node["reftarget"] == self._target:
+                    node["reftarget"] = target
+            elif isinstance(node, nodes.Text) and str(node) == self._target:
+                node.parent.replace(node, nodes.Text(target))
+        return card
 
 
 def ensure_config(
@@ -2,42 +2,75 @@
 
 from __future__ import annotations
 
+import copy
+import hashlib
+import os
 import warnings
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import TYPE_CHECKING, Literal
+from typing import TYPE_CHECKING, Iterator, Literal
 
 import nbformat
 
 from .config import GalleryConfig
-from .images import CellImages, DocImages, Thumbnail, parse_md_images, parse_rst_images
+from .images import (
+    Thumbnail,
+    find_cell_image,
+    find_thumbnail_image,
+    thumbnail_output_path,
+)
+from .profiling import memory_profiler
 from .utils import (
+    check_stale_file_indexes,
     default_thumbnail,
     ensure_dir_exists,
     get_rst_title,
     load_nb_markdown,
     print_run_time,
     remove_num_prefix,
+    safe_remove_dir,
     safe_remove_file,
     to_section_title,
 )
 
 if TYPE_CHECKING:
+    from PIL import Image
+
     from .grid import Grid, GridItemCard, TocTree
 
 
 @print_run_time
-def generate_gallery(gallery_config: GalleryConfig | dict) -> None:
+def generate_gallery(
+    gallery_config: GalleryConfig | dict,
+    thumbnail_dir: Path | str | None = None,
+) -> set[Path]:
     """Generate the gallery from the examples directory.
 
     Parameters
     ----------
     gallery_config : GalleryConfig | dict
         The gallery configuration.
+    thumbnail_dir : Path | str, optional
+        The directory to write the thumbnail images into, if
+        :attr:`~myst_sphinx_gallery.GalleryConfig.thumbnail_dir` is not set
+        in the gallery configuration.
+
+    Returns
+    -------
+    thumb_dirs : set[Path]
+        The thumbnail directories created for the gallery.
 
     """
     if isinstance(gallery_config, dict):
         gallery_config = GalleryConfig(**gallery_config)
-
+    if gallery_config.profile_memory:
+        memory_profiler.enable()
+    check_stale_file_indexes()
+    if thumbnail_dir is not None and gallery_config.thumbnail_dir is None:
+        gallery_config = copy.copy(gallery_config)
+        gallery_config.thumbnail_dir = Path(thumbnail_dir).absolute()
+
+    thumb_dirs = set()
     n_gallery = len(gallery_config.gallery_dirs)
     if gallery_config.base_gallery:
         for i in range(n_gallery):
@@ -49,6 +82,7 @@ def generate_gallery(gallery_config: GalleryConfig | dict) -> None:
                 gallery_config,
             )
             gallery.convert()
+            thumb_dirs.update(gallery.thumb_dirs)
     else:
         for i in range(n_gallery):
             gallery = GalleryGenerator(
@@ -57,6 +91,70 @@ def generate_gallery(gallery_config: GalleryConfig | dict) -> None:
                 gallery_config,
             )
             gallery.convert()
+            thumb_dirs.update(gallery.thumb_dirs)
+    return thumb_dirs
+
+
+def iter_gallery_sections(
+    gallery_config: GalleryConfig,
+) -> Iterator[tuple[int, list[SectionGenerator]]]:
+    """Iterate over the sections of the galleries generated by :func:`generate_gallery`.
+
+    Parameters
+    ----------
+    gallery_config : GalleryConfig
+        The gallery configuration, with the thumbnail directory already set.
+
+    Yields
+    ------
+    index : int
+        The index of the gallery in :attr:`GalleryConfig.gallery_dirs`.
+    sections : list[SectionGenerator]
+        The generators of the sections of the gallery, a single one for a
+        base gallery.
+
+    """
+    for i in range(len(gallery_config.gallery_dirs)):
+        if gallery_config.base_gallery:
+            header_file = gallery_config.examples_dirs[i] / "GALLERY_HEADER.rst"
+            sections = [
+                SectionGenerator(
+                    header_file,
+                    gallery_config.examples_dirs[i],
+                    gallery_config.gallery_dirs[i],
+                    gallery_config,
+                )
+            ]
+        else:
+            sections = GalleryGenerator(
+                gallery_config.examples_dirs[i],
+                gallery_config.gallery_dirs[i],
+                gallery_config,
+            ).create_sections()
+        yield i, sections
+
+
+def iter_gallery_examples(
+    gallery_config: GalleryConfig,
+) -> Iterator[tuple[Path, Path, Path]]:
+    """Iterate over the examples converted by :func:`generate_gallery`.
+
+    Parameters
+    ----------
+    gallery_config : GalleryConfig
+        The gallery configuration, with the thumbnail directory already set.
+
+    Yields
+    ------
+    example_file, examples_dir, gallery_dir : Path
+        The arguments of the :class:`ExampleConverter` of each example, in the
+        order of the conversion.
+
+    """
+    for _, sections in iter_gallery_sections(gallery_config):
+        for section in sections:
+            for example_file in section.example_files:
+                yield example_file, section.examples_dir, section.gallery_dir
 
 
 class GalleryGenerator:
@@ -92,7 +190,8 @@ class GalleryGenerator:
         self._grid = config.grid.copy()
         self._grid_item_card = config.grid_item_card.copy()
 
-        self._sections = ""
+        self._sections: list[str] = []
+        self._thumb_dirs: set[Path] = set()
 
     def _scan_header_file(self) -> Path:
         """Scan header file for the whole gallery."""
@@ -150,7 +249,12 @@ class GalleryGenerator:
     @property
     def sections(self) -> str:
         """The sections for the gallery."""
-        return self._sections
+        return "".join(self._sections)
+
+    @property
+    def thumb_dirs(self) -> set[Path]:
+        """The thumbnail directories created for the gallery."""
+        return self._thumb_dirs
 
     @property
     def toc_tree(self) -> TocTree:
@@ -175,8 +279,7 @@ class GalleryGenerator:
     def add_section_item(self, title: str, section_grid: str) -> None:
         """Add a section item to the gallery."""
         title = to_section_title(title)
-        section = title + section_grid
-        self._sections += section
+        self._sections += [title, section_grid]
 
     def convert_to_index_file(self) -> None:
         """Convert the gallery header file."""
@@ -184,21 +287,37 @@ class GalleryGenerator:
         write_index_file(self.header_file, self.index_file, self.toc, self.target_str)
         write_index_file(self.header_file, self.index_file, self.sections)
 
-    def convert(self) -> None:
-        """Convert the examples to gallery."""
-        for folder in self.folders:
-            section = SectionGenerator(
+    def create_sections(self) -> list[SectionGenerator]:
+        """Create the generators of the gallery sections."""
+        return [
+            SectionGenerator(
                 folder / "GALLERY_HEADER.rst",
                 self.examples_dir,
                 self.gallery_dir,
                 self.config,
             )
-            section.convert()
+            for folder in self.folders
+        ]
+
+    def convert_sections_index(self, sections: list[SectionGenerator]) -> None:
+        """Write the gallery index file for the converted sections."""
+        for section in sections:
+            self._thumb_dirs.update(section.thumb_dirs)
             self.add_toc_item(section.index_file)
             title = get_rst_title(section.header_file)
-            self.add_section_item(title, section.section_grid)
+            section_grid = section.section_grid + section.pagination(
+                1, self.gallery_dir
+            )
+            self.add_section_item(title, section_grid)
         self.convert_to_index_file()
 
+    def convert(self) -> None:
+        """Convert the examples to gallery."""
+        sections = self.create_sections()
+        for section in sections:
+            section.convert()
+        self.convert_sections_index(sections)
+
 
 class SectionGenerator:
     """A class to generate the gallery section for a subfolder."""
@@ -236,6 +355,8 @@ class SectionGenerator:
         self._toc_tree = config.toc_tree.copy()
         self._grid = config.grid.copy()
         self._grid_item_card = config.grid_item_card.copy()
+        self._thumb_dirs: set[Path] = set()
+        self._pages: list[list[tuple[str, str]]] = []
 
     def _scan_example_files(self) -> list[Path]:
         """Parse the example files in the subfolder."""
@@ -303,6 +424,11 @@ class SectionGenerator:
         """The grid for the gallery section."""
         return str(self._grid)
 
+    @property
+    def thumb_dirs(self) -> set[Path]:
+        """The thumbnail directories created for the gallery section."""
+        return self._thumb_dirs
+
     @property
     def toc_tree(self) -> TocTree:
         """The table of contents options for gallery section."""
@@ -322,6 +448,85 @@ class SectionGenerator:
         """Add a grid card for the gallery section grid."""
         self._grid.add_item(grid_item_card)
 
+    @property
+    def n_pages(self) -> int:
+        """The number of pages of the gallery section."""
+        return max(len(self._pages), 1)
+
+    @property
+    def pages_dir(self) -> Path:
+        """Directory of the pages of the gallery section following the first one.
+
+        The pages are written into a subdirectory, so that they never overwrite
+        the examples converted into the section directory.
+        """
+        return self.index_file.parent / "index_pages"
+
+    def page_file(self, page: int) -> Path:
+        """Path to the index file of a page of the gallery section."""
+        if page == 1:
+            return self.index_file
+        return self.pages_dir / f"page{page}.rst"
+
+    def paginate(self, cards: list[tuple[str, str]]) -> None:
+        """Split the cards of the gallery section into pages."""
+        size = self.config.cards_per_page or max(len(cards), 1)
+        self._pages = [cards[i : i + size] for i in range(0, len(cards), size)]
+
+    def pagination(self, page: int, ref_dir: Path) -> str:
+        """Create the navigation links of a page to its previous and next pages.
+
+        Parameters
+        ----------
+        page : int
+            The number of the page, starting from 1.
+        ref_dir : Path
+            The directory of the document the links are written into.
+
+        Returns
+        -------
+        pagination : str
+            The navigation string, empty if the section has a single page.
+
+        """
+        if self.n_pages == 1:
+            return ""
+
+        def doc_link(text: str, page: int) -> str:
+            docname = os.path.relpath(self.page_file(page).with_suffix(""), ref_dir)
+            return f":doc:`{text} <{Path(docname).as_posix()}>`"
+
+        links = []
+        if page > 1:
+            links.append(doc_link("« Previous", page - 1))
+        links.append(f"Page {page} of {self.n_pages}")
+        if page < self.n_pages:
+            links.append(doc_link("Next »", page + 1))
+        return f"\n.. container:: msg-pagination\n\n    {' · '.join(links)}\n"
+
+    def write_page_files(self) -> None:
+        """Write the pages of the gallery section following the first one."""
+        safe_remove_dir(self.pages_dir)
+        if self.n_pages > 1:
+            ensure_dir_exists(self.pages_dir)
+
+        title = get_rst_title(self.header_file)
+        for page in range(2, self.n_pages + 1):
+            page_file = self.page_file(page)
+            grid = self.config.grid.copy()
+            grid.add_item(
+                self.config.grid_item_card.format_cards(self._pages[page - 1])
+            )
+            page_title = f"{title} ({page}/{self.n_pages})"
+            content = [
+                ":orphan:\n\n",
+                f"{page_title}\n{'=' * len(page_title)}\n",
+                str(grid),
+                self.pagination(page, page_file.parent),
+            ]
+            with page_file.open("w", encoding="utf-8") as f:
+                f.write("".join(content))
+
     def add_example_to_toc(self, gallery: str) -> None:
         """Add a example to the table of contents of section."""
         self._toc_tree.add_item(gallery.stem)
@@ -333,21 +538,43 @@ class SectionGenerator:
         """
         safe_remove_file(self.index_file)
         write_index_file(self.header_file, self.index_file, self.toc, self.target_str)
-        write_index_file(self.header_file, self.index_file, self.section_grid)
+        section_grid = self.section_grid + self.pagination(1, self.index_file.parent)
+        write_index_file(self.header_file, self.index_file, section_grid)
+        self.write_page_files()
+
+    def create_converter(self, example_file: Path) -> ExampleConverter:
+        """Create the converter of an example file of the section."""
+        return ExampleConverter(
+            example_file,
+            self.examples_dir,
+            self.gallery_dir,
+            self.config,
+        )
 
-    def convert(self) -> None:
-        """Convert the example files to standardized example files."""
-        for example_file in self.example_files:
-            conv = ExampleConverter(
-                example_file,
-                self.examples_dir,
-                self.gallery_dir,
-                self.config,
-            )
-            conv.convert()
-            self.add_grid_card(conv.grid_item_card)
+    def add_examples(self, converters: list[ExampleConverter]) -> None:
+        """Add the converted examples to the toc and grid of the section."""
+        cards = []
+        for conv in converters:
+            cards.append(conv.card_item)
+            self._thumb_dirs.add(conv.thumb_dir)
             self.add_example_to_toc(conv.gallery_file)
 
+        self.paginate(cards)
+        if cards:
+            self.add_grid_card(self.config.grid_item_card.format_cards(self._pages[0]))
+
+    def convert(self) -> None:
+        """Convert the example files to standardized example files.
+
+        The example files are converted by :attr:`GalleryConfig.io_workers
+        <myst_sphinx_gallery.GalleryConfig.io_workers>` threads, and added to
+        the section in the order of :attr:`example_files`.
+        """
+        converters = [
+            self.create_converter(example_file) for example_file in self.example_files
+        ]
+        convert_examples(converters, self.config.io_workers)
+        self.add_examples(converters)
         self.convert_section_header_file()
 
 
@@ -359,6 +586,9 @@ class ExampleConverter:
 
     _file_type: Literal["notebook", "markdown", "rst"]
     _gallery_thumb: Path | None = None
+    _thumb_file: Path | None = None
+    _thumb_source: Path | None = None
+    _thumb_created: bool = False
     _thumbnail: Thumbnail | None = None
 
     def __init__(
@@ -491,6 +721,13 @@ class ExampleConverter:
         self._parse_thumb()
         return self.config.grid_item_card.format(self.target_ref, self.gallery_thumb)
 
+    @property
+    def card_item(self) -> tuple[str, str]:
+        """The target reference and thumbnail path of the grid item card."""
+        if self.gallery_thumb is None:
+            self._parse_thumb()
+        return self.target_ref, self.gallery_thumb
+
     @property
     def target_str(self) -> str:
         """The target string in the gallery file used to link to the example file."""
@@ -508,6 +745,33 @@ class ExampleConverter:
         """Path to the thumbnail image for the gallery."""
         return self._gallery_thumb
 
+    @property
+    def thumb_file(self) -> Path | None:
+        """Absolute path to the thumbnail image of the example.
+
+        None if the thumbnail has not been parsed yet.
+        """
+        return self._thumb_file
+
+    @property
+    def thumb_source(self) -> Path | None:
+        """Path to the source file of the thumbnail image.
+
+        This is the image file referenced in the example, the notebook file for
+        images in code cell outputs, or the default thumbnail image. None if the
+        thumbnail has not been parsed yet.
+        """
+        return self._thumb_source
+
+    @property
+    def thumb_created(self) -> bool:
+        """Whether the thumbnail image was written when it was parsed.
+
+        False if the thumbnail already existed, e.g. from a previous build, or
+        if the thumbnail is not saved.
+        """
+        return self._thumb_created
+
     @property
     def default_thumb(self) -> Path:
         """Path to the default thumbnail image."""
@@ -516,7 +780,28 @@ class ExampleConverter:
     @property
     def thumb_dir(self) -> Path:
         """Path to the thumbnail directory for the example."""
-        return self.gallery_dir / "myst_sphinx_gallery_thumbs"
+        thumbnail_dir = self.config.thumbnail_dir
+        if thumbnail_dir is None:
+            return self.gallery_dir / "myst_sphinx_gallery_thumbs"
+        # mirror the gallery directory to avoid name conflicts between galleries
+        try:
+            gallery_rel = self.gallery_dir.relative_to(
+                Path(self.config.root_dir).resolve()
+            )
+        except ValueError:
+            # galleries outside the root directory may share their name
+            digest = hashlib.sha256(
+                self.gallery_dir.absolute().as_posix().encode()
+            ).hexdigest()[:10]
+            gallery_rel = f"{self.gallery_dir.name}-{digest}"
+        return Path(thumbnail_dir) / gallery_rel
+
+    @property
+    def src_dir(self) -> Path:
+        """Path to the source directory that absolute image paths refer to."""
+        if self.thumbnail_location == "gallery":
+            return self.gallery_dir.parent
+        return self.gallery_dir
 
     @property
     def no_image_thumb(self) -> Path:
@@ -524,15 +809,53 @@ class ExampleConverter:
         return self.thumb_dir / "no_image.webp"
 
     def thumb_file_rel(self, thumb_file: Path) -> str:
-        """Relative path to the thumbnail image for the example."""
-        thumb_file_rel = thumb_file.relative_to(self.gallery_dir).as_posix()
-        if self.thumbnail_location == "gallery":
-            thumb_file_rel = f"{self.gallery_dir.stem}/{thumb_file_rel}"
+        """Relative path to the thumbnail image for the example.
+
+        The path is relative to the source directory. When the thumbnails
+        are written into a cache directory outside of it, e.g. the doctree
+        directory, the path starts with ``..`` segments, which Sphinx resolves
+        from the source directory. The paths are resolved first, so that
+        symbolic links do not add ``..`` segments.
+
+        Raises
+        ------
+        ValueError
+            If the thumbnail cannot be reached from the source directory,
+            e.g. on another drive.
+
+        """
+        thumb_file = Path(thumb_file).resolve()
+        src_dir = self.src_dir.resolve()
+        try:
+            thumb_file_rel = thumb_file.relative_to(src_dir).as_posix()
+        except ValueError:
+            try:
+                thumb_file_rel = Path(os.path.relpath(thumb_file, src_dir)).as_posix()
+            except ValueError as e:
+                msg = (
+                    f"The thumbnail {thumb_file} cannot be referenced from the "
+                    f"source directory {src_dir}. Set `thumbnail_dir` to a "
+                    "directory on the same drive."
+                )
+                raise ValueError(msg) from e
         return f"/{thumb_file_rel}"
 
     @property
     def thumb_idx(self) -> int:
-        """The index of the thumbnail image to use."""
+        """The index of the thumbnail image to use.
+
+        .. deprecated::
+            The thumbnail image is picked by
+            :func:`~myst_sphinx_gallery.images.find_cell_image`, which uses
+            ``thumbnail_strategy`` directly.
+        """
+        warnings.warn(
+            "ExampleConverter.thumb_idx is deprecated, use "
+            "myst_sphinx_gallery.images.find_cell_image with the "
+            "thumbnail_strategy instead.",
+            DeprecationWarning,
+            stacklevel=2,
+        )
         if self.thumbnail_strategy == "first":
             return 0
         if self.thumbnail_strategy == "last":
@@ -550,6 +873,8 @@ class ExampleConverter:
     def _use_default_thumbnail(self) -> None:
         """Use the default thumbnail image as the gallery file thumb."""
         self._gallery_thumb = self.thumb_file_rel(self.no_image_thumb)
+        self._thumb_file = self.no_image_thumb
+        self._thumb_source = self.default_thumb
         if self.no_image_thumb.exists():
             return
 
@@ -560,10 +885,23 @@ class ExampleConverter:
                 **self.config.thumbnail_config.to_dict(),
             )
             thumbnail.save_thumbnail(self.no_image_thumb)
+            self._thumb_created = True
+
+    def _find_doc_thumb(self, style: Literal["md", "rst"] = "md") -> str | None:
+        """Find the url of the thumb image cross-referenced in the example."""
+        return find_thumbnail_image(
+            self._load_content(), style, self.thumbnail_strategy
+        )
 
-    def _parse_doc_thumb(self, images: DocImages) -> bool:
+    def _parse_doc_thumb(self, gallery_thumb: str | None) -> bool:
         """Parse thumb to be used in gallery for images cross-referenced.
 
+        Parameters
+        ----------
+        gallery_thumb : str | None
+            The url of the image found by :meth:`_find_doc_thumb`, None if
+            the example contains no image.
+
         Returns
         -------
         exists : bool
@@ -571,30 +909,37 @@ class ExampleConverter:
 
         """
         exists = True
-        if len(images) > 0:
-            thumbs = images.sel_urls("gallery_thumbnail")
-            if len(thumbs) > 0:
-                gallery_thumb = thumbs[self.thumb_idx]
-            else:
-                gallery_thumb = images[self.thumb_idx]
+        if gallery_thumb is not None:
             gallery_thumb = self.config.abs_path(gallery_thumb)
-            thumbnail = Thumbnail(
-                gallery_thumb, self.thumb_dir, **self.config.thumbnail_config.to_dict()
-            )
-            if self.save_thumbnail:
-                gallery_thumb = thumbnail.save_thumbnail()
-            else:
-                gallery_thumb = thumbnail.auto_output_path
+            self._thumb_source = gallery_thumb
+            thumb_file = thumbnail_output_path(gallery_thumb, self.thumb_dir)
+            # the image is only opened if its thumbnail does not exist yet
+            if self.save_thumbnail and not thumb_file.exists():
+                thumbnail = Thumbnail(
+                    gallery_thumb,
+                    self.thumb_dir,
+                    **self.config.thumbnail_config.to_dict(),
+                )
+                thumbnail.save_thumbnail(thumb_file)
+                self._thumb_created = True
+            gallery_thumb = thumb_file
             self._gallery_thumb = self.thumb_file_rel(gallery_thumb)
+            self._thumb_file = gallery_thumb
         else:
             exists = False
             self._use_default_thumbnail()
 
         return exists
 
-    def _parse_cell_thumb(self, images: CellImages) -> bool:
+    def _parse_cell_thumb(self, image: Image.Image | None) -> bool:
         """Parse thumb to be used in gallery for images in notebook code cells.
 
+        Parameters
+        ----------
+        image : Image.Image | None
+            The image found by :func:`~myst_sphinx_gallery.images.find_cell_image`,
+            None if the code cell outputs contain no image.
+
         Returns
         -------
         exists : bool
@@ -602,46 +947,55 @@ class ExampleConverter:
 
         """
         exists = True
-        if len(images) > 0:
+        if image is not None:
             gallery_thumb = self.thumb_dir / f"{self.example_file.stem}.webp"
             self._gallery_thumb = self.thumb_file_rel(gallery_thumb)
-            if self.save_thumbnail:
+            self._thumb_file = gallery_thumb
+            self._thumb_source = self.example_file
+            if self.save_thumbnail and not gallery_thumb.exists():
                 thumbnail = Thumbnail(
-                    images[self.thumb_idx],
+                    image,
                     self.thumb_dir,
                     **self.config.thumbnail_config.to_dict(),
                 )
                 thumbnail.save_thumbnail(gallery_thumb)
+                self._thumb_created = True
         else:
             exists = False
             self._use_default_thumbnail()
 
         return exists
 
+    def _find_cell_thumb(self) -> Image.Image | None:
+        """Find the thumb image in the code cell outputs of the notebook."""
+        return find_cell_image(
+            self.example_file,
+            self.thumbnail_strategy,
+            self.config.notebook_image_mime_types,
+            self.config.thumbnail_config.ref_size,
+            self.config.svg_rasterizer,
+        )
+
     def _parse_thumb(self) -> None:
         """Parse the thumb to be used in the gallery."""
-        content = self._load_content()
-        if self.file_type == "markdown":
-            images = parse_md_images(content)
-            self._parse_doc_thumb(images)
-        elif self.file_type == "rst":
-            images = parse_rst_images(content)
-            self._parse_doc_thumb(images)
-        elif self.file_type == "notebook":
-            if self.notebook_thumbnail_strategy == "markdown":
-                images = parse_md_images(content)
-                if not self._parse_doc_thumb(images):
-                    self._parse_cell_thumb(CellImages(self.example_file))
-            elif self.notebook_thumbnail_strategy == "code":
-                if not self._parse_cell_thumb(CellImages(self.example_file)):
-                    images = parse_md_images(content)
-                    self._parse_doc_thumb(images)
-            else:
-                msg = (
-                    "Unrecognized notebook_thumbnail_strategy: "
-                    f"{self.notebook_thumbnail_strategy}"
-                )
-                raise ValueError(msg)
+        with memory_profiler.track("example", self.example_file):
+            if self.file_type == "markdown":
+                self._parse_doc_thumb(self._find_doc_thumb("md"))
+            elif self.file_type == "rst":
+                self._parse_doc_thumb(self._find_doc_thumb("rst"))
+            elif self.file_type == "notebook":
+                if self.notebook_thumbnail_strategy == "markdown":
+                    if not self._parse_doc_thumb(self._find_doc_thumb("md")):
+                        self._parse_cell_thumb(self._find_cell_thumb())
+                elif self.notebook_thumbnail_strategy == "code":
+                    if not self._parse_cell_thumb(self._find_cell_thumb()):
+                        self._parse_doc_thumb(self._find_doc_thumb("md"))
+                else:
+                    msg = (
+                        "Unrecognized notebook_thumbnail_strategy: "
+                        f"{self.notebook_thumbnail_strategy}"
+                    )
+                    raise ValueError(msg)
 
     def _convert_notebook_file(self) -> None:
         """Convert a notebook to a standardized example file."""
@@ -656,8 +1010,35 @@ class ExampleConverter:
         with self.gallery_file.open("w", encoding="utf-8") as f:
             nbformat.write(notebook, f)
 
+    def _include_text_file(self) -> None:
+        """Write a gallery file including the text file (md, rst).
+
+        The gallery file is only written if its content changed, so that
+        Sphinx does not read it again.
+        """
+        include_path = Path(
+            os.path.relpath(self.example_file, self.gallery_file.parent)
+        ).as_posix()
+        if self.file_type == "markdown":
+            include = f"```{{include}} {include_path}\n```\n"
+        else:
+            include = f".. include:: {include_path}\n"
+        new_content = f"{self.target_str}\n\n{include}"
+        if (
+            self.gallery_file.is_file()
+            and self.gallery_file.read_text(encoding="utf-8") == new_content
+        ):
+            return
+        ensure_dir_exists(self.gallery_file.parent)
+        with self.gallery_file.open("w", encoding="utf-8") as f:
+            f.write(new_content)
+
     def _convert_text_file(self) -> None:
         """Convert a text file (md, rst) to a standardized example file."""
+        if self.config.text_example_mode == "include":
+            self._include_text_file()
+            return
+
         with self.example_file.open(encoding="utf-8") as f:
             content = f.read()
 
@@ -669,10 +1050,31 @@ class ExampleConverter:
 
     def convert(self) -> None:
         """Convert the example file to a standardized example file."""
-        if self.file_type == "notebook":
-            self._convert_notebook_file()
-        elif self.file_type in ["markdown", "rst"]:
-            self._convert_text_file()
+        with memory_profiler.track("example", self.example_file):
+            if self.file_type == "notebook":
+                self._convert_notebook_file()
+            elif self.file_type in ["markdown", "rst"]:
+                self._convert_text_file()
+
+
+def convert_examples(converters: list[ExampleConverter], workers: int = 1) -> None:
+    """Convert the example files, in a thread pool if several workers are used.
+
+    Parameters
+    ----------
+    converters : list[ExampleConverter]
+        The converters of the example files.
+    workers : int, optional
+        The number of threads converting the example files.
+
+    """
+    if workers <= 1 or len(converters) <= 1:
+        for conv in converters:
+            conv.convert()
+        return
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        # consume the results to raise the errors of the conversions
+        list(pool.map(ExampleConverter.convert, converters))
 
 
 def write_index_file(
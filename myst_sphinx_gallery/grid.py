@@ -2,9 +2,11 @@
 
 from __future__ import annotations
 
+import json
+import string
 import warnings
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, Literal
+from typing import TYPE_CHECKING, Iterable, Iterator, Literal
 
 if TYPE_CHECKING:
     from pathlib import Path
@@ -39,6 +41,40 @@ card_classes_invalid = [
 class_options = grid_classes + card_classes + card_classes_invalid
 
 
+class ClassList:
+    """An insertion-ordered collection of unique CSS classes.
+
+    The classes are kept in the order they are first added, so that the
+    generated patterns are identical across runs.
+    """
+
+    def __init__(self, classes: Iterable[str] = ()) -> None:
+        """Initialize the ClassList with the given classes."""
+        self._classes = dict.fromkeys(classes)
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the classes in insertion order."""
+        return iter(self._classes)
+
+    def __len__(self) -> int:
+        """Return the number of classes."""
+        return len(self._classes)
+
+    def __contains__(self, item: object) -> bool:
+        """Return whether the class is in the collection."""
+        return item in self._classes
+
+    def __repr__(self) -> str:
+        """Return the string representation of the ClassList."""
+        return f"ClassList({list(self)})"
+
+    def union(self, classes: Iterable[str]) -> ClassList:
+        """Return a new ClassList with the classes appended, skipping duplicates."""
+        new_classes = ClassList(self)
+        new_classes._classes.update(dict.fromkeys(classes))
+        return new_classes
+
+
 class TocTree:
     """A class to create a table of content for the gallery images."""
 
@@ -48,23 +84,24 @@ class TocTree:
             self._pattern = pattern
         else:
             self._pattern = "\n\n.. toctree::\n    :hidden:\n\n"
+        self._items: list[str] = []
 
     def __str__(self) -> str:
         """Return the table of content pattern."""
-        return self._pattern
+        return self.pattern
 
     def __repr__(self) -> str:
         """Return the table of content pattern."""
-        return f"TocTree({self._pattern})"
+        return f"TocTree({self.pattern})"
 
     def add_item(self, item: str) -> None:
         """Add an item to the table of content."""
-        self._pattern += f"    {item}\n"
+        self._items.append(f"    {item}\n")
 
     @property
     def pattern(self) -> str:
         """Return the table of content pattern."""
-        return self._pattern
+        return self._pattern + "".join(self._items)
 
     def parse_item(self, file_path: Path, ref_dir: Path) -> str:
         """Parse the item for the table of content from the file path.
@@ -154,9 +191,9 @@ class Grid:
             self.add_option(option, value)
             return
         if option not in self.class_options:
-            self.class_options[option] = set()
+            self.class_options[option] = ClassList()
         self.class_options[option] = self.class_options[option].union(
-            set(param_to_str(value).split(" "))
+            param_to_str(value).split()
         )
         self.options[option] = value
 
@@ -174,20 +211,21 @@ class Grid:
 
     def to_string(self) -> str:
         """Return the grid pattern string."""
-        pattern = self._pattern
+        parts = [self._pattern]
         # add options to the pattern
-        for key, value in self.options_format.items():
-            pattern += f"    :{key}: {value}\n"
+        parts += [
+            f"    :{key}: {value}\n" for key, value in self.options_format.items()
+        ]
         # add classes options to the pattern
-        for key, value in self.class_options.items():
-            pattern += f"    :{key}: {' '.join(value)}\n"
+        parts += [
+            f"    :{key}: {' '.join(value)}\n"
+            for key, value in self.class_options.items()
+        ]
         # add items to the pattern
-        items_str = "\n"
-        for item in self.items:
-            items_str += f"    {item}\n"
-        pattern += items_str
+        parts.append("\n")
+        parts += [f"    {item}\n" for item in self.items]
 
-        return pattern
+        return "".join(parts)
 
     def copy(self) -> Grid:
         """Return a new instance of Grid with same options.
@@ -254,9 +292,10 @@ class GridItemCard:
         self._pattern: str = grid_item_card
         self._no_items: bool = True
         self.options: dict[str, object] = {}
-        self.class_options: dict[str, set] = {}
-        self.options_format: dict[str] = {}
-        self.items: list = []
+        self._class_options: dict[str, ClassList] = {}
+        self._options_format: dict[str, str] = {}
+        self._items: list = []
+        self._template: tuple[str, ...] | None = None
 
         # add myst-sphinx-gallery class options
         self.add_class_option("class-card", "msg-sd-card")
@@ -296,13 +335,59 @@ class GridItemCard:
         """Return the grid item card pattern string."""
         return f"GirdItemCard({self.to_string()})"
 
+    @property
+    def options_format(self) -> dict[str, str]:
+        """The options of the card formatted as strings.
+
+        The returned dict may be modified, so the template is compiled again
+        after it is accessed.
+        """
+        self._template = None
+        return self._options_format
+
+    @options_format.setter
+    def options_format(self, value: dict[str, str]) -> None:
+        self._options_format = value
+        self._template = None
+
+    @property
+    def class_options(self) -> dict[str, ClassList]:
+        """The class options of the card.
+
+        The returned dict may be modified, so the template is compiled again
+        after it is accessed.
+        """
+        self._template = None
+        return self._class_options
+
+    @class_options.setter
+    def class_options(self, value: dict[str, ClassList]) -> None:
+        self._class_options = value
+        self._template = None
+
+    @property
+    def items(self) -> list:
+        """The items of the card, parsed as the content of the card.
+
+        The returned list may be modified, so the template is compiled again
+        after it is accessed.
+        """
+        self._template = None
+        return self._items
+
+    @items.setter
+    def items(self, value: list) -> None:
+        self._items = value
+        self._template = None
+
     def add_option(self, option: str, value: object) -> None:
         """Add an option to the grid item card pattern."""
         if option in card_classes:
             self.add_class_option(option, value)
             return
-        self.options_format.update({option: param_to_str(value)})
+        self._options_format.update({option: param_to_str(value)})
         self.options[option] = value
+        self._template = None
 
     def add_class_option(self, option: str, value: str) -> None:
         """Add class option to the grid item card pattern."""
@@ -314,16 +399,18 @@ class GridItemCard:
             msg = f"{option} is not suggested in myst-sphinx-gallery."
             warnings.warn(msg, stacklevel=2)
 
-        if option not in self.class_options:
-            self.class_options[option] = set()
-        self.class_options[option] = self.class_options[option].union(
-            set(param_to_str(value).split(" "))
+        if option not in self._class_options:
+            self._class_options[option] = ClassList()
+        self._class_options[option] = self._class_options[option].union(
+            param_to_str(value).split()
         )
         self.options[option] = value
+        self._template = None
 
     def add_item(self, item: str) -> None:
         """Add an item to the grid item card pattern."""
-        self.items.append(item)
+        self._items.append(item)
+        self._template = None
 
     @property
     def pattern(self) -> str:
@@ -335,25 +422,102 @@ class GridItemCard:
 
     def to_string(self) -> str:
         """Return the grid item card pattern string."""
-        pattern = self._pattern
+        return self._pattern + self._options_string()
+
+    def _options_string(self) -> str:
+        """Return the options and items part of the pattern string."""
+        parts = []
         # add options to the pattern
-        for key, value in self.options_format.items():
-            pattern += f"        :{key}: {value}\n"
+        parts += [
+            f"        :{key}: {value}\n" for key, value in self._options_format.items()
+        ]
         # add classes options to the pattern
-        for key, value in self.class_options.items():
-            pattern += f"        :{key}: {' '.join(value)}\n"
+        parts += [
+            f"        :{key}: {' '.join(value)}\n"
+            for key, value in self._class_options.items()
+        ]
         # add items to the pattern
-        items_str = "\n"
-        for item in self.items:
-            items_str += f"        {item}\n"
-        pattern += items_str
-        # add options to the pattern
+        parts.append("\n")
+        parts += [f"        {item}\n" for item in self._items]
 
-        return pattern
+        return "".join(parts)
+
+    @property
+    def template(self) -> tuple[str, ...]:
+        """The pattern compiled into literal strings and the fields between them.
+
+        The pattern string is parsed as a :meth:`str.format` string: the items
+        at even indices are the literal strings, with ``{{`` and ``}}``
+        unescaped, and the items at odd indices are the replacement fields,
+        e.g. ``target_ref`` or ``img_path``. The template is compiled once,
+        and compiled again only after the options or items may have changed.
+        """
+        if self._template is None:
+            parts = [""]
+            for literal, name, spec, conversion in string.Formatter().parse(
+                self.to_string()
+            ):
+                parts[-1] += literal
+                if name is None:
+                    continue
+                field = name
+                if conversion:
+                    field += f"!{conversion}"
+                if spec:
+                    field += f":{spec}"
+                parts += [field, ""]
+            self._template = tuple(parts)
+        return self._template
 
     def format(self, target_ref: str, img_path: str) -> str:
-        """Format grid item card pattern with target reference and image path."""
-        return self.to_string().format(target_ref=target_ref, img_path=img_path)
+        """Format grid item card pattern with target reference and image path.
+
+        The result is the same as formatting the pattern string with
+        :meth:`str.format`, but only the fields are filled for each example.
+        """
+        fields = {"target_ref": target_ref, "img_path": img_path}
+        parts = list(self.template)
+        parts[1::2] = [
+            fields[name] if name in fields else f"{{{name}}}".format(**fields)
+            for name in parts[1::2]
+        ]
+        return "".join(parts)
+
+    def format_cards(self, cards: Iterable[tuple[str, str]]) -> str:
+        """Format the cards of several examples into a ``gallery-cards`` directive.
+
+        The options of the card are written once as the directive options, and
+        each card is serialized as a JSON line with its target reference and
+        image path. The directive expands the lines into card nodes without
+        parsing a ``grid-item-card`` directive for each example.
+
+        Parameters
+        ----------
+        cards : Iterable[tuple[str, str]]
+            The target reference and image path of each card.
+
+        Returns
+        -------
+        pattern : str
+            The directive string. If the card has items, which are parsed as
+            the content of each card, or its options contain replacement
+            fields or escaped braces, the cards are formatted one by one with
+            :meth:`format` instead.
+
+        """
+        cards = list(cards)
+        options = self._options_string()
+        if self._items or "{" in options or "}" in options:
+            return "".join(self.format(*card) for card in cards)
+        if not cards:
+            return ""
+
+        parts = ["\n    .. gallery-cards::\n", options]
+        parts += [
+            f"        {json.dumps({'target': target_ref, 'img': img_path})}\n"
+            for target_ref, img_path in cards
+        ]
+        return "".join(parts)
 
     def copy(self) -> GridItemCard:
         """Return a new instance of GridItemCard with same options.
@@ -374,14 +538,17 @@ class GridItemCard:
             class_footer=self.class_footer,
         )
         new_card.options = self.options.copy()
-        new_card.class_options = self.class_options.copy()
-        new_card.options_format = self.options_format.copy()
+        new_card.class_options = self._class_options.copy()
+        new_card.options_format = self._options_format.copy()
         return new_card
 
 
 def param_to_str(parameter: object) -> str:
     """Format the grid or card parameters."""
-    if isinstance(parameter, (tuple, list, set)):
+    if isinstance(parameter, (set, frozenset)):
+        # sets have no stable order across runs
+        return " ".join(sorted(map(str, parameter)))
+    if isinstance(parameter, (tuple, list)):
         return " ".join(map(str, parameter))
     if not isinstance(parameter, (str, int, bool)):
         msg = f"{parameter} cannot be {type(parameter)}"
@@ -4,15 +4,25 @@ from __future__ import annotations
 
 import base64
 import io
+import itertools
+import os
 import re
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Literal
+from typing import Callable, Iterator, Literal, Sequence, Tuple
 
 import nbformat
 from PIL import Image, ImageOps
 from sphinx.util import logging
 
-from .utils import ensure_dir_exists, print_run_time
+from .profiling import memory_profiler
+from .utils import ensure_dir_exists, print_run_time, safe_remove_file
+
+try:
+    import cairosvg
+except ImportError:
+    cairosvg = None
 
 OperationMap = {
     "contain": ImageOps.contain,
@@ -26,6 +36,11 @@ SaveKwargs = {
     "compression": 6,
 }
 
+NotebookImageMimeTypes = ("image/png", "image/jpeg", "image/gif", "image/svg+xml")
+
+SvgRasterizer = Callable[[str, Tuple[int, int]], Image.Image]
+"""A function rasterizing a SVG source to an image of the given reference size."""
+
 logger = logging.getLogger(__name__)
 
 
@@ -95,6 +110,9 @@ class Thumbnail:
         self.quality_animated = quality_animated
 
         self._ref_size = self._format_size(ref_size)
+        if self._image.format == "JPEG":
+            # decode a downscaled version of the image that still covers ref_size
+            self._image.draft(self._image.mode, self._ref_size)
         self._save_kwargs = self._format_save_kwargs(save_kwargs)
 
     def __str__(self) -> str:
@@ -111,7 +129,7 @@ class Thumbnail:
             msg = "save_kwargs must be a dictionary"
             raise TypeError(msg)
         kwargs = SaveKwargs.copy()
-        if self.image.n_frames > 1:
+        if self.is_animated:
             kwargs.update(
                 {
                     "quality": self.quality_animated,
@@ -129,7 +147,7 @@ class Thumbnail:
 
     def _parse_frames(self) -> tuple[list[int], int]:
         """Parse the frames and duration of the output animated image."""
-        n_frames = self.image.n_frames
+        n_frames = self.n_frames
         max_frames = self.max_animation_frames
         if n_frames > max_frames:
             interval = n_frames // max_frames
@@ -168,14 +186,40 @@ class Thumbnail:
     @property
     def auto_output_path(self) -> Path:
         """Automatically generated output path for the thumbnail image."""
-        out_file = self.output_dir / self.path.name
-        return out_file.with_suffix(".thumbnail.webp")
+        return thumbnail_output_path(self.path, self.output_dir)
 
     @property
     def image(self) -> Image.Image:
         """The thumbnail image."""
         return self._image
 
+    @property
+    def n_frames(self) -> int:
+        """The number of frames of the image, 1 for formats without frames.
+
+        For GIF images, all the frames are scanned to count them.
+        """
+        return getattr(self.image, "n_frames", 1)
+
+    @property
+    def is_animated(self) -> bool:
+        """Whether the image has several frames, without counting them."""
+        return getattr(self.image, "is_animated", False)
+
+    @property
+    def decoded_size(self) -> int:
+        """The estimated memory of the decoded image, in bytes.
+
+        It is estimated from the header of the image, without decoding it, as
+        width x height x bands x frames, where the frames are the ones
+        extracted for an animated thumbnail.
+        """
+        width, height = self.image.size
+        n_bands = len(self.image.getbands())
+        n_frames = self.n_frames if self.is_animated else 1
+        n_frames = min(n_frames, self.max_animation_frames)
+        return width * height * n_bands * max(n_frames, 1)
+
     @property
     def ref_size(self) -> tuple[int, int]:
         """The reference size of the thumbnail image."""
@@ -225,30 +269,121 @@ class Thumbnail:
 
             return out_path
 
-        ensure_dir_exists(out_path.parent)
-        msg = f" Saving thumbnail to {out_path}"
-        logger.info(msg)
-
-        if self.image.n_frames > 1:
-            frames_idx, duration = self._parse_frames()
-            self.save_kwargs.update({"duration": duration})
-            # extract frames
-            frames = []
-            for idx in frames_idx:
-                self.image.seek(idx)
-                frames.append(self.generate_thumbnail())
-
-            frames[0].save(
-                out_path,
-                append_images=frames[1:],
-                **self.save_kwargs,
+        # wait for enough memory to decode the image, if a budget is set
+        reservation = thumbnail_budget.reserve(self.decoded_size)
+        with reservation, memory_profiler.track("thumbnail", self.path):
+            ensure_dir_exists(out_path.parent)
+            msg = f" Saving thumbnail to {out_path}"
+            logger.info(msg)
+
+            # write to a temporary file first, so that thumbnails saved
+            # concurrently to the same path are never read half written
+            tmp_path = out_path.with_name(
+                f".{out_path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
             )
-        else:
-            thumbnail = self.generate_thumbnail()
-            thumbnail.save(out_path, **self.save_kwargs)
+            try:
+                if self.n_frames > 1:
+                    frames_idx, duration = self._parse_frames()
+                    self.save_kwargs.update({"duration": duration})
+                    # extract frames
+                    frames = []
+                    for idx in frames_idx:
+                        self.image.seek(idx)
+                        frames.append(self.generate_thumbnail())
+
+                    frames[0].save(
+                        tmp_path,
+                        append_images=frames[1:],
+                        **self.save_kwargs,
+                    )
+                else:
+                    thumbnail = self.generate_thumbnail()
+                    thumbnail.save(tmp_path, **self.save_kwargs)
+                tmp_path.replace(out_path)
+            finally:
+                safe_remove_file(tmp_path)
         return out_path
 
 
+def thumbnail_output_path(image_path: Path | str, output_dir: Path | str) -> Path:
+    """Return the default path of the thumbnail of an image.
+
+    The path only depends on the name of the image, so that an existing
+    thumbnail can be found without opening the image.
+    """
+    out_file = Path(output_dir) / Path(image_path).name
+    return out_file.with_suffix(".thumbnail.webp")
+
+
+class MemoryBudget:
+    """Admit the thumbnails to create in parallel within a memory budget.
+
+    Each thumbnail reserves its estimated decoded size before decoding its
+    image, and waits until it fits in the budget with the thumbnails being
+    created. The thumbnails are admitted in the order they ask for memory, so
+    that the small images are packed together while a large image, which
+    does not fit with the others, waits for them to finish and then runs
+    alone. An image larger than the whole budget also runs alone.
+    """
+
+    def __init__(self, limit: int | None = None) -> None:
+        """Initialize the budget.
+
+        Parameters
+        ----------
+        limit : int, optional
+            The memory budget in bytes. If None, the thumbnails are never
+            delayed.
+
+        """
+        self.limit = limit
+        self._used = 0
+        self._queue: list[object] = []
+        self._cond = threading.Condition()
+
+    @property
+    def used(self) -> int:
+        """The memory reserved by the thumbnails being created, in bytes."""
+        return self._used
+
+    def _fits(self, size: int) -> bool:
+        """Whether a reservation fits in the budget with the current ones."""
+        return self._used == 0 or self._used + size <= self.limit
+
+    @contextmanager
+    def reserve(self, size: int) -> Iterator[None]:
+        """Reserve memory within the context, waiting for it to be available.
+
+        Parameters
+        ----------
+        size : int
+            The memory to reserve, in bytes.
+
+        """
+        if self.limit is None:
+            yield
+            return
+
+        ticket = object()
+        with self._cond:
+            self._queue.append(ticket)
+            self._cond.wait_for(lambda: self._queue[0] is ticket and self._fits(size))
+            self._queue.pop(0)
+            self._used += size
+            # the next thumbnail in the queue may fit as well
+            self._cond.notify_all()
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._used -= size
+                self._cond.notify_all()
+
+
+#: The memory budget of the thumbnails, set by the ``build`` command.
+thumbnail_budget = MemoryBudget()
+
+
 class DocImages:
     """A class to manage images in a MyST markdown/notebook/rst file."""
 
@@ -336,48 +471,67 @@ class CellImages:
     def __init__(
         self,
         notebook_file: Path,
+        mime_types: Sequence[str] = ("image/png",),
+        ref_size: tuple[int, int] | int = (320, 224),
+        svg_rasterizer: SvgRasterizer | None = None,
     ) -> None:
-        """Initialize the CellImages object."""
+        """Initialize the CellImages object.
+
+        Parameters
+        ----------
+        notebook_file : Path
+            The path to the notebook file.
+        mime_types : Sequence[str], optional
+            The MIME types of the images to extract, in order of priority.
+            See :func:`find_cell_image` for more details.
+        ref_size : tuple[int, int] | int, optional
+            The size to rasterize SVG images at.
+        svg_rasterizer : SvgRasterizer | None, optional
+            The function to rasterize SVG images.
+
+        """
         self._notebook_file = Path(notebook_file)
-        self._images = self._extract_images()
+        self._mime_types = _supported_mime_types(mime_types, svg_rasterizer)
+        self._ref_size = ref_size
+        self._svg_rasterizer = svg_rasterizer
+        self._image_data = self._extract_image_data()
+        self._images: dict[int, Image.Image] = {}
 
-    def _extract_images(self) -> list[Image.Image]:
-        """Extract images from code cell outputs in a notebook."""
+    def _extract_image_data(self) -> list[tuple[str, str]]:
+        """Extract the encoded images from code cell outputs in a notebook.
+
+        The images are only decoded when they are accessed.
+        """
         with self.notebook_file.open(encoding="utf-8") as f:
             notebook = nbformat.read(f, as_version=4)
-
-        images = []
-        for cell in notebook.cells:
-            if cell.cell_type == "code":
-                for output in cell.outputs:
-                    if "data" in output and "image/png" in output.data:
-                        # get base64 encoded image data
-                        img_data = base64.b64decode(output.data["image/png"])
-                        # convert to PIL image
-                        img = Image.open(io.BytesIO(img_data))
-                        images.append(img)
-        return images
+        return list(_iter_cell_image_data(notebook, self._mime_types))
 
     def __len__(self) -> int:
         """Return the number of images."""
-        return len(self.images)
+        return len(self._image_data)
 
     def __str__(self) -> str:
         """Return the string representation of the object."""
-        return f"CellImages(images={len(self.images)})"
+        return f"CellImages(images={len(self)})"
 
     def __repr__(self) -> str:
         """Return the string representation of the object."""
-        return f"CellImages(images={len(self.images)})"
+        return f"CellImages(images={len(self)})"
 
     def __getitem__(self, idx: int) -> Image.Image:
         """Return the image at the specified index."""
-        return self.images[idx]
+        idx = range(len(self))[idx]
+        if idx not in self._images:
+            mime_type, data = self._image_data[idx]
+            self._images[idx] = _decode_cell_image(
+                mime_type, data, self._ref_size, self._svg_rasterizer
+            )
+        return self._images[idx]
 
     @property
     def images(self) -> list[Image.Image]:
         """A list of images extracted from the notebook."""
-        return self._images
+        return [self[i] for i in range(len(self))]
 
     @property
     def notebook_file(self) -> Path:
@@ -409,13 +563,135 @@ class CellImages:
         img.save(output_file)
 
 
-def parse_md_images(markdown_content: str) -> DocImages:
+def find_cell_image(
+    notebook_file: Path | str,
+    thumbnail_strategy: Literal["first", "last"] = "last",
+    mime_types: Sequence[str] = NotebookImageMimeTypes,
+    ref_size: tuple[int, int] | int = (320, 224),
+    svg_rasterizer: SvgRasterizer | None = None,
+) -> Image.Image | None:
+    """Find the image to be used as thumbnail in the code cell outputs.
+
+    The cells and their outputs are walked from the start for the ``"first"``
+    strategy and from the end for the ``"last"`` strategy, and only the image
+    found is decoded.
+
+    Parameters
+    ----------
+    notebook_file : Path | str
+        The path to the notebook file.
+    thumbnail_strategy : Literal["first", "last"], optional
+        Whether to use the first or the last image, by default "last".
+    mime_types : Sequence[str], optional
+        The MIME types of the images, in order of priority. An output with
+        several representations of the same image is decoded from the first
+        MIME type of this list it contains. Supported MIME types are
+        ``image/png``, ``image/jpeg``, ``image/gif`` and ``image/svg+xml``.
+    ref_size : tuple[int, int] | int, optional
+        The reference size of the thumbnail, used to rasterize SVG images.
+    svg_rasterizer : SvgRasterizer | None, optional
+        The function to rasterize SVG images, called with the SVG source and
+        ``ref_size``. If None, :func:`cairosvg_rasterizer` is used when
+        ``cairosvg`` is installed, otherwise SVG images are ignored.
+
+    Returns
+    -------
+    image : Image.Image | None
+        The thumbnail image, None if no image is found in the outputs.
+
+    """
+    if thumbnail_strategy not in ("first", "last"):
+        msg = f"Unrecognized thumbnail_strategy: {thumbnail_strategy}"
+        raise ValueError(msg)
+    mime_types = _supported_mime_types(mime_types, svg_rasterizer)
+    with Path(notebook_file).open(encoding="utf-8") as f:
+        notebook = nbformat.read(f, as_version=4)
+
+    images = _iter_cell_image_data(
+        notebook, mime_types, reverse=thumbnail_strategy == "last"
+    )
+    image = next(images, None)
+    if image is None:
+        return None
+    return _decode_cell_image(*image, ref_size, svg_rasterizer)
+
+
+def cairosvg_rasterizer(svg: str, ref_size: tuple[int, int]) -> Image.Image:
+    """Rasterize a SVG image with ``cairosvg`` to the width of ``ref_size``.
+
+    The aspect ratio of the SVG image is preserved.
+    """
+    if cairosvg is None:
+        msg = "cairosvg is required to rasterize SVG images"
+        raise ImportError(msg)
+    png = cairosvg.svg2png(bytestring=svg.encode("utf-8"), output_width=ref_size[0])
+    return Image.open(io.BytesIO(png))
+
+
+def _supported_mime_types(
+    mime_types: Sequence[str],
+    svg_rasterizer: SvgRasterizer | None,
+) -> list[str]:
+    """Check the MIME types, dropping SVG if it cannot be rasterized."""
+    for mime_type in mime_types:
+        if mime_type not in NotebookImageMimeTypes:
+            msg = (
+                f"Unsupported MIME type: {mime_type}. "
+                f"Supported MIME types are {NotebookImageMimeTypes}"
+            )
+            raise ValueError(msg)
+    if svg_rasterizer is None and cairosvg is None:
+        return [m for m in mime_types if m != "image/svg+xml"]
+    return list(mime_types)
+
+
+def _iter_cell_image_data(
+    notebook: nbformat.NotebookNode,
+    mime_types: Sequence[str] = ("image/png",),
+    reverse: bool = False,
+) -> Iterator[tuple[str, str]]:
+    """Iterate over the (MIME type, encoded image) in the code cell outputs."""
+    cells = reversed(notebook.cells) if reverse else notebook.cells
+    for cell in cells:
+        if cell.cell_type != "code":
+            continue
+        outputs = reversed(cell.outputs) if reverse else cell.outputs
+        for output in outputs:
+            if "data" not in output:
+                continue
+            for mime_type in mime_types:
+                if mime_type in output.data:
+                    yield mime_type, output.data[mime_type]
+                    break
+
+
+def _decode_cell_image(
+    mime_type: str,
+    data: str,
+    ref_size: tuple[int, int] | int = (320, 224),
+    svg_rasterizer: SvgRasterizer | None = None,
+) -> Image.Image:
+    """Decode an image of a code cell output.
+
+    Raster images are opened lazily, SVG images are rasterized at ``ref_size``.
+    """
+    if mime_type == "image/svg+xml":
+        if isinstance(ref_size, int):
+            ref_size = (ref_size, ref_size)
+        if svg_rasterizer is None:
+            svg_rasterizer = cairosvg_rasterizer
+        return svg_rasterizer(data, tuple(ref_size))
+    return Image.open(io.BytesIO(base64.b64decode(data)))
+
+
+def parse_md_images(markdown_content: str, max_images: int | None = None) -> DocImages:
     """Parse the image information (url, alt) from a markdown content.
 
     Two types of markdown image syntax are supported:
 
     1. Conventional markdown image syntax: ``![alt](img/xxx.png)``
-    2. Myst markdown image/figure syntax: See `Images and figures
+    2. Myst markdown image/figure syntax using backtick or colon fences: See
+       `Images and figures
        <https://myst-parser.readthedocs.io/en/latest/syntax/images_and_figures.html>`_
        for more details.
 
@@ -427,36 +703,209 @@ def parse_md_images(markdown_content: str) -> DocImages:
     ----------
     markdown_content : str
         The markdown content.
+    max_images : int, optional
+        The maximum number of images to parse. The scan stops as soon as this
+        number of images is found. If None, all images are parsed.
 
     Returns
     -------
     images : DocImages
-        A DocImages instance, which contains the image url and alt text.
+        A DocImages instance, which contains the image url and alt text in the
+        order they appear in the content.
+
+    """
+    images = iter_md_images(markdown_content)
+    if max_images is not None:
+        images = itertools.islice(images, max_images)
+    return DocImages(list(images))
+
+
+_md_token_pattern = re.compile(r"!\[|(```|:::)\{(?:image|figure)\}")
+_whitespace_pattern = re.compile(r"\s*")
+
+
+def iter_md_images(markdown_content: str) -> Iterator[tuple[str, str]]:
+    """Iterate over the images (url, alt) in a markdown content.
+
+    The content is scanned once from the start to the end, and the images of
+    all supported syntaxes are yielded in the order they appear in the content.
+    See :func:`parse_md_images` for the supported syntaxes.
+
+    Parameters
+    ----------
+    markdown_content : str
+        The markdown content.
+
+    Yields
+    ------
+    image : tuple[str, str]
+        The image url and alt text.
 
     """
-    images = []
+    # the positions from which no closing fence can be found anymore
+    unclosed_fences: dict[str, int] = {}
+    pos = 0
+    while True:
+        match = _md_token_pattern.search(markdown_content, pos)
+        if match is None:
+            return
+        image, pos = _scan_md_token(markdown_content, match, unclosed_fences)
+        if image is not None:
+            yield image
+
+
+_md_token_prefixes = ("![", "```{", ":::{")
+
+
+def iter_md_images_reversed(markdown_content: str) -> Iterator[tuple[str, str]]:
+    """Iterate over the images (url, alt) in a markdown content in reverse order.
+
+    The content is scanned from the end to the start, line by line, so that
+    the last images can be found without scanning the whole content. The
+    images are yielded in the reverse order of :func:`iter_md_images`.
+
+    Parameters
+    ----------
+    markdown_content : str
+        The markdown content.
 
-    # case 1 (conventional markdown image syntax): ![alt](img/xxx.png)
-    md_pattern = r"!\[(.*?)\]\((.*?)\)"
-    for match in re.finditer(md_pattern, markdown_content):
-        alt, url = match.groups()
-        images.append((strip_str(url), strip_str(alt)))
+    Yields
+    ------
+    image : tuple[str, str]
+        The image url and alt text.
 
-    # case 2 (myst markdown image/figure syntax):
-    myst_pattern = r"```\{(image|figure)\}\s+(.*?)\n(.*?)```"
-    for match in re.finditer(myst_pattern, markdown_content, re.DOTALL):
-        directive, url, options = match.groups()
+    """
+    content = markdown_content
+    unclosed_fences: dict[str, int] = {}
+    # the last position of each token prefix in the content not scanned yet
+    positions = {prefix: content.rfind(prefix) for prefix in _md_token_prefixes}
+    while True:
+        pos = max(positions.values())
+        if pos == -1:
+            return
+        line_start = content.rfind("\n", 0, pos) + 1
+        line_end = content.find("\n", pos)
+        if line_end == -1:
+            line_end = len(content)
+
+        # images never start in the middle of a token of the same line, so
+        # the line is scanned forward as :func:`iter_md_images` would do
+        images = []
+        start = line_start
+        while True:
+            match = _md_token_pattern.search(content, start, line_end)
+            if match is None:
+                break
+            image, start = _scan_md_token(content, match, unclosed_fences)
+            if image is not None:
+                images.append(image)
+        yield from reversed(images)
+
+        for prefix, prefix_pos in positions.items():
+            if prefix_pos >= line_start:
+                positions[prefix] = content.rfind(prefix, 0, line_start)
+
+
+def _scan_md_token(
+    content: str,
+    match: re.Match,
+    unclosed_fences: dict[str, int],
+) -> tuple[tuple[str, str] | None, int]:
+    """Scan the image starting with a token matched by ``_md_token_pattern``."""
+    fence = match.group(1)
+    if fence is None:
+        return _scan_md_image(content, match.end())
+    return _scan_myst_image(content, match.end(), fence, unclosed_fences)
+
+
+def _scan_md_image(content: str, start: int) -> tuple[tuple[str, str] | None, int]:
+    """Scan a conventional markdown image ``![alt](url)`` in a single line.
+
+    Parameters
+    ----------
+    content : str
+        The markdown content.
+    start : int
+        The position right after the ``![`` token.
 
-        # find alt text
-        alt_match = re.search(r":alt:\s*(.*?)\n", options)
-        alt = alt_match.group(1).strip() if alt_match else ""
+    Returns
+    -------
+    image : tuple[str, str] | None
+        The image url and alt text, None if it is not a valid image.
+    end : int
+        The position to continue scanning from.
 
-        images.append((strip_str(url), strip_str(alt)))
+    """
+    line_end = content.find("\n", start)
+    if line_end == -1:
+        line_end = len(content)
+    sep = content.find("](", start, line_end)
+    if sep == -1:
+        # no other image in the rest of this line can be closed either
+        return None, line_end
+    close = content.find(")", sep + 2, line_end)
+    if close == -1:
+        return None, line_end
+    alt = content[start:sep]
+    url = content[sep + 2 : close]
+    return (strip_str(url), strip_str(alt)), close + 1
+
+
+def _scan_myst_image(
+    content: str,
+    start: int,
+    fence: str,
+    unclosed_fences: dict[str, int],
+) -> tuple[tuple[str, str] | None, int]:
+    """Scan a MyST image/figure directive.
 
-    return DocImages(images)
+    Parameters
+    ----------
+    content : str
+        The markdown content.
+    start : int
+        The position right after the ``{image}`` or ``{figure}`` token.
+    fence : str
+        The fence of the directive, either ````` ``` ````` or ``:::``.
+    unclosed_fences : dict[str, int]
+        The positions from which no closing fence can be found, used to avoid
+        searching the rest of the content again for unclosed directives.
 
+    Returns
+    -------
+    image : tuple[str, str] | None
+        The image url and alt text, None if it is not a valid image.
+    end : int
+        The position to continue scanning from.
 
-def parse_rst_images(rst_content: str) -> DocImages:
+    """
+    url_start = _whitespace_pattern.match(content, start).end()
+    if url_start == start:
+        return None, start
+    url_end = content.find("\n", url_start)
+    if url_end == -1:
+        return None, len(content)
+    if url_end >= unclosed_fences.get(fence, len(content) + 1):
+        return None, url_end + 1
+    close = content.find(fence, url_end + 1)
+    if close == -1:
+        unclosed_fences[fence] = url_end
+        return None, url_end + 1
+
+    # find alt text in the options
+    alt = ""
+    alt_start = content.find(":alt:", url_end + 1, close)
+    if alt_start != -1:
+        alt_start = _whitespace_pattern.match(content, alt_start + 5, close).end()
+        alt_end = content.find("\n", alt_start, close)
+        if alt_end != -1:
+            alt = content[alt_start:alt_end]
+
+    url = content[url_start:url_end]
+    return (strip_str(url), strip_str(alt)), url_end + 1
+
+
+def parse_rst_images(rst_content: str, max_images: int | None = None) -> DocImages:
     """Parse the images (url, alt) from a reStructuredText content.
 
     rst image/figure syntax are supported:
@@ -473,6 +922,9 @@ def parse_rst_images(rst_content: str) -> DocImages:
     ----------
     rst_content : str
         The reStructuredText content.
+    max_images : int, optional
+        The maximum number of images to parse. The scan stops as soon as this
+        number of images is found. If None, all images are parsed.
 
     Returns
     -------
@@ -480,17 +932,194 @@ def parse_rst_images(rst_content: str) -> DocImages:
         A DocImages instance, which contains the image url and alt text.
 
     """
-    pattern = r"\.\.\s+(image|figure)::\s+(.*?)\n(?:\s+:.*?:\s*(.*?)\n)*"
+    images = iter_rst_images(rst_content)
+    if max_images is not None:
+        images = itertools.islice(images, max_images)
+    return DocImages(list(images))
+
+
+_rst_directive_pattern = re.compile(r"\.\.\s+(?:image|figure)::(.*)")
+
+
+def iter_rst_images(rst_content: str) -> Iterator[tuple[str, str]]:
+    """Iterate over the images (url, alt) in a reStructuredText content.
+
+    The content is scanned line by line. The option block of an image/figure
+    directive consists of the lines following the directive that are indented
+    deeper than the directive, and it ends at the first blank or dedented line.
+
+    Parameters
+    ----------
+    rst_content : str
+        The reStructuredText content.
+
+    Yields
+    ------
+    image : tuple[str, str]
+        The image url and alt text.
+
+    """
+    lines = rst_content.splitlines()
+    idx = 0
+    while idx < len(lines):
+        match = _rst_directive_pattern.match(lines[idx].lstrip())
+        if match is None:
+            idx += 1
+            continue
+        image, idx = _scan_rst_directive(lines, idx, match)
+        yield image
+
+
+def iter_rst_images_reversed(rst_content: str) -> Iterator[tuple[str, str]]:
+    """Iterate over the images (url, alt) in reStructuredText in reverse order.
+
+    The lines are scanned from the end to the start, and the option block of
+    each directive found is parsed as in :func:`iter_rst_images`. The images
+    are yielded in the reverse order of :func:`iter_rst_images`.
+
+    Parameters
+    ----------
+    rst_content : str
+        The reStructuredText content.
+
+    Yields
+    ------
+    image : tuple[str, str]
+        The image url and alt text.
+
+    """
+    lines = rst_content.splitlines()
+    # the directives found below in the paragraph, which may still be in the
+    # option block of a directive above, from the bottom
+    directives: list[tuple[int, re.Match]] = []
+    # the groups of these directives, as the minimum indent of the lines from
+    # them up to the current line and the index of the first directive of the
+    # group. The indents increase from the bottom group.
+    groups: list[tuple[int, int]] = []
+    for idx in range(len(lines) - 1, -1, -1):
+        stripped = lines[idx].lstrip()
+        indent = len(lines[idx]) - len(stripped)
+        match = _rst_directive_pattern.match(stripped)
+        if match is not None:
+            # the directives indented deeper on every line up to this
+            # directive are in its option block
+            while groups and groups[-1][0] > indent:
+                del directives[groups.pop()[1] :]
+        start = len(directives)
+        while groups and groups[-1][0] >= indent:
+            start = groups.pop()[1]
+        if match is not None:
+            directives.append((idx, match))
+        if len(directives) > start:
+            groups.append((indent, start))
+        if not stripped or indent == 0:
+            # no directive above can own the lines below
+            for directive_idx, directive_match in directives:
+                yield _scan_rst_directive(lines, directive_idx, directive_match)[0]
+            directives.clear()
+            groups.clear()
+    for directive_idx, directive_match in directives:
+        yield _scan_rst_directive(lines, directive_idx, directive_match)[0]
+
+
+def _scan_rst_directive(
+    lines: list[str],
+    idx: int,
+    match: re.Match,
+) -> tuple[tuple[str, str], int]:
+    """Scan the image/figure directive at line ``idx``.
+
+    Returns
+    -------
+    image : tuple[str, str]
+        The image url and alt text.
+    end : int
+        The index of the first line after the directive.
+
+    """
+    n_lines = len(lines)
+    line = lines[idx]
+    indent = len(line) - len(line.lstrip())
+    idx += 1
+
+    # the argument may be given in the next line
+    url = match.group(1).strip()
+    if not url and idx < n_lines:
+        next_line = lines[idx].lstrip()
+        next_indent = len(lines[idx]) - len(next_line)
+        if next_line and next_indent > indent and not next_line.startswith(":"):
+            url = next_line
+            idx += 1
+
+    alt = ""
+    found_alt = False
+    while idx < n_lines:
+        option_line = lines[idx]
+        option = option_line.lstrip()
+        if not option or len(option_line) - len(option) <= indent:
+            break
+        if not found_alt and option.startswith(":alt:"):
+            alt = option[5:]
+            found_alt = True
+        idx += 1
+
+    return (strip_str(url), strip_str(alt)), idx
+
+
+def find_thumbnail_image(
+    content: str,
+    style: Literal["md", "rst"] = "md",
+    thumbnail_strategy: Literal["first", "last"] = "last",
+    thumbnail_alt: str = "gallery_thumbnail",
+) -> str | None:
+    """Find the url of the image to be used as thumbnail in a document.
+
+    Images with the alt text ``thumbnail_alt`` take priority over the other
+    images. The content is scanned from the start for the ``"first"`` strategy
+    and from the end for the ``"last"`` strategy, and the scan stops as soon
+    as an image with the alt text ``thumbnail_alt`` is found.
 
-    images = []
-    for match in re.finditer(pattern, rst_content, re.DOTALL):
-        url = match.group(2).strip()
-        # find alt text
-        alt_match = re.search(r":alt:\s*(.*?)\n", match.group(0))
-        alt = alt_match.group(1).strip() if alt_match else ""
-        images.append((strip_str(url), strip_str(alt)))
+    Parameters
+    ----------
+    content : str
+        The markdown or reStructuredText content.
+    style : Literal["md", "rst"], optional
+        The markup of the content, by default "md".
+    thumbnail_strategy : Literal["first", "last"], optional
+        Whether to use the first or the last image, by default "last".
+    thumbnail_alt : str, optional
+        The alt text of the images taking priority, by default
+        "gallery_thumbnail".
 
-    return DocImages(images)
+    Returns
+    -------
+    url : str | None
+        The url of the thumbnail image, None if no image is found.
+
+    """
+    if style == "md":
+        iterators = (iter_md_images, iter_md_images_reversed)
+    elif style == "rst":
+        iterators = (iter_rst_images, iter_rst_images_reversed)
+    else:
+        msg = f"Unrecognized style: {style}"
+        raise ValueError(msg)
+
+    if thumbnail_strategy == "first":
+        images = iterators[0](content)
+    elif thumbnail_strategy == "last":
+        images = iterators[1](content)
+    else:
+        msg = f"Unrecognized thumbnail_strategy: {thumbnail_strategy}"
+        raise ValueError(msg)
+
+    fallback = None
+    for url, alt in images:
+        if alt == thumbnail_alt:
+            return url
+        if fallback is None:
+            fallback = url
+    return fallback
 
 
 def strip_str(s: str) -> str:
@@ -0,0 +1,218 @@
+"""Profile the memory used to convert the examples and create the thumbnails.
+
+The profiling is enabled by :attr:`GalleryConfig.profile_memory
+<myst_sphinx_gallery.GalleryConfig.profile_memory>`, or by setting the
+``MYST_SPHINX_GALLERY_PROFILE_MEMORY`` environment variable. The peak memory
+traced by :mod:`tracemalloc` and the growth of the resident set size (RSS) of
+the process are then recorded for each example converter and each saved
+thumbnail, and the examples using the most memory are reported at the end of
+the build.
+
+.. note::
+    :mod:`tracemalloc` traces the whole process. When the thumbnails are
+    created in parallel, the peak of a thumbnail includes the memory of the
+    thumbnails created at the same time.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Iterator
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+#: The environment variable enabling the memory profiling.
+PROFILE_MEMORY_ENV = "MYST_SPHINX_GALLERY_PROFILE_MEMORY"
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def current_rss() -> int | None:
+    """Return the resident set size of the process in bytes, None if unknown.
+
+    The current RSS is read from ``/proc`` on Linux. On other platforms, the
+    peak RSS of the process is used instead.
+    """
+    try:
+        with open("/proc/self/statm", encoding="ascii") as f:  # noqa: PTH123
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+@dataclass
+class MemoryRecord:
+    """The memory used by a task of the gallery generation."""
+
+    kind: str
+    """The kind of the task, ``example`` or ``thumbnail``."""
+
+    name: str
+    """The file the task processed."""
+
+    peak: int = 0
+    """The peak memory traced during the task, in bytes, above the memory
+    traced when the task started."""
+
+    rss_delta: int | None = None
+    """The growth of the resident set size during the task, in bytes, None if
+    the RSS is unknown on this platform."""
+
+    def merge(self, other: MemoryRecord) -> None:
+        """Keep the largest values of two records of the same task."""
+        self.peak = max(self.peak, other.peak)
+        if other.rss_delta is not None:
+            self.rss_delta = max(self.rss_delta or 0, other.rss_delta)
+
+
+class _Frame:
+    """A task being tracked, with the peak traced memory seen so far."""
+
+    def __init__(self, record: MemoryRecord, start: int, rss: int | None) -> None:
+        self.record = record
+        self.start = start
+        self.rss = rss
+        self.peak = start
+
+
+class MemoryProfiler:
+    """Record the memory used by the tasks of the gallery generation.
+
+    The tasks may be nested, e.g. the thumbnail saved while converting an
+    example. As :func:`tracemalloc.reset_peak` resets the peak of the whole
+    process, the peak seen by the outer tasks is saved before each reset.
+    """
+
+    def __init__(self) -> None:
+        """Initialize a disabled profiler."""
+        self._enabled = False
+        self._started_tracing = False
+        self._records: dict[tuple[str, str], MemoryRecord] = {}
+        self._stack: list[_Frame] = []
+        self._lock = threading.RLock()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the memory is profiled."""
+        return self._enabled or bool(os.environ.get(PROFILE_MEMORY_ENV))
+
+    @property
+    def records(self) -> list[MemoryRecord]:
+        """The records of the tasks, sorted by decreasing peak memory."""
+        with self._lock:
+            records = list(self._records.values())
+        return sorted(records, key=lambda record: record.peak, reverse=True)
+
+    def enable(self) -> None:
+        """Enable the profiling."""
+        self._enabled = True
+
+    def reset(self) -> None:
+        """Disable the profiling and clear the records."""
+        with self._lock:
+            self._enabled = False
+            self._records.clear()
+            self._stack.clear()
+            if self._started_tracing:
+                tracemalloc.stop()
+                self._started_tracing = False
+
+    def _update_peaks(self) -> None:
+        """Save the traced peak into the tracked tasks before a reset."""
+        _, peak = tracemalloc.get_traced_memory()
+        for frame in self._stack:
+            frame.peak = max(frame.peak, peak)
+
+    @contextmanager
+    def track(self, kind: str, name: Path | str) -> Iterator[None]:
+        """Record the memory used within the context, if profiling is enabled.
+
+        Parameters
+        ----------
+        kind : str
+            The kind of the task, e.g. ``example`` or ``thumbnail``.
+        name : Path | str
+            The file the task processes.
+
+        """
+        if not self.enabled:
+            yield
+            return
+
+        with self._lock:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracing = True
+            self._update_peaks()
+            if hasattr(tracemalloc, "reset_peak"):
+                tracemalloc.reset_peak()
+            record = MemoryRecord(kind, str(name))
+            frame = _Frame(record, tracemalloc.get_traced_memory()[0], current_rss())
+            self._stack.append(frame)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._update_peaks()
+                self._stack.remove(frame)
+                rss = current_rss()
+                record.peak = frame.peak - frame.start
+                if rss is not None and frame.rss is not None:
+                    record.rss_delta = rss - frame.rss
+                key = (kind, record.name)
+                if key in self._records:
+                    self._records[key].merge(record)
+                else:
+                    self._records[key] = record
+
+    def report(self, top: int = 10) -> str:
+        """Return a report of the tasks using the most memory.
+
+        Parameters
+        ----------
+        top : int, optional
+            The number of tasks reported for each kind.
+
+        Returns
+        -------
+        str
+            The report, empty if no task was recorded.
+
+        """
+        lines = []
+        for kind in ("example", "thumbnail"):
+            records = [record for record in self.records if record.kind == kind]
+            if not records:
+                continue
+            lines.append(f"Top {min(top, len(records))} {kind}s by peak memory:")
+            lines.extend(
+                f"  {_format_size(record.peak):>10} peak, "
+                f"{_format_size(record.rss_delta, signed=True):>10} RSS  {record.name}"
+                for record in records[:top]
+            )
+        return "\n".join(lines)
+
+
+def _format_size(size: int | None, signed: bool = False) -> str:
+    """Format a number of bytes in MiB."""
+    if size is None:
+        return "n/a"
+    return f"{size / 2**20:{'+' if signed else ''}.1f} MiB"
+
+
+#: The profiler shared by the gallery generation and the directives.
+memory_profiler = MemoryProfiler()
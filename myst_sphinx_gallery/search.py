@@ -0,0 +1,106 @@
+"""Build the search index used to filter the gallery cards in the browser."""
+
+from __future__ import annotations
+
+import json
+import re
+from pathlib import Path
+from typing import Iterable, Tuple
+
+#: The length of the n-grams of the search index.
+NGRAM_SIZE = 3
+
+#: The file name of the search index in the ``_static`` output directory.
+SEARCH_INDEX_FILE = "myst_sphinx_gallery_search.json"
+
+# title, tooltip, url and section names of an example
+SearchEntry = Tuple[str, str, str, Iterable[str]]
+
+_token_pattern = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> list[str]:
+    """Split a text into lower case words."""
+    return _token_pattern.findall(text.lower())
+
+
+def ngrams(token: str, size: int = NGRAM_SIZE) -> set[str]:
+    """Return the n-grams of a word.
+
+    Words shorter than ``size`` have no n-gram, they are matched by the client
+    script against the text of the examples directly.
+    """
+    return {token[i : i + size] for i in range(len(token) - size + 1)}
+
+
+def build_search_index(entries: Iterable[SearchEntry]) -> dict:
+    """Build the search index of the gallery examples.
+
+    Parameters
+    ----------
+    entries : Iterable[SearchEntry]
+        The title, tooltip, url and section names of the examples. The url is
+        relative to the root of the output directory.
+
+    Returns
+    -------
+    dict
+        The search index, containing:
+
+        - ``size``: the length of the n-grams.
+        - ``sections``: the sorted names of the gallery sections.
+        - ``docs``: the title, tooltip, url and section indices of each
+          example.
+        - ``grams``: the indices of the examples containing each n-gram in
+          their title, tooltip or section names.
+
+    """
+    entries = [
+        (title, tooltip, url, sorted(sections))
+        for title, tooltip, url, sections in entries
+    ]
+    sections = sorted({name for *_, names in entries for name in names})
+    section_ids = {name: i for i, name in enumerate(sections)}
+
+    docs = []
+    grams = {}
+    for doc_id, (title, tooltip, url, names) in enumerate(entries):
+        docs.append([title, tooltip, url, [section_ids[name] for name in names]])
+        doc_grams = set()
+        for token in tokenize(" ".join([title, tooltip, *names])):
+            doc_grams.update(ngrams(token))
+        for gram in doc_grams:
+            grams.setdefault(gram, []).append(doc_id)
+
+    return {
+        "size": NGRAM_SIZE,
+        "sections": sections,
+        "docs": docs,
+        "grams": dict(sorted(grams.items())),
+    }
+
+
+def write_search_index(entries: Iterable[SearchEntry], static_dir: Path) -> Path:
+    """Write the search index into the static directory of the output.
+
+    Parameters
+    ----------
+    entries : Iterable[SearchEntry]
+        The title, tooltip, url and section names of the examples.
+    static_dir : Path
+        The ``_static`` directory of the output.
+
+    Returns
+    -------
+    Path
+        The path of the search index file.
+
+    """
+    index = build_search_index(entries)
+    index_file = Path(static_dir) / SEARCH_INDEX_FILE
+    index_file.parent.mkdir(parents=True, exist_ok=True)
+    index_file.write_text(
+        json.dumps(index, ensure_ascii=False, separators=(",", ":")),
+        encoding="utf-8",
+    )
+    return index_file
@@ -2,24 +2,48 @@
 
 from __future__ import annotations
 
+import os
+import shutil
 from pathlib import Path
 from typing import TYPE_CHECKING
 
 from docutils.nodes import NodeVisitor
+from sphinx.util import logging
 
 from .config import GalleryConfig
 from .directives import (
     BaseGallery,
+    GalleryCardsDirective,
     GalleryDirective,
     RefGalleryDirective,
     card_col_node,
 )
 from .gallery import generate_gallery
-from .utils import gallery_static_path, safe_remove_dir
+from .profiling import memory_profiler
+from .search import write_search_index
+from .utils import (
+    clear_file_indexes,
+    ensure_dir_exists,
+    gallery_static_path,
+    get_card_images,
+    get_search_entries,
+    match_gallery_docs,
+    pop_thumbnail_dirs,
+    purge_card_images,
+    purge_gallery_patterns,
+    purge_search_entries,
+    register_thumbnail_dirs,
+    safe_remove_dir,
+    thumbnail_cache_dir,
+)
+from .watch import SKIP_GENERATION_ENV
 
 if TYPE_CHECKING:
     from docutils import nodes
     from sphinx.application import Sphinx
+    from sphinx.environment import BuildEnvironment
+
+logger = logging.getLogger(__name__)
 
 
 class CardNodeHTMLTranslator(NodeVisitor):
@@ -39,9 +63,13 @@ def cleanup_thumbnail(
     app: Sphinx,
     exception: Exception,  # noqa: ARG001
 ) -> None:
-    """Remove the doctrees directory.
+    """Remove the thumbnail directories created during the build.
 
-    If the build is successful, the doctrees directory is removed.
+    Only the directories recorded on ``app.env`` by the gallery generation and
+    the gallery directives are removed, the source tree is not scanned. The
+    directories outside of the source directory, e.g. the thumbnail cache in
+    the doctree directory, are kept, so that the thumbnails and the images
+    the pages depend on are reused by the next build.
     """
     remove_thumbnail = True
     config = app.config
@@ -53,9 +81,98 @@ def cleanup_thumbnail(
             config.myst_sphinx_gallery_config.remove_thumbnail_after_build
         )
     if remove_thumbnail:
-        doctrees_dirs = list(Path(app.srcdir).rglob("myst_sphinx_gallery_thumbs"))
-        for doctrees_dir in doctrees_dirs:
-            safe_remove_dir(doctrees_dir)
+        src_dir = Path(app.srcdir).absolute()
+        for thumb_dir in pop_thumbnail_dirs(app.env):
+            if src_dir in thumb_dir.absolute().parents:
+                safe_remove_dir(thumb_dir)
+
+
+def copy_card_images(app: Sphinx, exception: Exception) -> None:
+    """Copy the thumbnails of the virtual grids into the output directory.
+
+    This handler runs before :func:`cleanup_thumbnail`, as the thumbnails may
+    be located in the thumbnail directories removed after the build.
+    """
+    if exception is not None or app.builder.format != "html":
+        return
+    for name, image in get_card_images(app.env).items():
+        if not image.is_file():
+            continue
+        dest = Path(app.outdir) / name
+        if dest.is_file() and dest.stat().st_mtime >= image.stat().st_mtime:
+            continue
+        ensure_dir_exists(dest.parent)
+        shutil.copyfile(image, dest)
+
+
+def build_search_index(app: Sphinx, exception: Exception) -> None:
+    """Write the search index of the examples displayed in the galleries.
+
+    The index is generated from the titles and tooltips recorded by the
+    gallery directives, and is used to filter the cards in the browser.
+    """
+    if exception is not None or app.builder.format != "html":
+        return
+    entries = get_search_entries(app.env)
+    if not entries:
+        return
+    write_search_index(
+        (
+            (title, tooltip, app.builder.get_target_uri(docname), sections)
+            for docname, (title, tooltip, sections) in entries.items()
+        ),
+        Path(app.outdir) / "_static",
+    )
+
+
+def report_memory_profile(
+    app: Sphinx,  # noqa: ARG001
+    exception: Exception,  # noqa: ARG001
+) -> None:
+    """Log the examples and thumbnails using the most memory, if profiled.
+
+    The records are cleared afterwards, so that each build is reported alone.
+    """
+    report = memory_profiler.report()
+    if report:
+        logger.info("\n%s", report)
+    memory_profiler.reset()
+
+
+def clear_file_index_cache(
+    app: Sphinx,  # noqa: ARG001
+    exception: Exception,  # noqa: ARG001
+) -> None:
+    """Remove the file indexes cached during the build."""
+    clear_file_indexes()
+
+
+def get_outdated_galleries(
+    app: Sphinx,  # noqa: ARG001
+    env: BuildEnvironment,
+    added: set[str],
+    changed: set[str],
+    removed: set[str],
+) -> list[str]:
+    """Mark the gallery documents as outdated if their examples changed.
+
+    Changes of the files displayed in a gallery are tracked by the dependencies
+    of the document. This handler additionally catches examples that are added
+    or removed, e.g. for entries using the ``*`` wildcard.
+    """
+    outdated = match_gallery_docs(env, added | changed | removed)
+    return sorted(outdated - added - changed - removed)
+
+
+def purge_galleries(
+    app: Sphinx,  # noqa: ARG001
+    env: BuildEnvironment,
+    docname: str,
+) -> None:
+    """Remove the gallery records of a document that will be re-read."""
+    purge_gallery_patterns(env, docname)
+    purge_card_images(env, docname)
+    purge_search_entries(env, docname)
 
 
 def config_inited(app: Sphinx) -> None:
@@ -64,10 +181,18 @@ def config_inited(app: Sphinx) -> None:
     if path not in app.config.html_static_path:
         app.config.html_static_path.append(path)
     app.add_css_file("myst_sphinx_gallery.css", priority=501)
+    app.add_js_file("myst_sphinx_gallery.js", loading_method="defer")
 
 
 def main(app: Sphinx) -> None:
-    """Generate gallery."""
+    """Generate gallery.
+
+    The generation is skipped if the ``MYST_SPHINX_GALLERY_SKIP_GENERATION``
+    environment variable is set, e.g. when the galleries are kept up to date
+    by ``myst-sphinx-gallery watch``. The memory profiling is enabled from
+    the configuration in any case, so that the thumbnails created by the
+    gallery directives are also profiled.
+    """
     config = app.config
     if hasattr(config, "myst_sphinx_gallery_config"):
         gallery_conf = app.config.myst_sphinx_gallery_config
@@ -80,6 +205,14 @@ def main(app: Sphinx) -> None:
             )
             if not isinstance(gallery_conf, (GalleryConfig, dict)):
                 raise ValueError(msg)
+            if isinstance(gallery_conf, GalleryConfig):
+                profile_memory = gallery_conf.profile_memory
+            else:
+                profile_memory = gallery_conf.get("profile_memory", False)
+            if profile_memory:
+                memory_profiler.enable()
+            if os.environ.get(SKIP_GENERATION_ENV):
+                return
             if (
                 (  # skip build if any of the required directories are not set
                     isinstance(gallery_conf, GalleryConfig)
@@ -97,7 +230,10 @@ def main(app: Sphinx) -> None:
                 )
             ):
                 return
-            generate_gallery(gallery_conf)
+            thumb_dirs = generate_gallery(
+                gallery_conf, thumbnail_dir=thumbnail_cache_dir(app)
+            )
+            register_thumbnail_dirs(app.env, thumb_dirs)
 
 
 def sphinx_setup(app: Sphinx) -> None:
@@ -105,6 +241,7 @@ def sphinx_setup(app: Sphinx) -> None:
     app.add_directive("ref-gallery", RefGalleryDirective)
     app.add_directive("base-gallery", BaseGallery)
     app.add_directive("gallery", GalleryDirective)
+    app.add_directive("gallery-cards", GalleryCardsDirective)
     app.add_node(
         card_col_node,
         html=(
@@ -118,4 +255,10 @@ def sphinx_setup(app: Sphinx) -> None:
     app.add_config_value("myst_sphinx_gallery_files_config", None, "")
     app.connect("builder-inited", main)
     app.connect("builder-inited", config_inited)
+    app.connect("env-get-outdated", get_outdated_galleries)
+    app.connect("env-purge-doc", purge_galleries)
+    app.connect("build-finished", copy_card_images, priority=400)
+    app.connect("build-finished", build_search_index)
     app.connect("build-finished", cleanup_thumbnail)
+    app.connect("build-finished", report_memory_profile)
+    app.connect("build-finished", clear_file_index_cache)
@@ -2,15 +2,22 @@
 
 from __future__ import annotations
 
+import fnmatch
+import hashlib
+import os
 import re
 import shutil
 import warnings
 from functools import wraps
 from pathlib import Path
-from typing import Literal
+from typing import TYPE_CHECKING, Iterable, Literal
 
 import nbformat
 
+if TYPE_CHECKING:
+    from sphinx.application import Sphinx
+    from sphinx.environment import BuildEnvironment
+
 
 def ensure_dir_exists(dir_path: Path) -> None:
     """Ensure that the directory exists.
@@ -18,8 +25,7 @@ def ensure_dir_exists(dir_path: Path) -> None:
     dir_path : Path
         The path to the directory.
     """
-    if not dir_path.exists():
-        dir_path.mkdir(parents=True)
+    dir_path.mkdir(parents=True, exist_ok=True)
 
 
 def safe_remove_file(file: Path) -> None:
@@ -51,7 +57,10 @@ def abs_path(
         The method to use for converting the path, by default "resolve".
 
         - resolve: Use the ``resolve`` method of the Path class to convert the path.
-        - rglob: try to find a matched path in the root directory using ``rglob``.
+        - rglob: try to find a matched path (file or directory) in the root
+          directory by its name. The lookup uses a cached :class:`FileIndex`
+          of the root directory instead of walking the whole tree for each
+          call.
 
     Returns
     -------
@@ -66,14 +75,14 @@ def abs_path(
         return (Path(root_dir) / path).resolve()
     if method == "rglob":
         path = Path(path).name
-        files = list(Path(root_dir).rglob(path))
+        files = get_file_index(root_dir).lookup(path)
         if len(files) == 0:
             msg = f"No file found for {path} in {root_dir}"
             raise FileNotFoundError(msg)
         if len(files) > 1:
             msg = (
-                f"Multiple files found for {path} in {root_dir}"
-                "first one will be used."
+                f"Multiple files found for {path} in {root_dir}, "
+                "the first one will be used."
             )
             warnings.warn(msg, stacklevel=2)
         return files[0]
@@ -81,6 +90,239 @@ def abs_path(
     raise ValueError(msg)
 
 
+def thumbnail_cache_dir(app: Sphinx) -> Path:
+    """Return the directory to cache the thumbnails during a Sphinx build.
+
+    The directory is located in the doctree directory of the builder, so that
+    no files are written into the source tree.
+    """
+    return Path(app.doctreedir).absolute() / "myst_sphinx_gallery_thumbs"
+
+
+def register_thumbnail_dirs(
+    env: BuildEnvironment, thumb_dirs: Iterable[Path | str]
+) -> None:
+    """Record the thumbnail directories created during the build.
+
+    The directories are stored on the Sphinx build environment, so that only
+    these directories are removed after the build.
+
+    Parameters
+    ----------
+    env : BuildEnvironment
+        The Sphinx build environment.
+    thumb_dirs : Iterable[Path | str]
+        The thumbnail directories to record.
+
+    """
+    registry = getattr(env, "myst_sphinx_gallery_thumb_dirs", None)
+    if not isinstance(registry, set):
+        registry = set()
+        env.myst_sphinx_gallery_thumb_dirs = registry
+    registry.update(str(Path(d).absolute()) for d in thumb_dirs)
+
+
+def pop_thumbnail_dirs(env: BuildEnvironment) -> list[Path]:
+    """Return and clear the thumbnail directories recorded on the environment."""
+    registry = getattr(env, "myst_sphinx_gallery_thumb_dirs", None)
+    if not isinstance(registry, set):
+        return []
+    thumb_dirs = sorted(Path(d) for d in registry)
+    registry.clear()
+    return thumb_dirs
+
+
+def register_gallery_pattern(
+    env: BuildEnvironment, docname: str, pattern: Path | str
+) -> None:
+    """Record a pattern of the example documents displayed in a gallery page.
+
+    Parameters
+    ----------
+    env : BuildEnvironment
+        The Sphinx build environment.
+    docname : str
+        The name of the document containing the gallery.
+    pattern : Path | str
+        The path of the examples without suffix, relative to the source
+        directory. The ``*`` wildcard can be used to match multiple files.
+
+    """
+    registry = getattr(env, "myst_sphinx_gallery_patterns", None)
+    if not isinstance(registry, dict):
+        registry = {}
+        env.myst_sphinx_gallery_patterns = registry
+    registry.setdefault(docname, set()).add(Path(pattern).as_posix())
+
+
+def purge_gallery_patterns(env: BuildEnvironment, docname: str) -> None:
+    """Remove the example patterns recorded for a document."""
+    registry = getattr(env, "myst_sphinx_gallery_patterns", None)
+    if isinstance(registry, dict):
+        registry.pop(docname, None)
+
+
+def match_gallery_docs(env: BuildEnvironment, docnames: Iterable[str]) -> set[str]:
+    """Return the gallery documents displaying any of the given documents.
+
+    Parameters
+    ----------
+    env : BuildEnvironment
+        The Sphinx build environment.
+    docnames : Iterable[str]
+        The names of the documents to match against the recorded patterns.
+
+    """
+    registry = getattr(env, "myst_sphinx_gallery_patterns", None)
+    if not isinstance(registry, dict) or not registry:
+        return set()
+    docnames = set(docnames)
+    matched = set()
+    for gallery_doc, patterns in registry.items():
+        if any(
+            _match_doc_pattern(docname, pattern)
+            for pattern in patterns
+            for docname in docnames
+        ):
+            matched.add(gallery_doc)
+    return matched
+
+
+def _match_doc_pattern(docname: str, pattern: str) -> bool:
+    """Check if a document matches a pattern, segment by segment.
+
+    As for the ``glob`` listing the entries of a gallery, the wildcards do
+    not match across ``/``, so that ``examples/*`` does not match the
+    documents in the subdirectories of ``examples``.
+    """
+    doc_parts = docname.split("/")
+    pattern_parts = pattern.split("/")
+    return len(doc_parts) == len(pattern_parts) and all(
+        fnmatch.fnmatchcase(part, pattern_part)
+        for part, pattern_part in zip(doc_parts, pattern_parts)
+    )
+
+
+def register_card_image(env: BuildEnvironment, docname: str, image: Path | str) -> str:
+    """Record a thumbnail displayed by the virtual grid of a gallery page.
+
+    The thumbnails of virtual grids are not referenced by image nodes, so that
+    they are copied into the ``_images`` directory of the output after the
+    build by :func:`~myst_sphinx_gallery.sphinx_ext.copy_card_images`.
+
+    Parameters
+    ----------
+    env : BuildEnvironment
+        The Sphinx build environment.
+    docname : str
+        The name of the document containing the gallery.
+    image : Path | str
+        The absolute path of the thumbnail.
+
+    Returns
+    -------
+    str
+        The path of the copied thumbnail relative to the output directory.
+
+    """
+    image = Path(image).absolute()
+    digest = hashlib.sha256(image.as_posix().encode()).hexdigest()[:10]
+    name = f"_images/myst_sphinx_gallery/{digest}-{image.name}"
+    registry = getattr(env, "myst_sphinx_gallery_card_images", None)
+    if not isinstance(registry, dict):
+        registry = {}
+        env.myst_sphinx_gallery_card_images = registry
+    registry.setdefault(docname, {})[name] = str(image)
+    return name
+
+
+def purge_card_images(env: BuildEnvironment, docname: str) -> None:
+    """Remove the thumbnails recorded for the virtual grids of a document."""
+    registry = getattr(env, "myst_sphinx_gallery_card_images", None)
+    if isinstance(registry, dict):
+        registry.pop(docname, None)
+
+
+def get_card_images(env: BuildEnvironment) -> dict[str, Path]:
+    """Return the thumbnails of virtual grids, keyed by their output path."""
+    registry = getattr(env, "myst_sphinx_gallery_card_images", None)
+    if not isinstance(registry, dict):
+        return {}
+    return {
+        name: Path(image)
+        for images in registry.values()
+        for name, image in images.items()
+    }
+
+
+def register_search_entry(
+    env: BuildEnvironment,
+    docname: str,
+    entry_docname: str,
+    *,
+    title: str,
+    tooltip: str,
+    section: str,
+) -> None:
+    """Record an example displayed in a gallery for the search index.
+
+    Parameters
+    ----------
+    env : BuildEnvironment
+        The Sphinx build environment.
+    docname : str
+        The name of the document containing the gallery.
+    entry_docname : str
+        The name of the example document.
+    title, tooltip : str
+        The title and tooltip of the example.
+    section : str
+        The name of the gallery section displaying the example.
+
+    """
+    registry = getattr(env, "myst_sphinx_gallery_search", None)
+    if not isinstance(registry, dict):
+        registry = {}
+        env.myst_sphinx_gallery_search = registry
+    registry.setdefault(docname, {})[entry_docname] = (title, tooltip, section)
+
+
+def purge_search_entries(env: BuildEnvironment, docname: str) -> None:
+    """Remove the search entries recorded for the galleries of a document."""
+    registry = getattr(env, "myst_sphinx_gallery_search", None)
+    if isinstance(registry, dict):
+        registry.pop(docname, None)
+
+
+def get_search_entries(
+    env: BuildEnvironment,
+) -> dict[str, tuple[str, str, list[str]]]:
+    """Return the examples of all galleries for the search index.
+
+    Returns
+    -------
+    dict[str, tuple[str, str, list[str]]]
+        The title, tooltip and sorted section names of the examples, keyed by
+        the names of the example documents. An example displayed in several
+        galleries is listed once with all its sections.
+
+    """
+    registry = getattr(env, "myst_sphinx_gallery_search", None)
+    if not isinstance(registry, dict):
+        return {}
+    entries = {}
+    sections = {}
+    for docname in sorted(registry):
+        for entry_docname, (title, tooltip, section) in registry[docname].items():
+            entries.setdefault(entry_docname, (title, tooltip))
+            if section:
+                sections.setdefault(entry_docname, set()).add(section)
+    return {
+        name: (title, tooltip, sorted(sections.get(name, ())))
+        for name, (title, tooltip) in sorted(entries.items())
+    }
+
+
 def parse_files_without_suffix(path: Path | str) -> set[Path]:
     """Parse the files without the suffix.
 
@@ -287,6 +529,10 @@ def _parse_rst_title(lines: list[str]) -> str:
         return "", []
 
     title_list = [line for line in title_candidates if len(line) == title_sign_len]
+    if len(title_list) == 0:
+        msg = "No title line matches the length of the title underline."
+        warnings.warn(msg, stacklevel=2)
+        return "", []
     if len(title_list) > 1:
         msg = "Multiple title lines found."
         warnings.warn(msg, stacklevel=2)
@@ -491,9 +737,138 @@ def file_in_folder(file_path: Path | str, folder_path: Path | str) -> bool:
         True if the file is in the folder, False otherwise.
 
     """
-    folder_path = Path(folder_path)
     file_path = Path(file_path)
-    return len(list(folder_path.rglob(file_path.name))) > 0
+    return file_path.name in get_file_index(folder_path)
+
+
+class FileIndex:
+    """A lazily built index mapping names to their paths in a directory.
+
+    The index is built on the first lookup by walking the root directory once,
+    and maps the names of the files and subdirectories to their paths, as
+    matched by ``rglob``. It records the modification time of every directory
+    it visited. After :meth:`check_stale` is called, e.g. at the start of a
+    build, the next lookup rebuilds the index if any of these directories
+    changed (i.e. when files are added, removed or renamed). The other
+    lookups do not touch the file system.
+    """
+
+    def __init__(self, root_dir: Path | str) -> None:
+        """Initialize the FileIndex object.
+
+        Parameters
+        ----------
+        root_dir : Path | str
+            The root directory to index.
+
+        """
+        self._root_dir = Path(root_dir)
+        self._files: dict[str, list[Path]] | None = None
+        self._dir_mtimes: dict[Path, int] = {}
+        self._check_stale = False
+
+    def __repr__(self) -> str:
+        """Return the string representation of the object."""
+        return f"FileIndex(root_dir={self.root_dir})"
+
+    def __contains__(self, name: str) -> bool:
+        """Check if a file with the given name exists in the root directory."""
+        return len(self.lookup(name)) > 0
+
+    @property
+    def root_dir(self) -> Path:
+        """The root directory of the index."""
+        return self._root_dir
+
+    def _build(self) -> None:
+        """Walk the root directory and build the index."""
+        files: dict[str, list[Path]] = {}
+        dir_mtimes: dict[Path, int] = {}
+        for dir_path, dir_names, file_names in os.walk(self.root_dir):
+            dir_names.sort()
+            dir_path = Path(dir_path)  # noqa: PLW2901
+            try:
+                dir_mtimes[dir_path] = dir_path.stat().st_mtime_ns
+            except OSError:
+                continue
+            for name in sorted(dir_names + file_names):
+                files.setdefault(name, []).append(dir_path / name)
+        self._files = files
+        self._dir_mtimes = dir_mtimes
+
+    def is_stale(self) -> bool:
+        """Whether the index needs to be (re)built."""
+        if self._files is None:
+            return True
+        try:
+            return any(
+                dir_path.stat().st_mtime_ns != mtime
+                for dir_path, mtime in self._dir_mtimes.items()
+            )
+        except OSError:  # an indexed directory has been removed
+            return True
+
+    def check_stale(self) -> None:
+        """Check whether the index is stale on the next lookup."""
+        self._check_stale = True
+
+    def invalidate(self) -> None:
+        """Force the index to be rebuilt on the next lookup."""
+        self._files = None
+        self._dir_mtimes = {}
+
+    def lookup(self, name: str) -> list[Path]:
+        """Return all paths of the files and directories with the given name.
+
+        Parameters
+        ----------
+        name : str
+            The basename to look up.
+
+        Returns
+        -------
+        list[Path]
+            The matched paths, ordered by directory depth-first traversal of
+            sorted directory entries. Empty if no file is found.
+
+        """
+        if self._files is None or (self._check_stale and self.is_stale()):
+            self._build()
+        self._check_stale = False
+        return list(self._files.get(name, []))
+
+
+_file_indexes: dict[Path, FileIndex] = {}
+
+
+def get_file_index(root_dir: Path | str) -> FileIndex:
+    """Return the cached :class:`FileIndex` for a root directory.
+
+    Parameters
+    ----------
+    root_dir : Path | str
+        The root directory to index.
+
+    """
+    root_dir = Path(root_dir).absolute()
+    if root_dir not in _file_indexes:
+        _file_indexes[root_dir] = FileIndex(root_dir)
+    return _file_indexes[root_dir]
+
+
+def check_stale_file_indexes() -> None:
+    """Check whether the cached indexes are stale on their next lookup.
+
+    It is called at the start of each gallery generation, so that the files
+    changed since the last one are found.
+    """
+    for index in _file_indexes.values():
+        index.check_stale()
+
+
+def clear_file_indexes() -> None:
+    """Remove the cached indexes, e.g. at the end of a Sphinx build."""
+    _file_indexes.clear()
 
 
 def print_run_time(func: callable) -> callable:
@@ -0,0 +1,267 @@
+"""Regenerate the galleries incrementally while the examples are edited.
+
+:class:`GalleryWatcher` keeps the converted examples of the galleries in
+memory. When a file changes, only the affected examples are converted again
+and only the index files of their sections, and of their gallery, are
+rewritten. The thumbnail of an example is only created again if its source
+changed.
+
+Changes are detected by polling the modification times of the examples, the
+gallery header files and the thumbnail sources. If ``watchdog`` is installed,
+the file system events of the examples directories additionally wake up the
+watcher, so that changes are picked up immediately.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+import warnings
+from typing import TYPE_CHECKING, Callable, Dict, List, Tuple
+
+from .gallery import (
+    ExampleConverter,
+    GalleryGenerator,
+    SectionGenerator,
+    iter_gallery_sections,
+)
+from .utils import check_stale_file_indexes, safe_remove_file
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from .config import GalleryConfig
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:
+    FileSystemEventHandler = object
+    Observer = None
+
+#: The environment variable to skip the gallery generation of the Sphinx
+#: extension, when the galleries are kept up to date by a watcher.
+SKIP_GENERATION_ENV = "MYST_SPHINX_GALLERY_SKIP_GENERATION"
+
+#: The delay in seconds to let an editor finish writing the files after a
+#: file system event, before the galleries are updated.
+DEBOUNCE_DELAY = 0.05
+
+# modification time and size of a watched file
+FileState = Tuple[int, int]
+
+# sections of each gallery, keyed by the index of the gallery
+GallerySections = Dict[int, List[SectionGenerator]]
+
+
+def file_state(path: Path) -> FileState | None:
+    """Return the modification time and size of a file, None if missing."""
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class _WakeUpHandler(FileSystemEventHandler):
+    """Set an event on any file system event."""
+
+    def __init__(self, event: threading.Event) -> None:
+        super().__init__()
+        self.event = event
+
+    def on_any_event(self, event) -> None:  # noqa: ANN001, ARG002
+        self.event.set()
+
+
+class GalleryWatcher:
+    """Regenerate only the parts of the galleries whose files changed."""
+
+    def __init__(self, gallery_config: GalleryConfig) -> None:
+        """Initialize the watcher.
+
+        Parameters
+        ----------
+        gallery_config : GalleryConfig
+            The gallery configuration, with the thumbnail directory already
+            set if the thumbnails should not be written into the galleries.
+
+        """
+        self.config = gallery_config
+        self._converters: dict[Path, ExampleConverter] = {}
+        self._galleries: GallerySections = {}
+        self._snapshot: dict[Path, FileState] = {}
+
+    @property
+    def converters(self) -> dict[Path, ExampleConverter]:
+        """The converters of the examples, keyed by the example files."""
+        return dict(self._converters)
+
+    @property
+    def thumb_dirs(self) -> set[Path]:
+        """The thumbnail directories of the converted examples."""
+        return {conv.thumb_dir for conv in self._converters.values()}
+
+    def _scan(self, galleries: GallerySections) -> dict[Path, FileState]:
+        """Return the state of the files the galleries are generated from."""
+        files = set()
+        for i, sections in galleries.items():
+            files.add(self.config.examples_dirs[i] / "GALLERY_HEADER.rst")
+            for section in sections:
+                files.add(section.header_file)
+                files.update(section.example_files)
+        files.update(
+            conv.thumb_source
+            for conv in self._converters.values()
+            if conv.thumb_source is not None
+        )
+        states = {}
+        for file in files:
+            state = file_state(file)
+            if state is not None:
+                states[file] = state
+        return states
+
+    def _convert_example(
+        self, section: SectionGenerator, example_file: Path, changed: set[Path]
+    ) -> ExampleConverter:
+        """Convert an example and create its thumbnail if outdated."""
+        old = self._converters.get(example_file)
+        if old is not None and old.thumb_source in changed:
+            safe_remove_file(old.thumb_file)
+        conv = section.create_converter(example_file)
+        conv.convert()
+        conv._parse_thumb()
+        self._converters[example_file] = conv
+        return conv
+
+    def update(self) -> list[Path]:
+        """Regenerate the parts of the galleries changed since the last update.
+
+        The first update generates the galleries in full.
+
+        Returns
+        -------
+        list[Path]
+            The example files converted during this update.
+
+        """
+        check_stale_file_indexes()
+        galleries = dict(iter_gallery_sections(self.config))
+        snapshot = self._scan(galleries)
+        changed = {
+            file
+            for file in snapshot.keys() | self._snapshot.keys()
+            if snapshot.get(file) != self._snapshot.get(file)
+        }
+        if not changed:
+            return []
+
+        converted = []
+        for i, sections in galleries.items():
+            old_sections = {s.header_file: s for s in self._galleries.get(i, [])}
+            rewrite_gallery = (
+                list(old_sections) != [s.header_file for s in sections]
+                or self.config.examples_dirs[i] / "GALLERY_HEADER.rst" in changed
+            )
+            for section in sections:
+                old = old_sections.get(section.header_file)
+                rewrite_section = (
+                    old is None
+                    or old.example_files != section.example_files
+                    or section.header_file in changed
+                )
+                for example_file in section.example_files:
+                    conv = self._converters.get(example_file)
+                    if (
+                        conv is None
+                        or example_file in changed
+                        or conv.thumb_source in changed
+                    ):
+                        conv = self._convert_example(section, example_file, changed)
+                        converted.append(conv)
+                        rewrite_section = True
+                section.add_examples(
+                    [self._converters[file] for file in section.example_files]
+                )
+                if rewrite_section:
+                    section.convert_section_header_file()
+                    rewrite_gallery = True
+            if rewrite_gallery and not self.config.base_gallery:
+                GalleryGenerator(
+                    self.config.examples_dirs[i],
+                    self.config.gallery_dirs[i],
+                    self.config,
+                ).convert_sections_index(sections)
+
+        example_files = {
+            file
+            for sections in galleries.values()
+            for section in sections
+            for file in section.example_files
+        }
+        for example_file in set(self._converters) - example_files:
+            safe_remove_file(self._converters.pop(example_file).gallery_file)
+
+        # watch the thumbnail sources found during this update
+        for conv in converted:
+            if conv.thumb_source is None:
+                continue
+            state = file_state(conv.thumb_source)
+            if state is not None:
+                snapshot.setdefault(conv.thumb_source, state)
+        self._snapshot = snapshot
+        self._galleries = galleries
+        return [conv.example_file for conv in converted]
+
+    def _start_observer(self, event: threading.Event) -> Observer | None:
+        """Start watching the examples directories for file system events."""
+        if Observer is None:
+            return None
+        observer = Observer()
+        handler = _WakeUpHandler(event)
+        for examples_dir in self.config.examples_dirs:
+            observer.schedule(handler, str(examples_dir), recursive=True)
+        observer.start()
+        return observer
+
+    def watch(
+        self,
+        interval: float = 0.5,
+        callback: Callable[[list[Path]], None] | None = None,
+        stop: threading.Event | None = None,
+    ) -> None:
+        """Update the galleries whenever their files change.
+
+        Parameters
+        ----------
+        interval : float, optional
+            The interval in seconds between two checks of the files.
+        callback : Callable[[list[Path]], None], optional
+            A function called with the converted example files after each
+            update converting at least one example.
+        stop : threading.Event, optional
+            An event to stop watching. Default is to watch until interrupted.
+
+        """
+        stop = stop or threading.Event()
+        wake = threading.Event()
+        observer = self._start_observer(wake)
+        try:
+            while not stop.is_set():
+                try:
+                    converted = self.update()
+                except (OSError, ValueError) as exc:
+                    warnings.warn(
+                        f"Failed to update the galleries: {exc}", stacklevel=2
+                    )
+                    converted = []
+                if converted and callback is not None:
+                    callback(converted)
+                if wake.wait(interval):
+                    time.sleep(DEBOUNCE_DELAY)
+                    wake.clear()
+        finally:
+            if observer is not None:
+                observer.stop()
+                observer.join()
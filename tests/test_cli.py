@@ -0,0 +1,157 @@
+import json
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+from myst_sphinx_gallery.cli import CACHE_FILE, build, load_gallery_config, main
+from myst_sphinx_gallery.images import Thumbnail
+from myst_sphinx_gallery.profiling import memory_profiler
+
+
+@pytest.fixture
+def conf_file(tmp_path):
+    """Create a documentation source directory with a gallery config."""
+    data_dir = Path(__file__).parent
+    shutil.copytree(data_dir / "data/examples", tmp_path / "examples")
+    shutil.copytree(data_dir / "_static", tmp_path / "_static")
+    conf_file = tmp_path / "conf.py"
+    conf_file.write_text(
+        "from pathlib import Path\n"
+        "from myst_sphinx_gallery import GalleryConfig\n"
+        "myst_sphinx_gallery_config = GalleryConfig(\n"
+        '    examples_dirs="examples",\n'
+        '    gallery_dirs="auto_examples",\n'
+        "    root_dir=Path(__file__).parent,\n"
+        '    thumbnail_dir="thumbs",\n'
+        ")\n"
+    )
+    return conf_file
+
+
+def test_load_gallery_config(conf_file):
+    config = load_gallery_config(conf_file)
+    assert config.gallery_dirs == [conf_file.parent / "auto_examples"]
+
+
+def test_load_gallery_config_invalid(tmp_path):
+    conf_file = tmp_path / "conf.py"
+    conf_file.write_text("myst_sphinx_gallery_config = None\n")
+    with pytest.raises(TypeError, match="must be an instance of `GalleryConfig`"):
+        load_gallery_config(conf_file)
+
+    conf_file.write_text("myst_sphinx_gallery_config = {}\n")
+    with pytest.raises(ValueError, match="must set `examples_dirs`"):
+        load_gallery_config(conf_file)
+
+    with pytest.raises(FileNotFoundError):
+        load_gallery_config(tmp_path / "missing.py")
+
+
+def test_build(conf_file):
+    thumbs = conf_file.parent / "thumbs"
+    summary = build(conf_file, jobs=2)
+    assert summary["examples"] == 2
+    assert summary["thumbnails"] == {
+        "total": 2,
+        "created": 2,
+        "cached": 0,
+        "invalidated": 0,
+    }
+    assert summary["cache_file"] == str(thumbs / CACHE_FILE)
+    assert (conf_file.parent / "auto_examples/index.rst").exists()
+    cache = json.loads((thumbs / CACHE_FILE).read_text())
+    assert len(cache["thumbnails"]) == 2
+
+    # the thumbnails restored from the last run are reused
+    summary = build(conf_file, jobs=2)
+    assert summary["thumbnails"]["created"] == 0
+    assert summary["thumbnails"]["cached"] == 2
+
+    # the thumbnail of a changed source is created again
+    image = conf_file.parent / "_static/scatter_hist.png"
+    image.write_bytes(image.read_bytes() + b"\0")
+    summary = build(conf_file, jobs=2)
+    assert summary["thumbnails"]["invalidated"] == 1
+    assert summary["thumbnails"]["created"] == 1
+
+
+def test_build_coarse_timestamps(conf_file, monkeypatch):
+    save_thumbnail = Thumbnail.save_thumbnail
+
+    def save_with_old_mtime(self, out_path=None):
+        out_path = save_thumbnail(self, out_path)
+        # a file system with coarse timestamps may date a new file in the past
+        os.utime(out_path, ns=(0, 0))
+        return out_path
+
+    monkeypatch.setattr(Thumbnail, "save_thumbnail", save_with_old_mtime)
+    summary = build(conf_file)
+    assert summary["thumbnails"]["created"] == 2
+    assert summary["thumbnails"]["cached"] == 0
+
+
+def test_build_no_cache(conf_file, tmp_path):
+    summary = build(conf_file, thumbnail_dir=tmp_path / "other", use_cache=False)
+    assert summary["cache_file"] is None
+    assert summary["thumbnail_dirs"] == [str(tmp_path / "other/auto_examples")]
+    assert not (tmp_path / "other" / CACHE_FILE).exists()
+
+
+def test_main(conf_file, tmp_path, capsys):
+    summary_file = tmp_path / "summary.json"
+    assert (
+        main(
+            [
+                "build",
+                "-c",
+                str(conf_file),
+                "-j",
+                "auto",
+                "--summary",
+                str(summary_file),
+            ]
+        )
+        == 0
+    )
+    assert "2 examples in 1 galleries" in capsys.readouterr().out
+    assert json.loads(summary_file.read_text())["examples"] == 2
+
+    assert main(["build", "-c", str(conf_file), "--summary", "-"]) == 0
+    assert json.loads(capsys.readouterr().out)["thumbnails"]["cached"] == 2
+
+
+def test_main_errors(tmp_path, capsys):
+    assert main(["build", "-c", str(tmp_path / "missing.py")]) == 1
+    assert "Configuration file not found" in capsys.readouterr().err
+
+    with pytest.raises(SystemExit):
+        main(["build", "--jobs", "0"])
+
+
+def test_build_profile_memory(conf_file, capsys):
+    conf_file.write_text(
+        conf_file.read_text().replace(
+            'thumbnail_dir="thumbs",\n',
+            'thumbnail_dir="thumbs",\n    profile_memory=True,\n',
+        )
+    )
+    assert main(["build", "-c", str(conf_file), "--summary", "-"]) == 0
+    out, err = capsys.readouterr()
+    summary = json.loads(out)
+    assert {record["kind"] for record in summary["memory"]} == {"example", "thumbnail"}
+    assert "examples by peak memory" in err
+    assert not memory_profiler.enabled
+
+
+def test_build_memory_budget(conf_file):
+    summary = build(conf_file, jobs=4, memory_budget=1)
+    assert summary["memory_budget"] == 1
+    assert summary["thumbnails"]["created"] == summary["thumbnails"]["total"]
+
+
+def test_main_invalid_memory_budget(conf_file, capsys):
+    with pytest.raises(SystemExit):
+        main(["build", "-c", str(conf_file), "--memory-budget", "0"])
+    assert "expected a positive number of MiB" in capsys.readouterr().err
@@ -110,6 +110,34 @@ class TestGalleryConfig:
                 default_thumbnail_file="_static/default_thumbnail.png",
             )
 
+    def test_gallery_config_invalid_cards_per_page(self):
+        with pytest.raises(ValueError, match="cards_per_page"):
+            GalleryConfig(cards_per_page=0)
+
+    def test_gallery_config_thumbnail_dir(self, tmp_path):
+        config = GalleryConfig(
+            examples_dirs="examples",
+            gallery_dirs="auto_examples",
+            root_dir=tmp_path,
+            thumbnail_dir="thumbs",
+        )
+        assert config.thumbnail_dir == tmp_path.resolve() / "thumbs"
+        config = GalleryConfig(
+            examples_dirs="examples",
+            gallery_dirs="auto_examples",
+            root_dir=tmp_path / "docs",
+            thumbnail_dir=tmp_path / "thumbs",
+        )
+        assert config.thumbnail_dir == tmp_path.resolve() / "thumbs"
+
+    def test_gallery_config_invalid_text_example_mode(self):
+        with pytest.raises(ValueError, match="text_example_mode"):
+            GalleryConfig(text_example_mode="hardlink")
+
+    def test_gallery_config_invalid_io_workers(self):
+        with pytest.raises(ValueError, match="io_workers"):
+            GalleryConfig(io_workers=0)
+
     def test_gallery_config_abs_path(self, cwd):
         config = GalleryConfig(
             examples_dirs="examples",
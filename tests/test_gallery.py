@@ -1,9 +1,15 @@
+import json
+import shutil
 from pathlib import Path
 
 import pytest
 
 from myst_sphinx_gallery import ThumbnailConfig
-from myst_sphinx_gallery.gallery import GalleryConfig, generate_gallery
+from myst_sphinx_gallery.gallery import (
+    ExampleConverter,
+    GalleryConfig,
+    generate_gallery,
+)
 
 
 @pytest.fixture
@@ -56,6 +62,11 @@ def config_thumbnail(gallery_dir_thumbnail, cwd):
     )
 
 
+@pytest.fixture
+def thumbnail_dir(cwd):
+    return cwd / "_build/thumbnail_cache"
+
+
 def prrint_sep():
     print(150 * ">")
 
@@ -63,7 +74,8 @@ def prrint_sep():
 def test_generate_gallery(config):
     prrint_sep()
     print("config : ", config)
-    generate_gallery(config)
+    thumb_dirs = generate_gallery(config)
+    assert thumb_dirs == {config.gallery_dirs[0] / "myst_sphinx_gallery_thumbs"}
 
 
 def test_generate_gallery_section(config2):
@@ -92,3 +104,227 @@ def test_generate_gallery_thumbnail(config_thumbnail):
         ">>> You can check whether the thumbnail images are generated with the black background in the padding area."
     )
     prrint_sep()
+
+
+def test_generate_gallery_thumbnail_dir(config, thumbnail_dir):
+    thumb_dirs = generate_gallery(config, thumbnail_dir=thumbnail_dir)
+    assert thumb_dirs == {thumbnail_dir / "_build/auto_examples"}
+
+    index_file = config.gallery_dirs[0] / "index.rst"
+    assert "/thumbnail_cache/_build/auto_examples/" in index_file.read_text()
+    assert len(list((thumbnail_dir / "_build/auto_examples").glob("*.webp"))) > 0
+
+
+def test_thumbnail_dirs_of_galleries_outside_root(cwd, tmp_path):
+    # two galleries with the same name, outside of the root directory
+    shutil.copytree(cwd / "data/examples", tmp_path / "examples")
+    shutil.copytree(cwd / "_static", tmp_path / "docs/_static")
+    config = GalleryConfig(
+        examples_dirs=["../examples"] * 2,
+        gallery_dirs=["../a/auto_examples", "../b/auto_examples"],
+        root_dir=tmp_path / "docs",
+        thumbnail_dir="../thumbs",
+    )
+    gallery_dirs = config.gallery_dirs
+    thumb_dirs = generate_gallery(config)
+    assert len(thumb_dirs) == 2
+    assert {d.parent for d in thumb_dirs} == {tmp_path / "thumbs"}
+    assert all(d.name.startswith("auto_examples-") for d in thumb_dirs)
+    index = (gallery_dirs[0] / "first_last2/index.rst").read_text()
+    assert "/../thumbs/auto_examples-" in index
+
+
+def test_generate_gallery_existing_thumbnails(config, thumbnail_dir, monkeypatch):
+    generate_gallery(config, thumbnail_dir=thumbnail_dir)
+
+    def fail(*args, **kwargs):
+        msg = "an image was opened"
+        raise AssertionError(msg)
+
+    # the existing thumbnails are found without opening their images
+    monkeypatch.setattr("myst_sphinx_gallery.images.Image.open", fail)
+    assert generate_gallery(config, thumbnail_dir=thumbnail_dir) == {
+        thumbnail_dir / "_build/auto_examples"
+    }
+
+
+def test_generate_gallery_compact_cards(config):
+    generate_gallery(config)
+
+    section_index = config.gallery_dirs[0] / "combination/index.rst"
+    content = section_index.read_text()
+    assert content.count(".. gallery-cards::") == 1
+    assert ".. grid-item-card::" not in content
+    cards = [
+        json.loads(line)
+        for line in content.splitlines()
+        if line.strip().startswith('{"target"')
+    ]
+    examples = (config.examples_dirs[0] / "combination").glob("*.ipynb")
+    assert len(cards) == len(list(examples))
+    assert all(card["target"].startswith("example_") for card in cards)
+
+
+@pytest.mark.parametrize(("thumbnail_strategy", "idx"), [("first", 0), ("last", -1)])
+def test_example_converter_thumb_idx(cwd, tmp_path, thumbnail_strategy, idx):
+    config = GalleryConfig(
+        examples_dirs="./data/examples",
+        gallery_dirs="./_build/auto_examples",
+        root_dir=cwd,
+        thumbnail_strategy=thumbnail_strategy,
+    )
+    examples_dir = config.examples_dirs[0]
+    converter = ExampleConverter(
+        examples_dir / "combination/plot_image_markdown.ipynb",
+        examples_dir,
+        tmp_path,
+        config,
+        save_thumbnail=False,
+    )
+    with pytest.warns(DeprecationWarning, match="find_cell_image"):
+        assert converter.thumb_idx == idx
+
+
+def test_generate_gallery_card_items(cwd):
+    config = GalleryConfig(
+        examples_dirs="./data/examples",
+        gallery_dirs="./_build/auto_examples_card_items",
+        root_dir=cwd,
+    )
+    config.grid_item_card.add_item("Some text in each card.")
+    generate_gallery(config)
+
+    section_index = config.gallery_dirs[0] / "combination/index.rst"
+    content = section_index.read_text()
+    assert ".. gallery-cards::" not in content
+    assert ".. grid-item-card::" in content
+
+
+def test_generate_gallery_pagination(cwd, tmp_path):
+    shutil.copytree(cwd / "data/examples", tmp_path / "examples")
+    shutil.copytree(cwd / "_static", tmp_path / "_static")
+    first = tmp_path / "examples/01-first_last2/first.rst"
+    for name in ["second", "third"]:
+        shutil.copy(first, first.with_name(f"{name}.rst"))
+    config = GalleryConfig(
+        examples_dirs="examples",
+        gallery_dirs="auto_examples",
+        root_dir=tmp_path,
+        cards_per_page=2,
+    )
+    generate_gallery(config)
+
+    section_dir = tmp_path / "auto_examples/first_last2"
+    index = (section_dir / "index.rst").read_text()
+    # all the examples are still in the toctree of the section
+    assert "    first\n    second\n    third\n" in index
+    assert index.count('{"target"') == 2
+    assert "Page 1 of 2 · :doc:`Next » <index_pages/page2>`" in index
+
+    page = (section_dir / "index_pages/page2.rst").read_text()
+    assert page.startswith(":orphan:")
+    assert page.count('{"target": "example_third"') == 1
+    assert ":doc:`« Previous <../index>` · Page 2 of 2\n" in page
+    assert not (section_dir / "index_pages/page3.rst").exists()
+
+    gallery_index = (tmp_path / "auto_examples/index.rst").read_text()
+    assert ":doc:`Next » <first_last2/index_pages/page2>`" in gallery_index
+    assert "combination/index_pages" not in gallery_index
+
+    # the pages are removed once the section fits on a single page
+    config.cards_per_page = None
+    generate_gallery(config)
+    assert not (section_dir / "index_pages").exists()
+    assert "msg-pagination" not in (section_dir / "index.rst").read_text()
+
+
+def test_generate_gallery_pagination_example_names(cwd, tmp_path):
+    shutil.copytree(cwd / "data/examples", tmp_path / "examples")
+    shutil.copytree(cwd / "_static", tmp_path / "_static")
+    first = tmp_path / "examples/01-first_last2/first.rst"
+    for name in ["index_page2", "index_page3"]:
+        shutil.copy(first, first.with_name(f"{name}.rst"))
+    config = GalleryConfig(
+        examples_dirs="examples",
+        gallery_dirs="auto_examples",
+        root_dir=tmp_path,
+        cards_per_page=1,
+    )
+    generate_gallery(config)
+    generate_gallery(config)
+
+    # the examples named like pages are neither removed nor overwritten
+    section_dir = tmp_path / "auto_examples/first_last2"
+    for name in ["index_page2", "index_page3"]:
+        assert ".. _example_index_page" in (section_dir / f"{name}.rst").read_text()
+    assert (section_dir / "index_pages/page3.rst").exists()
+
+
+def test_generate_gallery_io_workers(cwd, tmp_path):
+    shutil.copytree(cwd / "data/examples", tmp_path / "examples")
+    shutil.copytree(cwd / "_static", tmp_path / "_static")
+    first = tmp_path / "examples/01-first_last2/first.rst"
+    for i in range(10):
+        shutil.copy(first, first.with_name(f"copy_{i}.rst"))
+
+    outputs = {}
+    for workers in [1, 4]:
+        config = GalleryConfig(
+            examples_dirs="examples",
+            gallery_dirs=f"auto_examples_{workers}",
+            root_dir=tmp_path,
+            thumbnail_dir="thumbs",
+            io_workers=workers,
+        )
+        generate_gallery(config)
+        gallery_dir = tmp_path / f"auto_examples_{workers}"
+        outputs[workers] = {
+            path.relative_to(gallery_dir): path.read_text()
+            # the cells inserted into the notebooks have random ids
+            for path in gallery_dir.rglob("*")
+            if path.is_file() and path.suffix != ".ipynb"
+        }
+    # the files and the order of the toctree and the cards are the same
+    assert outputs[4].keys() == outputs[1].keys()
+    for path, content in outputs[1].items():
+        assert outputs[4][path] == content.replace("auto_examples_1", "auto_examples_4")
+
+
+def test_generate_gallery_include_mode(cwd, tmp_path):
+    shutil.copytree(cwd / "data/examples", tmp_path / "examples")
+    shutil.copytree(cwd / "_static", tmp_path / "_static")
+    (tmp_path / "examples/01-first_last2/second.md").write_text(
+        "# Second example\n\n![image](/_static/barchart.png)\n"
+    )
+    config = GalleryConfig(
+        examples_dirs="examples",
+        gallery_dirs="auto_examples",
+        root_dir=tmp_path,
+        text_example_mode="include",
+    )
+    generate_gallery(config)
+
+    section_dir = tmp_path / "auto_examples/first_last2"
+    assert (section_dir / "first.rst").read_text() == (
+        ".. _example_first:\n\n.. include:: ../../examples/01-first_last2/first.rst\n"
+    )
+    assert (section_dir / "second.md").read_text() == (
+        "(example_second)=\n\n"
+        "```{include} ../../examples/01-first_last2/second.md\n```\n"
+    )
+    # the cards are still parsed from the examples
+    index = (section_dir / "index.rst").read_text()
+    assert '{"target": "example_second", "img": "/auto_examples/' in index
+    assert "barchart.thumbnail.webp" in index
+
+    # the unchanged wrappers are not written again
+    mtime = (section_dir / "first.rst").stat().st_mtime_ns
+    generate_gallery(config)
+    assert (section_dir / "first.rst").stat().st_mtime_ns == mtime
+    # the notebooks are still copied
+    assert (
+        "example_plot_image_markdown"
+        in (
+            tmp_path / "auto_examples/combination/plot_image_markdown.ipynb"
+        ).read_text()
+    )
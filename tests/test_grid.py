@@ -1,6 +1,11 @@
+import os
+import subprocess
+import sys
+
 import pytest
 
 from myst_sphinx_gallery.grid import (
+    ClassList,
     Grid,
     GridItemCard,
     TocTree,
@@ -31,6 +36,13 @@ class TestTocTree:
         toc_tree = TocTree()
         assert repr(toc_tree) == "TocTree(\n\n.. toctree::\n    :hidden:\n\n)"
 
+    def test_many_items(self):
+        toc_tree = TocTree()
+        for i in range(1000):
+            toc_tree.add_item(f"item{i}")
+        expected = "".join(f"    item{i}\n" for i in range(1000))
+        assert toc_tree.pattern == "\n\n.. toctree::\n    :hidden:\n\n" + expected
+
 
 class TestGrid:
     def test_default_initialization(self):
@@ -69,6 +81,13 @@ class TestGrid:
         grid.add_item("item2")
         assert "item2" in grid.pattern
 
+    def test_many_items(self):
+        grid = Grid()
+        for i in range(1000):
+            grid.add_item(f"item{i}")
+        expected = "".join(f"    item{i}\n" for i in range(1000))
+        assert grid.pattern.endswith(f"msg-sd-row\n\n{expected}")
+
 
 class TestGridItemCard:
     def test_custom_initialization(self):
@@ -117,6 +136,118 @@ class TestGridItemCard:
         assert ":ref:`ref1`" in formatted_card
         assert ":img-top: path/to/img" in formatted_card
 
+    def test_format_matches_pattern(self):
+        card = GridItemCard(width="50%", class_card=["a", "b"])
+        card.add_item("item1")
+        expected = card.to_string().format(target_ref="ref1", img_path="img.png")
+        assert card.format("ref1", "img.png") == expected
+
+    def test_template_compiled_once(self):
+        card = GridItemCard()
+        template = card.template
+        card.format("ref1", "img1.png")
+        card.format("ref2", "img2.png")
+        assert card.template is template
+        assert template[1::2] == ("target_ref", "img_path", "target_ref")
+
+        card.add_option("custom_option", 5)
+        assert card.template is not template
+        assert ":custom_option: 5" in card.format("ref1", "img1.png")
+
+    def test_format_cards(self):
+        card = GridItemCard(shadow="lg")
+        cards = card.format_cards([("ref1", "img1.png"), ("ref2", "img2.png")])
+        assert cards.startswith("\n    .. gallery-cards::\n        :shadow: lg\n")
+        assert cards.endswith(
+            '\n        {"target": "ref1", "img": "img1.png"}\n'
+            '        {"target": "ref2", "img": "img2.png"}\n'
+        )
+        assert card.format_cards([]) == ""
+
+    def test_format_cards_with_items(self):
+        card = GridItemCard()
+        card.add_item("item1")
+        cards = card.format_cards([("ref1", "img1.png"), ("ref2", "img2.png")])
+        assert cards == card.format("ref1", "img1.png") + card.format(
+            "ref2", "img2.png"
+        )
+
+    def test_format_literal_braces(self):
+        card = GridItemCard(class_card="{{not-a-field}}")
+        card.add_item("{img_path!r:>12} {{item}}")
+        formatted_card = card.format("{ref}", "img.png")
+        expected = card.to_string().format(target_ref="{ref}", img_path="img.png")
+        assert formatted_card == expected
+        assert "{not-a-field}" in formatted_card
+        assert " 'img.png' {item}" in formatted_card
+        assert ":ref:`{ref}`" in formatted_card
+
+    def test_format_unknown_field(self):
+        card = GridItemCard(class_card="{not-a-field}")
+        with pytest.raises(KeyError, match="not-a-field"):
+            card.format("ref1", "img.png")
+
+    def test_format_cards_escaped_braces(self):
+        card = GridItemCard(class_card="{{braces}}")
+        cards = card.format_cards([("ref1", "img1.png")])
+        assert cards == card.format("ref1", "img1.png")
+        assert "{braces}" in cards
+
+    def test_template_recompiled_after_mutation(self):
+        card = GridItemCard()
+        template = card.template
+        card.options_format["custom_option"] = "5"
+        assert card.template is not template
+        assert ":custom_option: 5" in card.format("ref1", "img1.png")
+
+        card.class_options["class-body"] = ClassList(["new-body"])
+        assert ":class-body: new-body" in card.format("ref1", "img1.png")
+
+        card.items.append("item1")
+        assert "\n        item1\n" in card.format("ref1", "img1.png")
+
+
+class TestClassList:
+    def test_insertion_order(self):
+        classes = ClassList(["b", "a"]).union(["c", "a", "d", "b"])
+        assert list(classes) == ["b", "a", "c", "d"]
+        assert len(classes) == 4
+        assert "c" in classes
+
+    def test_union_returns_new_instance(self):
+        classes = ClassList(["a"])
+        new_classes = classes.union(["b"])
+        assert list(classes) == ["a"]
+        assert list(new_classes) == ["a", "b"]
+
+    def test_class_option_order(self):
+        card = GridItemCard(class_card=["z-class", "a-class", "msg-sd-card"])
+        assert list(card.class_options["class-card"]) == [
+            "msg-sd-card",
+            "sd-border-0",
+            "sd-rounded-2",
+            "z-class",
+            "a-class",
+        ]
+
+    def test_pattern_stable_across_hash_seeds(self):
+        code = (
+            "from myst_sphinx_gallery.grid import Grid, GridItemCard;"
+            "print(Grid(class_row={'r1', 'r2', 'r3'}).pattern);"
+            "print(GridItemCard(class_card=['c1', 'c2', 'c3']).format('ref', 'img'))"
+        )
+        outputs = {
+            subprocess.run(
+                [sys.executable, "-c", code],
+                capture_output=True,
+                text=True,
+                check=True,
+                env={**os.environ, "PYTHONHASHSEED": str(seed)},
+            ).stdout
+            for seed in range(5)
+        }
+        assert len(outputs) == 1
+
 
 class TestFormatParams:
     def test_with_tuple(self):
@@ -125,6 +256,9 @@ class TestFormatParams:
     def test_with_list(self):
         assert param_to_str([1, 2, 3]) == "1 2 3"
 
+    def test_with_set(self):
+        assert param_to_str({"b", "c", "a"}) == "a b c"
+
     def test_with_string(self):
         assert param_to_str("test") == "test"
 
@@ -1,12 +1,27 @@
+import base64
+import io
+import random
+import re
 from pathlib import Path
 
+import nbformat
 import pytest
+from PIL import Image
 
+from myst_sphinx_gallery import images as images_module
 from myst_sphinx_gallery.images import (
     CellImages,
     DocImages,
+    Thumbnail,
+    find_cell_image,
+    find_thumbnail_image,
+    iter_md_images,
+    iter_md_images_reversed,
+    iter_rst_images,
+    iter_rst_images_reversed,
     parse_md_images,
     parse_rst_images,
+    strip_str,
 )
 
 
@@ -142,6 +157,49 @@ def test_parse_md_images(md_content):
     )
 
 
+def test_parse_md_images_document_order():
+    content = """
+```{image} first.png
+:alt: gallery_thumbnail
+```
+
+![](second.png)
+
+:::{figure} third.png
+:alt: gallery_thumbnail
+:::
+
+![alt](fourth.png)
+"""
+    images = parse_md_images(content)
+    assert images.urls == ("first.png", "second.png", "third.png", "fourth.png")
+    assert images.alts == ("gallery_thumbnail", "", "gallery_thumbnail", "alt")
+
+
+def test_parse_md_images_max_images(md_content):
+    images = parse_md_images(md_content, max_images=2)
+    assert images == DocImages(
+        [
+            ("img/fun-fish.png", "gallery_thumbnail"),
+            ("img/fun-fish.png", ""),
+        ]
+    )
+    assert len(parse_md_images(md_content, max_images=0)) == 0
+
+
+def test_iter_md_images_is_lazy(md_content):
+    images = iter_md_images(md_content)
+    assert next(images) == ("img/fun-fish.png", "gallery_thumbnail")
+
+
+def test_parse_md_images_unclosed():
+    content = "```{image} a.png\n:alt: x\n" * 1000 + "![](b.png)\n" + "![a " * 1000
+    images = parse_md_images(content)
+    # only the last fenced image misses its closing fence
+    assert len(images) == 1000
+    assert images[-1] == "b.png"
+
+
 def test_parse_rst_images(rst_content):
     images = parse_rst_images(rst_content)
     assert images == DocImages(
@@ -156,6 +214,189 @@ def test_parse_rst_images(rst_content):
     )
 
 
+def legacy_parse_rst_images(rst_content):
+    """The regex based parser replaced by the line-oriented scanner."""
+    pattern = r"\.\.\s+(image|figure)::\s+(.*?)\n(?:\s+:.*?:\s*(.*?)\n)*"
+
+    images = []
+    for match in re.finditer(pattern, rst_content, re.DOTALL):
+        url = match.group(2).strip()
+        alt_match = re.search(r":alt:\s*(.*?)\n", match.group(0))
+        alt = alt_match.group(1).strip() if alt_match else ""
+        images.append((strip_str(url), strip_str(alt)))
+    return images
+
+
+def random_rst_block(rng, indent):
+    kind = rng.randrange(5)
+    if kind == 0:
+        directive = rng.choice(["image", "figure"])
+        url = f"img/{rng.choice(['a', 'b', 'fun-fish'])}{rng.randrange(100)}.png"
+        options = rng.sample(
+            [
+                ":alt: gallery_thumbnail",
+                ":alt: some alt text",
+                ":align: center",
+                ":width: 50%",
+                ":class: only-light",
+            ],
+            rng.randrange(4),
+        )
+        sub_indent = indent + rng.choice(["   ", "    ", "       "])
+        block = [f"{indent}.. {directive}:: {url}"]
+        block += [f"{sub_indent}{option}" for option in options]
+        if directive == "figure" and rng.random() < 0.5:
+            block += ["", f"{sub_indent}A caption of the figure."]
+        return block
+    if kind == 1:
+        return [f"{indent}Title {rng.randrange(100)}", f"{indent}========="]
+    if kind == 2:
+        return [f"{indent}.. note::", "", f"{indent}    Some note text."]
+    if kind == 3:
+        return [f"{indent}A paragraph with ``code`` and a `link <x.html>`_."]
+    return [f"{indent}- item {i}" for i in range(rng.randrange(1, 4))]
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_parse_rst_images_equivalence(seed):
+    rng = random.Random(seed)
+    for _ in range(50):
+        indent = rng.choice(["", "    "])
+        lines = []
+        for _ in range(rng.randrange(1, 15)):
+            lines += [*random_rst_block(rng, indent), ""]
+        content = "\n".join(lines) + "\n"
+        assert parse_rst_images(content).images == legacy_parse_rst_images(content)
+
+
+def test_parse_rst_images_option_block_ends():
+    content = """
+.. image:: a.png
+   :align: center
+
+:alt: not an option of the image
+
+.. figure:: b.png
+
+   Caption with :alt: in the text.
+"""
+    assert list(iter_rst_images(content)) == [("a.png", ""), ("b.png", "")]
+
+
+def test_parse_rst_images_max_images(rst_content):
+    images = parse_rst_images(rst_content, max_images=1)
+    assert images == DocImages([("img/fun-fish.png", "gallery_thumbnail")])
+
+
+def test_iter_md_images_reversed(md_content):
+    content = md_content + "![x ](a.png) text ![y](b.png)\n```{code-block}\n```\n"
+    images = list(iter_md_images(content))
+    assert list(iter_md_images_reversed(content)) == images[::-1]
+    assert list(iter_md_images_reversed("")) == []
+
+
+def test_iter_md_images_reversed_is_lazy():
+    content = "```{image} a.png\n:alt: x\n" * 1000 + "![](b.png)\n"
+    assert next(iter_md_images_reversed(content)) == ("b.png", "")
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_iter_rst_images_reversed(seed):
+    rng = random.Random(seed)
+    lines = []
+    for _ in range(30):
+        lines += random_rst_block(rng, rng.choice(["", "    "]))
+        # an indented directive may follow an option block without a blank line
+        if rng.random() < 0.3:
+            lines.append(f"    .. image:: img/nested{rng.randrange(100)}.png")
+        if rng.random() < 0.5:
+            lines.append("")
+    content = "\n".join(lines)
+    images = list(iter_rst_images(content))
+    assert list(iter_rst_images_reversed(content)) == images[::-1]
+
+
+def test_iter_rst_images_reversed_option_block():
+    content = """
+.. figure:: a.png
+    :align: center
+    .. image:: not_an_image.png
+        :width: 50%
+
+    .. image:: b.png
+        :width: 50%
+        .. image:: c.png
+    .. image:: d.png
+.. image:: e.png
+"""
+    images = list(iter_rst_images(content))
+    assert images == [("a.png", ""), ("b.png", ""), ("d.png", ""), ("e.png", "")]
+    assert list(iter_rst_images_reversed(content)) == images[::-1]
+
+
+def test_iter_rst_images_reversed_whitespace_line():
+    # a line of spaces ends the directive as a blank line, even without argument
+    content = ".. image::\n   \n   a.png\n    .. image:: b.png\n        :alt: b\n"
+    images = list(iter_rst_images(content))
+    assert images == [("", ""), ("b.png", "b")]
+    assert list(iter_rst_images_reversed(content)) == images[::-1]
+
+
+def select_thumbnail(images, thumbnail_strategy):
+    """The selection done on all images before the thumbnail scan existed."""
+    idx = 0 if thumbnail_strategy == "first" else -1
+    if len(images) == 0:
+        return None
+    thumbs = images.sel_urls("gallery_thumbnail")
+    if len(thumbs) > 0:
+        return thumbs[idx]
+    return images[idx]
+
+
+@pytest.mark.parametrize("thumbnail_strategy", ["first", "last"])
+def test_find_thumbnail_image(thumbnail_strategy):
+    content = """
+![](first.png)
+
+```{image} second.png
+:alt: gallery_thumbnail
+```
+
+:::{figure} third.png
+:alt: gallery_thumbnail
+:::
+
+![alt](fourth.png)
+"""
+    images = parse_md_images(content)
+    for doc in [content, content.replace("gallery_thumbnail", "x"), ""]:
+        assert find_thumbnail_image(doc, "md", thumbnail_strategy) == select_thumbnail(
+            parse_md_images(doc), thumbnail_strategy
+        )
+    assert select_thumbnail(images, thumbnail_strategy) in ("second.png", "third.png")
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("thumbnail_strategy", ["first", "last"])
+def test_find_thumbnail_image_rst(seed, thumbnail_strategy):
+    rng = random.Random(seed)
+    for _ in range(20):
+        lines = []
+        for _ in range(rng.randrange(1, 10)):
+            lines += [*random_rst_block(rng, ""), ""]
+        content = "\n".join(lines)
+        assert find_thumbnail_image(
+            content, "rst", thumbnail_strategy
+        ) == select_thumbnail(parse_rst_images(content), thumbnail_strategy)
+
+
+def test_find_thumbnail_image_invalid(md_content):
+    with pytest.raises(ValueError, match="thumbnail_strategy"):
+        find_thumbnail_image(md_content, "md", "middle")
+    with pytest.raises(ValueError, match="style"):
+        find_thumbnail_image(md_content, "txt")
+
+
 def test_read_cell_image(nb_file):
     cell_img = CellImages(nb_file)
     assert len(cell_img) == 1
@@ -167,3 +408,122 @@ def test_read_markdown_image(nb_file):
     images = parse_md_images(md_content)
     print(images.images)
     assert len(images) == 6
+
+
+def encode_image(size, fmt="PNG"):
+    buffer = io.BytesIO()
+    Image.new("RGB", size).save(buffer, format=fmt)
+    return base64.b64encode(buffer.getvalue()).decode()
+
+
+def png_output(size):
+    return nbformat.v4.new_output(
+        "display_data", data={"image/png": encode_image(size), "text/plain": "<Figure>"}
+    )
+
+
+def write_nb(nb_file, outputs):
+    cells = [nbformat.v4.new_code_cell(outputs=[output]) for output in outputs]
+    nbformat.write(nbformat.v4.new_notebook(cells=cells), nb_file)
+    return nb_file
+
+
+@pytest.fixture
+def multi_image_nb(tmp_path):
+    cells = [
+        nbformat.v4.new_markdown_cell("![](a.png)"),
+        nbformat.v4.new_code_cell(outputs=[png_output((10, 10)), png_output((20, 20))]),
+        nbformat.v4.new_code_cell(
+            outputs=[png_output((30, 30)), nbformat.v4.new_output("stream", text="x")]
+        ),
+        nbformat.v4.new_code_cell(),
+    ]
+    nb_file = tmp_path / "multi_image.ipynb"
+    nbformat.write(nbformat.v4.new_notebook(cells=cells), nb_file)
+    return nb_file
+
+
+def test_find_cell_image(multi_image_nb):
+    assert find_cell_image(multi_image_nb, "first").size == (10, 10)
+    assert find_cell_image(multi_image_nb, "last").size == (30, 30)
+    with pytest.raises(ValueError, match="thumbnail_strategy"):
+        find_cell_image(multi_image_nb, "middle")
+
+
+def test_find_cell_image_no_image(tmp_path):
+    nb_file = tmp_path / "no_image.ipynb"
+    cells = [nbformat.v4.new_markdown_cell("![](a.png)"), nbformat.v4.new_code_cell()]
+    nbformat.write(nbformat.v4.new_notebook(cells=cells), nb_file)
+    assert find_cell_image(nb_file) is None
+
+
+def test_cell_images_lazy_decoding(multi_image_nb):
+    cell_img = CellImages(multi_image_nb)
+    assert len(cell_img) == 3
+    assert cell_img[-1].size == (30, 30)
+    # only the accessed image is decoded
+    assert list(cell_img._images) == [2]
+    assert [img.size for img in cell_img.images] == [(10, 10), (20, 20), (30, 30)]
+    with pytest.raises(IndexError):
+        cell_img[3]
+
+
+def test_find_cell_image_mime_priority(tmp_path):
+    output = nbformat.v4.new_output(
+        "display_data",
+        data={
+            "image/png": encode_image((10, 10)),
+            "image/jpeg": encode_image((20, 20), "JPEG"),
+        },
+    )
+    nb_file = write_nb(tmp_path / "bundle.ipynb", [output])
+    assert find_cell_image(nb_file).format == "PNG"
+    image = find_cell_image(nb_file, mime_types=["image/jpeg", "image/png"])
+    assert image.format == "JPEG"
+    assert find_cell_image(nb_file, mime_types=["image/gif"]) is None
+    with pytest.raises(ValueError, match="Unsupported MIME type"):
+        find_cell_image(nb_file, mime_types=["image/bmp"])
+
+
+def test_find_cell_image_gif(tmp_path):
+    output = nbformat.v4.new_output(
+        "display_data", data={"image/gif": encode_image((10, 10), "GIF")}
+    )
+    nb_file = write_nb(tmp_path / "gif.ipynb", [output])
+    assert find_cell_image(nb_file).format == "GIF"
+
+
+def test_find_cell_image_svg(tmp_path, monkeypatch):
+    svg = '<svg xmlns="http://www.w3.org/2000/svg" width="10" height="10"/>'
+    nb_file = write_nb(
+        tmp_path / "svg.ipynb",
+        [
+            png_output((10, 10)),
+            nbformat.v4.new_output("display_data", data={"image/svg+xml": svg}),
+        ],
+    )
+    calls = []
+
+    def rasterizer(source, ref_size):
+        calls.append((source, ref_size))
+        return Image.new("RGB", ref_size)
+
+    image = find_cell_image(nb_file, ref_size=64, svg_rasterizer=rasterizer)
+    assert image.size == (64, 64)
+    assert calls == [(svg, (64, 64))]
+
+    # without a rasterizer, SVG outputs are skipped
+    monkeypatch.setattr(images_module, "cairosvg", None)
+    assert find_cell_image(nb_file).size == (10, 10)
+    assert len(CellImages(nb_file, ["image/svg+xml", "image/png"])) == 1
+
+
+def test_thumbnail_jpeg_draft(tmp_path):
+    image_file = tmp_path / "large.jpg"
+    Image.new("RGB", (3200, 2240), "red").save(image_file)
+    thumbnail = Thumbnail(image_file, tmp_path, ref_size=(320, 224))
+    # the image is decoded at a reduced scale still covering the ref_size
+    assert thumbnail.image.size == (400, 280)
+    assert thumbnail.n_frames == 1
+    out_file = thumbnail.save_thumbnail()
+    assert Image.open(out_file).size == (320, 224)
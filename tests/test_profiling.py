@@ -0,0 +1,75 @@
+from pathlib import Path
+
+import pytest
+
+from myst_sphinx_gallery.images import Thumbnail
+from myst_sphinx_gallery.profiling import (
+    PROFILE_MEMORY_ENV,
+    MemoryProfiler,
+    memory_profiler,
+)
+
+IMAGE = Path(__file__).parent / "_static/barchart.png"
+
+
+@pytest.fixture
+def profiler():
+    profiler = MemoryProfiler()
+    yield profiler
+    profiler.reset()
+
+
+def test_disabled_profiler_records_nothing(profiler, monkeypatch):
+    monkeypatch.delenv(PROFILE_MEMORY_ENV, raising=False)
+    with profiler.track("example", "a.ipynb"):
+        pass
+    assert profiler.records == []
+    assert profiler.report() == ""
+
+
+def test_nested_tasks(profiler):
+    profiler.enable()
+    with profiler.track("example", "a.ipynb"):
+        with profiler.track("thumbnail", "a.png"):
+            data = bytearray(8 * 2**20)
+        del data
+        with profiler.track("thumbnail", "b.png"):
+            pass
+    with profiler.track("example", "b.ipynb"):
+        pass
+
+    records = {(r.kind, r.name): r for r in profiler.records}
+    assert set(records) == {
+        ("example", "a.ipynb"),
+        ("example", "b.ipynb"),
+        ("thumbnail", "a.png"),
+        ("thumbnail", "b.png"),
+    }
+    # the peak of the inner task is also the peak of the outer one
+    assert records["thumbnail", "a.png"].peak >= 8 * 2**20
+    assert records["example", "a.ipynb"].peak >= 8 * 2**20
+    assert records["example", "b.ipynb"].peak < 2**20
+    assert profiler.records[0].name in ("a.ipynb", "a.png")
+
+    report = profiler.report(top=1)
+    assert "Top 1 examples by peak memory:" in report
+    assert "a.ipynb" in report
+    assert "b.ipynb" not in report
+
+
+def test_env_variable_enables_profiling(profiler, monkeypatch):
+    monkeypatch.setenv(PROFILE_MEMORY_ENV, "1")
+    assert profiler.enabled
+    with profiler.track("thumbnail", "a.png"):
+        pass
+    assert [r.name for r in profiler.records] == ["a.png"]
+
+
+def test_save_thumbnail_is_profiled(tmp_path, monkeypatch):
+    monkeypatch.setenv(PROFILE_MEMORY_ENV, "1")
+    try:
+        Thumbnail(IMAGE, tmp_path).save_thumbnail()
+        records = memory_profiler.records
+    finally:
+        memory_profiler.reset()
+    assert [(r.kind, r.name) for r in records] == [("thumbnail", str(IMAGE))]
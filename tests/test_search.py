@@ -0,0 +1,80 @@
+from myst_sphinx_gallery.search import (
+    build_search_index,
+    ngrams,
+    tokenize,
+    write_search_index,
+)
+from myst_sphinx_gallery.utils import (
+    get_search_entries,
+    purge_search_entries,
+    register_search_entry,
+)
+
+
+class Env:
+    pass
+
+
+def test_tokenize():
+    assert tokenize("Plot a 3D-Surface, with `numpy`!") == [
+        "plot",
+        "a",
+        "3d",
+        "surface",
+        "with",
+        "numpy",
+    ]
+
+
+def test_ngrams():
+    assert ngrams("plot") == {"plo", "lot"}
+    assert ngrams("3d") == set()
+
+
+def test_build_search_index():
+    index = build_search_index(
+        [
+            ("Contour map", "Draw contours.", "ex/contour.html", ["Maps"]),
+            ("Bar chart", "", "ex/bar.html", ["Plots", "Charts"]),
+        ]
+    )
+    assert index["size"] == 3
+    assert index["sections"] == ["Charts", "Maps", "Plots"]
+    assert index["docs"] == [
+        ["Contour map", "Draw contours.", "ex/contour.html", [1]],
+        ["Bar chart", "", "ex/bar.html", [0, 2]],
+    ]
+    assert index["grams"]["con"] == [0]
+    assert index["grams"]["art"] == [1]
+    # section names are searchable
+    assert index["grams"]["plo"] == [1]
+    assert list(index["grams"]) == sorted(index["grams"])
+
+
+def test_write_search_index(tmp_path):
+    index_file = write_search_index(
+        [("Title", "Tooltip", "ex.html", [])], tmp_path / "_static"
+    )
+    assert index_file == tmp_path / "_static" / "myst_sphinx_gallery_search.json"
+    assert index_file.read_text(encoding="utf-8").startswith('{"size":3,')
+
+
+def test_search_entries_registry():
+    env = Env()
+    assert get_search_entries(env) == {}
+    register_search_entry(
+        env, "gallery", "ex/first", title="First", tooltip="Tip", section="Maps"
+    )
+    register_search_entry(
+        env, "base", "ex/first", title="First", tooltip="Tip", section="Basics"
+    )
+    register_search_entry(
+        env, "base", "ex/second", title="Second", tooltip="", section=""
+    )
+    assert get_search_entries(env) == {
+        "ex/first": ("First", "Tip", ["Basics", "Maps"]),
+        "ex/second": ("Second", "", []),
+    }
+
+    purge_search_entries(env, "base")
+    assert get_search_entries(env) == {"ex/first": ("First", "Tip", ["Maps"])}
@@ -1,11 +1,21 @@
+import json
 from pathlib import Path
 from unittest.mock import Mock, patch
 
 import pytest
+from PIL import Image
 from sphinx.application import Sphinx
 
 from myst_sphinx_gallery.config import GalleryConfig
-from myst_sphinx_gallery.sphinx_ext import cleanup_thumbnail, main
+from myst_sphinx_gallery.profiling import memory_profiler
+from myst_sphinx_gallery.search import SEARCH_INDEX_FILE
+from myst_sphinx_gallery.sphinx_ext import (
+    cleanup_thumbnail,
+    get_outdated_galleries,
+    main,
+    purge_galleries,
+)
+from myst_sphinx_gallery.utils import register_gallery_pattern, register_thumbnail_dirs
 
 
 class MockConfig:
@@ -16,14 +26,27 @@ class MockConfig:
 
 class MockApp(Sphinx):
     config = MockConfig(myst_sphinx_gallery_config=Mock(spec=GalleryConfig))
+    env = MockConfig()
 
 
 @pytest.fixture
-def app():
+def app(tmp_path):
     app = Mock(spec=MockApp)
+    app.doctreedir = tmp_path / "doctrees"
     return app
 
 
+@pytest.fixture
+def thumbnail_dir(app):
+    return app.doctreedir / "myst_sphinx_gallery_thumbs"
+
+
+@pytest.fixture(autouse=True)
+def reset_memory_profiler():
+    yield
+    memory_profiler.reset()
+
+
 def test_main_invalid_config_type(app):
     app.config.myst_sphinx_gallery_config = "invalid_config"
     with pytest.raises(
@@ -33,17 +56,19 @@ def test_main_invalid_config_type(app):
         main(app)
 
 
-def test_main_valid_gallery_config(app):
+def test_main_valid_gallery_config(app, thumbnail_dir):
     gallery_conf = Mock(spec=GalleryConfig)
     app.config.myst_sphinx_gallery_config = gallery_conf
     with patch(
         "myst_sphinx_gallery.sphinx_ext.generate_gallery"
     ) as mock_generate_gallery:
         main(app)
-        mock_generate_gallery.assert_called_once_with(gallery_conf)
+        mock_generate_gallery.assert_called_once_with(
+            gallery_conf, thumbnail_dir=thumbnail_dir
+        )
 
 
-def test_main_valid_dict_config(app):
+def test_main_valid_dict_config(app, thumbnail_dir):
     gallery_conf = {
         "examples_dirs": "examples",
         "gallery_dirs": "galleries",
@@ -54,7 +79,30 @@ def test_main_valid_dict_config(app):
         "myst_sphinx_gallery.sphinx_ext.generate_gallery"
     ) as mock_generate_gallery:
         main(app)
-        mock_generate_gallery.assert_called_once_with(gallery_conf)
+        mock_generate_gallery.assert_called_once_with(
+            gallery_conf, thumbnail_dir=thumbnail_dir
+        )
+
+
+@pytest.mark.parametrize(
+    "gallery_conf",
+    [GalleryConfig(profile_memory=True), {"profile_memory": True}],
+    ids=["GalleryConfig", "dict"],
+)
+def test_main_profile_memory_without_galleries(app, gallery_conf):
+    app.config.myst_sphinx_gallery_config = gallery_conf
+    with patch(
+        "myst_sphinx_gallery.sphinx_ext.generate_gallery"
+    ) as mock_generate_gallery:
+        main(app)
+        mock_generate_gallery.assert_not_called()
+    assert memory_profiler.enabled
+
+
+def test_main_no_profile_memory(app):
+    app.config.myst_sphinx_gallery_config = GalleryConfig()
+    main(app)
+    assert not memory_profiler.enabled
 
 
 class TestCleanupThumbnail:
@@ -66,6 +114,8 @@ class TestCleanupThumbnail:
         # Arrange
         app = Mock()
         app.srcdir = srcdir
+        app.env = MockConfig()
+        register_thumbnail_dirs(app.env, [thumb_dir])
         app.config = Mock()
         app.config.myst_sphinx_gallery_config = Mock()
         app.config.myst_sphinx_gallery_config.remove_thumbnail_after_build = True
@@ -83,6 +133,8 @@ class TestCleanupThumbnail:
         # Arrange
         app = Mock()
         app.srcdir = srcdir
+        app.env = MockConfig()
+        register_thumbnail_dirs(app.env, [thumb_dir])
         app.config = Mock()
         app.config.myst_sphinx_gallery_config = Mock()
         app.config.myst_sphinx_gallery_config.remove_thumbnail_after_build = False
@@ -91,3 +143,300 @@ class TestCleanupThumbnail:
         cleanup_thumbnail(app, None)
 
         assert thumb_dir.exists()
+
+    def test_cleanup_thumbnail_only_registered(self, tmp_path):
+        srcdir = tmp_path
+        registered = srcdir / "gallery" / "myst_sphinx_gallery_thumbs"
+        unregistered = srcdir / "other" / "myst_sphinx_gallery_thumbs"
+        registered.mkdir(parents=True)
+        unregistered.mkdir(parents=True)
+        # Arrange
+        app = Mock()
+        app.srcdir = srcdir
+        app.env = MockConfig()
+        register_thumbnail_dirs(app.env, [registered])
+        app.config = Mock()
+        app.config.myst_sphinx_gallery_config = Mock()
+        app.config.myst_sphinx_gallery_config.remove_thumbnail_after_build = True
+
+        # Act
+        cleanup_thumbnail(app, None)
+
+        assert not registered.exists()
+        assert unregistered.exists()
+        assert app.env.myst_sphinx_gallery_thumb_dirs == set()
+
+    def test_cleanup_thumbnail_keeps_cache(self, tmp_path):
+        srcdir = tmp_path / "source"
+        in_source = srcdir / "gallery" / "myst_sphinx_gallery_thumbs"
+        cache = tmp_path / "build" / "doctrees" / "myst_sphinx_gallery_thumbs"
+        in_source.mkdir(parents=True)
+        cache.mkdir(parents=True)
+        # Arrange
+        app = Mock()
+        app.srcdir = srcdir
+        app.env = MockConfig()
+        register_thumbnail_dirs(app.env, [in_source, cache])
+        app.config = Mock()
+        app.config.myst_sphinx_gallery_config = Mock()
+        app.config.myst_sphinx_gallery_config.remove_thumbnail_after_build = True
+
+        # Act
+        cleanup_thumbnail(app, None)
+
+        assert not in_source.exists()
+        assert cache.exists()
+
+
+class TestOutdatedGalleries:
+    @pytest.fixture
+    def env(self):
+        env = MockConfig()
+        register_gallery_pattern(env, "gallery", "examples/first")
+        register_gallery_pattern(env, "wildcard", "examples/sub/*")
+        return env
+
+    def test_changed_example(self, env):
+        outdated = get_outdated_galleries(None, env, set(), {"examples/first"}, set())
+        assert outdated == ["gallery"]
+
+    def test_added_and_removed_examples(self, env):
+        outdated = get_outdated_galleries(
+            None, env, {"examples/sub/new"}, set(), {"examples/first"}
+        )
+        assert outdated == ["gallery", "wildcard"]
+
+    def test_wildcard_does_not_match_subdirectories(self, env):
+        outdated = get_outdated_galleries(
+            None, env, {"examples/sub/deeper/new", "examples/first/new"}, set(), set()
+        )
+        assert outdated == []
+
+    def test_unrelated_changes(self, env):
+        outdated = get_outdated_galleries(None, env, {"other"}, {"index"}, set())
+        assert outdated == []
+
+    def test_gallery_already_changed(self, env):
+        outdated = get_outdated_galleries(
+            None, env, set(), {"examples/first", "gallery"}, set()
+        )
+        assert outdated == []
+
+    def test_purge(self, env):
+        purge_galleries(None, env, "gallery")
+        outdated = get_outdated_galleries(None, env, set(), {"examples/first"}, set())
+        assert outdated == []
+
+
+def test_gallery_cards_directive(tmp_path):
+    src_dir = tmp_path / "src"
+    src_dir.mkdir()
+    (src_dir / "conf.py").write_text('extensions = ["myst_sphinx_gallery"]\n')
+    for name in ["first", "second"]:
+        Image.new("RGB", (10, 10)).save(src_dir / f"{name}.png")
+        (src_dir / f"{name}.rst").write_text(
+            f".. _example_{name}:\n\n{name.title()} example\n==============\n"
+        )
+    (src_dir / "index.rst").write_text(
+        "Gallery\n=======\n\n"
+        ".. toctree::\n    :hidden:\n\n    first\n    second\n\n"
+        ".. grid::\n\n"
+        "    .. gallery-cards::\n"
+        "        :shadow: lg\n"
+        "        :class-card: my-card\n\n"
+        '        {"target": "example_first", "img": "/first.png"}\n'
+        '        {"target": "example_second", "img": "/second.png"}\n'
+    )
+    app = Sphinx(
+        src_dir,
+        src_dir,
+        tmp_path / "out",
+        tmp_path / "doctrees",
+        "html",
+        status=None,
+        warning=None,
+    )
+    app.build()
+
+    html = (tmp_path / "out/index.html").read_text()
+    assert html.count("sd-card-img-top") == 2
+    assert html.count("sd-shadow-lg sd-card-hover my-card") == 2
+    for name in ["first", "second"]:
+        assert f'src="_images/{name}.png"' in html
+        assert f'href="{name}.html#example-{name}"' in html
+        assert f"{name.title()} example</span>" in html
+
+
+def build_example_gallery(tmp_path, *options):
+    """Build a ``gallery`` of two examples with the given directive options."""
+    src_dir = tmp_path / "src"
+    (src_dir / "examples").mkdir(parents=True)
+    (src_dir / "_static").mkdir()
+    (src_dir / "conf.py").write_text('extensions = ["myst_sphinx_gallery"]\n')
+    for name in ["first", "second"]:
+        Image.new("RGB", (10, 10)).save(src_dir / "_static" / f"{name}.png")
+        title = f"{name.title()} example"
+        (src_dir / "examples" / f"{name}.rst").write_text(
+            f"{title}\n{'=' * len(title)}\n\n"
+            f"About {name}.\n\n.. image:: /_static/{name}.png\n"
+        )
+    (src_dir / "base.rst").write_text(
+        "Base\n====\n\n.. base-gallery::\n\n    examples/first\n    examples/second\n"
+    )
+    (src_dir / "index.rst").write_text(
+        "Gallery\n=======\n\n.. gallery::\n"
+        + "".join(f"    :{option}:\n" for option in options)
+        + "\n    base\n"
+    )
+    app = Sphinx(
+        src_dir,
+        src_dir,
+        tmp_path / "out",
+        tmp_path / "doctrees",
+        "html",
+        status=None,
+        warning=None,
+    )
+    app.build()
+    return tmp_path / "out"
+
+
+def test_virtual_gallery_directive(tmp_path):
+    out_dir = build_example_gallery(tmp_path, "tooltip", "virtual")
+
+    html = (out_dir / "index.html").read_text()
+    assert "<img" not in html
+    assert "myst_sphinx_gallery.js" in html
+    blob = html.split('<script type="application/json" class="msg-virtual-data">')[1]
+    data = json.loads(blob.split("</script>")[0])
+    assert data["tooltip"] is True
+    assert "msg-tooltip" in data["classes"]["col"]
+    assert [card["title"] for card in data["cards"]] == [
+        "First example",
+        "Second example",
+    ]
+    for name, card in zip(["first", "second"], data["cards"]):
+        assert card["tooltip"] == f"About {name}."
+        assert card["url"] == f"examples/{name}.html"
+        assert (out_dir / card["thumb"]).is_file()
+        # the links are kept for readers without javascript and for search
+        assert f'href="examples/{name}.html">{name.title()} example</a>' in html
+
+
+def test_gallery_search_index(tmp_path):
+    out_dir = build_example_gallery(tmp_path, "filter")
+
+    html = (out_dir / "index.html").read_text()
+    assert html.count('class="msg-gallery-filter-input"') == 1
+    index = json.loads((out_dir / "_static" / SEARCH_INDEX_FILE).read_text())
+    assert index["sections"] == ["Base"]
+    assert index["docs"] == [
+        ["First example", "About first.", "examples/first.html", [0]],
+        ["Second example", "About second.", "examples/second.html", [0]],
+    ]
+    assert index["grams"]["fir"] == [0]
+    assert index["grams"]["bas"] == [0, 1]
+
+
+def test_include_mode_build(tmp_path):
+    src_dir = tmp_path / "src"
+    examples_dir = tmp_path / "examples"
+    (examples_dir / "section").mkdir(parents=True)
+    (examples_dir / "GALLERY_HEADER.rst").write_text("Examples\n========\n")
+    (examples_dir / "section/GALLERY_HEADER.rst").write_text("Section\n=======\n")
+    (examples_dir / "section/first.rst").write_text(
+        "First example\n=============\n\nAbout first.\n"
+    )
+    (examples_dir / "section/second.md").write_text(
+        "# Second example\n\nAbout second.\n"
+    )
+    src_dir.mkdir()
+    (src_dir / "conf.py").write_text(
+        "from pathlib import Path\n"
+        "from myst_sphinx_gallery import GalleryConfig\n"
+        'extensions = ["myst_parser", "myst_sphinx_gallery"]\n'
+        "myst_sphinx_gallery_config = GalleryConfig(\n"
+        '    examples_dirs="../examples",\n'
+        '    gallery_dirs="auto_examples",\n'
+        "    root_dir=Path(__file__).parent,\n"
+        '    text_example_mode="include",\n'
+        ")\n"
+    )
+    (src_dir / "index.rst").write_text(
+        "Index\n=====\n\n"
+        ":ref:`example_first` and :ref:`example_second`\n\n"
+        ".. toctree::\n\n    auto_examples/index\n"
+    )
+    app = Sphinx(
+        src_dir,
+        src_dir,
+        tmp_path / "out",
+        tmp_path / "doctrees",
+        "html",
+        status=None,
+        warning=None,
+    )
+    app.build()
+
+    out_dir = tmp_path / "out"
+    for name in ["first", "second"]:
+        html = (out_dir / f"auto_examples/section/{name}.html").read_text()
+        assert f"About {name}." in html
+    html = (out_dir / "index.html").read_text()
+    assert "First example</span>" in html
+    assert "Second example</span>" in html
+
+
+def test_incremental_build(tmp_path):
+    src_dir = tmp_path / "src"
+    (src_dir / "examples").mkdir(parents=True)
+    (src_dir / "_static").mkdir()
+    (src_dir / "conf.py").write_text('extensions = ["myst_sphinx_gallery"]\n')
+    for name in ["first", "second"]:
+        Image.new("RGB", (10, 10)).save(src_dir / "_static" / f"{name}.png")
+        title = f"{name.title()} example"
+        (src_dir / "examples" / f"{name}.rst").write_text(
+            f"{title}\n{'=' * len(title)}\n\n"
+            f"About {name}.\n\n.. image:: /_static/{name}.png\n"
+        )
+        (src_dir / f"{name}_gallery.rst").write_text(
+            f"{name.title()}\n{'=' * len(name)}\n\n"
+            f".. base-gallery::\n\n    examples/{name}\n"
+        )
+    (src_dir / "index.rst").write_text(
+        "Index\n=====\n\n.. toctree::\n\n"
+        "    first_gallery\n    second_gallery\n"
+        "    examples/first\n    examples/second\n"
+    )
+
+    def build():
+        app = Sphinx(
+            src_dir,
+            src_dir,
+            tmp_path / "out",
+            tmp_path / "doctrees",
+            "html",
+            status=None,
+            warning=None,
+        )
+        read = []
+        app.connect(
+            "env-before-read-docs",
+            lambda app, env, docnames: read.extend(docnames),
+        )
+        app.build()
+        return sorted(read)
+
+    assert build() == [
+        "examples/first",
+        "examples/second",
+        "first_gallery",
+        "index",
+        "second_gallery",
+    ]
+    # nothing is read again without changes, with the default configuration
+    assert build() == []
+
+    example = src_dir / "examples" / "first.rst"
+    example.write_text(example.read_text().replace("About first.", "About one."))
+    assert build() == ["examples/first", "first_gallery"]
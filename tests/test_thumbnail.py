@@ -1,8 +1,10 @@
+import threading
 from pathlib import Path
 
 import pytest
+from PIL import Image
 
-from myst_sphinx_gallery.images import Thumbnail
+from myst_sphinx_gallery.images import MemoryBudget, Thumbnail
 
 cwd = Path(__file__).parent
 
@@ -98,3 +100,75 @@ class TestThumbnail:
             )
             thumb_file = thumb.save_thumbnail()
             print(img, thumb_file, sep=" -> ")
+
+
+def test_save_thumbnail_replaces_atomically(tmp_path):
+    thumb = Thumbnail(png_files[0], tmp_path, (40, 28))
+    thumb_file = thumb.save_thumbnail()
+    assert thumb_file.exists()
+    # the temporary file is renamed to the thumbnail
+    assert [p.name for p in tmp_path.iterdir()] == [thumb_file.name]
+
+
+def test_decoded_size(tmp_path):
+    image = Image.new("RGB", (300, 200))
+    assert Thumbnail(image, tmp_path).decoded_size == 300 * 200 * 3
+
+    gif_file = tmp_path / "animated.gif"
+    frames = [Image.new("L", (30, 20), color) for color in range(0, 250, 10)]
+    frames[0].save(gif_file, save_all=True, append_images=frames[1:], duration=10)
+    thumb = Thumbnail(gif_file, tmp_path, max_animation_frames=10)
+    assert thumb.decoded_size == 30 * 20 * len(thumb.image.getbands()) * 10
+
+
+def run_reservations(budget, sizes):
+    """Reserve the sizes in threads, recording the memory used concurrently."""
+    used = []
+    started = threading.Barrier(len(sizes))
+
+    def reserve(size):
+        started.wait()
+        with budget.reserve(size):
+            used.append(budget.used)
+            threading.Event().wait(0.05)
+
+    threads = [threading.Thread(target=reserve, args=(size,)) for size in sizes]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return used
+
+
+def test_memory_budget_packs_small_reservations():
+    budget = MemoryBudget(100)
+    used = run_reservations(budget, [30, 30, 30])
+    assert max(used) == 90
+    assert budget.used == 0
+
+
+def test_memory_budget_runs_large_reservation_alone():
+    budget = MemoryBudget(100)
+    used = run_reservations(budget, [60, 60, 150])
+    assert max(used) <= 150
+    assert 150 in used
+    assert budget.used == 0
+
+
+def test_memory_budget_unlimited():
+    budget = MemoryBudget()
+    with budget.reserve(10**12):
+        assert budget.used == 0
+
+
+def save_gif(path, n_frames, size=(30, 20)):
+    frames = [Image.new("L", size, i * 10 % 256) for i in range(n_frames)]
+    frames[0].save(path, save_all=True, append_images=frames[1:], duration=10)
+    return path
+
+
+def test_thumbnail_does_not_count_frames(tmp_path):
+    thumb = Thumbnail(save_gif(tmp_path / "animated.gif", 25), tmp_path)
+    assert thumb.save_kwargs["save_all"]
+    # counting the frames of a GIF scans the whole file
+    assert "n_frames" not in vars(thumb.image)
@@ -5,6 +5,7 @@ import nbformat
 import pytest
 
 from myst_sphinx_gallery.utils import (
+    FileIndex,
     _extract_md_title_and_tooltip,
     _extract_rst_title_and_tooltip,
     _get_md_base_gallery_directives,
@@ -12,9 +13,13 @@ from myst_sphinx_gallery.utils import (
     _is_rst_title_line,
     _parse_rst_title,
     abs_path,
+    check_stale_file_indexes,
+    clear_file_indexes,
     ensure_dir_exists,
     extract_title_and_tooltip,
+    file_in_folder,
     get_base_gallery_items,
+    get_file_index,
     get_rst_title,
     parse_files_without_suffix,
     remove_special_chars,
@@ -55,6 +60,84 @@ class TestAbsPath:
         assert abs_path(special_path, root_dir) == expected
 
 
+class TestAbsPathRglob:
+    def test_abs_path_rglob(self, tmp_path):
+        (tmp_path / "a" / "b").mkdir(parents=True)
+        (tmp_path / "a" / "b" / "img.png").touch()
+        assert abs_path("img/img.png", tmp_path, method="rglob") == (
+            tmp_path / "a" / "b" / "img.png"
+        )
+
+    def test_abs_path_rglob_not_found(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            abs_path("missing.png", tmp_path, method="rglob")
+
+    def test_abs_path_rglob_multiple(self, tmp_path):
+        (tmp_path / "a").mkdir()
+        (tmp_path / "b").mkdir()
+        (tmp_path / "a" / "img.png").touch()
+        (tmp_path / "b" / "img.png").touch()
+        with pytest.warns(UserWarning, match=", the first one will be used"):
+            assert abs_path("img.png", tmp_path, method="rglob") == (
+                tmp_path / "a" / "img.png"
+            )
+
+
+class TestFileIndex:
+    def test_lookup(self, tmp_path):
+        (tmp_path / "sub").mkdir()
+        (tmp_path / "sub" / "file.txt").touch()
+        (tmp_path / "file.txt").touch()
+        index = FileIndex(tmp_path)
+        assert index.lookup("file.txt") == [
+            tmp_path / "file.txt",
+            tmp_path / "sub" / "file.txt",
+        ]
+        assert index.lookup("other.txt") == []
+
+    def test_lookup_directories(self, tmp_path):
+        (tmp_path / "sub" / "data").mkdir(parents=True)
+        index = FileIndex(tmp_path)
+        assert index.lookup("data") == [tmp_path / "sub" / "data"]
+        assert file_in_folder("data", tmp_path)
+
+    def test_invalidated_by_new_file(self, tmp_path):
+        (tmp_path / "sub").mkdir()
+        index = FileIndex(tmp_path)
+        assert "new.txt" not in index
+        assert not index.is_stale()
+        (tmp_path / "sub" / "new.txt").touch()
+        assert index.is_stale()
+        # the staleness is only checked once requested, e.g. once per build
+        assert "new.txt" not in index
+        index.check_stale()
+        assert "new.txt" in index
+
+    def test_invalidated_by_removed_file(self, tmp_path):
+        (tmp_path / "sub").mkdir()
+        (tmp_path / "sub" / "old.txt").touch()
+        index = FileIndex(tmp_path)
+        assert "old.txt" in index
+        (tmp_path / "sub" / "old.txt").unlink()
+        index.check_stale()
+        assert "old.txt" not in index
+
+    def test_check_and_clear_cached_indexes(self, tmp_path):
+        index = get_file_index(tmp_path)
+        assert "new.txt" not in index
+        (tmp_path / "new.txt").touch()
+        check_stale_file_indexes()
+        assert "new.txt" in index
+        clear_file_indexes()
+        assert get_file_index(tmp_path) is not index
+
+    def test_file_in_folder(self, tmp_path):
+        (tmp_path / "sub").mkdir()
+        (tmp_path / "sub" / "file.txt").touch()
+        assert file_in_folder("other/dir/file.txt", tmp_path)
+        assert not file_in_folder("missing.txt", tmp_path)
+
+
 class TestEnsureDirExists:
     def test_ensure_dir_exists(self):
         ensure_dir_exists(out_dir)
@@ -204,6 +287,16 @@ class TestGetRstTitle:
         expected_title = "Title1"
         assert get_rst_title(content=content) == expected_title
 
+    def test_rst_content_with_mismatched_underline(self):
+        content = """
+        Title
+        ===
+
+        Some content here.
+        """
+        with pytest.warns(UserWarning, match="No title line matches"):
+            assert get_rst_title(content=content) == ""
+
     def test_empty_rst_content(self):
         content = ""
         expected_title = ""
@@ -0,0 +1,93 @@
+import os
+import shutil
+import threading
+from pathlib import Path
+
+import pytest
+
+from myst_sphinx_gallery import GalleryConfig
+from myst_sphinx_gallery.cli import main
+from myst_sphinx_gallery.watch import GalleryWatcher
+
+
+@pytest.fixture
+def watcher(tmp_path):
+    """Create a watcher of a copy of the example gallery."""
+    data_dir = Path(__file__).parent
+    shutil.copytree(data_dir / "data/examples", tmp_path / "examples")
+    shutil.copytree(data_dir / "_static", tmp_path / "_static")
+    config = GalleryConfig(
+        examples_dirs="examples",
+        gallery_dirs="auto_examples",
+        root_dir=tmp_path,
+        thumbnail_dir="thumbs",
+    )
+    return GalleryWatcher(config)
+
+
+def test_update_changed_example(watcher, tmp_path):
+    examples = tmp_path / "examples"
+    gallery = tmp_path / "auto_examples"
+    assert len(watcher.update()) == 2
+    assert (gallery / "index.rst").exists()
+    assert watcher.update() == []
+
+    notebook = gallery / "combination/plot_image_markdown.ipynb"
+    os.utime(notebook, ns=(0, 0))
+    example = examples / "01-first_last2/first.rst"
+    example.write_text(example.read_text() + "\nAn edited paragraph.\n")
+    assert watcher.update() == [example]
+    assert "An edited paragraph." in (gallery / "first_last2/first.rst").read_text()
+    # the other examples are not converted again
+    assert notebook.stat().st_mtime_ns == 0
+
+
+def test_update_added_and_removed_example(watcher, tmp_path):
+    examples = tmp_path / "examples"
+    gallery = tmp_path / "auto_examples"
+    watcher.update()
+
+    example = examples / "01-first_last2/second.md"
+    example.write_text("# Second example\n\nA new example.\n")
+    assert watcher.update() == [example]
+    assert "second" in (gallery / "first_last2/index.rst").read_text()
+    assert "example_second" in (gallery / "index.rst").read_text()
+
+    example.unlink()
+    assert watcher.update() == []
+    assert not (gallery / "first_last2/second.md").exists()
+    assert "second" not in (gallery / "first_last2/index.rst").read_text()
+    assert "example_second" not in (gallery / "index.rst").read_text()
+
+
+def test_update_changed_thumbnail_source(watcher, tmp_path):
+    watcher.update()
+    example = tmp_path / "examples/01-first_last2/first.rst"
+    conv = watcher.converters[example]
+    os.utime(conv.thumb_file, ns=(0, 0))
+
+    image = conv.thumb_source
+    image.write_bytes(image.read_bytes() + b"\0")
+    assert watcher.update() == [example]
+    assert conv.thumb_file.stat().st_mtime_ns > 0
+
+
+def test_watch_stop(watcher):
+    stop = threading.Event()
+    updates = []
+
+    def callback(example_files):
+        updates.append(example_files)
+        stop.set()
+
+    watcher.watch(interval=0.01, callback=callback, stop=stop)
+    assert len(updates) == 1
+    assert len(updates[0]) == 2
+
+
+def test_main_watch_errors(tmp_path, capsys):
+    assert main(["watch", "-c", str(tmp_path / "missing.py")]) == 1
+    assert "Configuration file not found" in capsys.readouterr().err
+
+    with pytest.raises(SystemExit):
+        main(["watch", "--interval", "0"])